@@ -20,7 +20,13 @@ class AssistantConversationAdmin(admin.ModelAdmin[AssistantConversation]):
     )
     list_filter = ("created_at", "updated_at")
     search_fields = ("title", "user__email")
-    readonly_fields = ("id", "created_at", "updated_at")
+    readonly_fields = (
+        "id",
+        "summary",
+        "summary_until_message_id",
+        "created_at",
+        "updated_at",
+    )
     raw_id_fields = ("user",)
 
     def message_count_display(
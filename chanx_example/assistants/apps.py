@@ -0,0 +1,11 @@
+from importlib import import_module
+
+from django.apps import AppConfig
+
+
+class AssistantsConfig(AppConfig):
+    name = "assistants"
+
+    def ready(self) -> None:
+        # Register the assistant metrics before the metrics endpoint renders
+        import_module(f"{self.name}.metrics")
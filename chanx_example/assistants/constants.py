@@ -1,3 +1,15 @@
 MAX_CONTENT_PREVIEW_LENGTH = 100
 
 TRUNCATED_TITLE_LENGTH = 50
+
+# Most recently updated conversations listed in the chat page sidebar
+SIDEBAR_CONVERSATION_LIMIT = 50
+
+# Lock preventing duplicate background summaries of one conversation (seconds)
+SUMMARY_LOCK_TIMEOUT = 5 * 60
+
+# Messages folded into the running summary per summarization run
+SUMMARY_MAX_FOLD_MESSAGES = 50
+
+# Pending stop requests for in-flight responses are forgotten after (seconds)
+STOP_REQUEST_TIMEOUT = 10 * 60
@@ -1,4 +1,5 @@
 from typing import Any
+from urllib.parse import parse_qs
 
 from chanx.generic.websocket import AsyncJsonWebsocketConsumer
 from chanx.messages.incoming import PingMessage
@@ -11,15 +12,27 @@ from assistants.messages.assistant import (
     AssistantIncomingMessage,
     CompleteStreamingEvent,
     CompleteStreamingMessage,
+    ConversationTitleEvent,
+    ConversationTitleMessage,
     ErrorEvent,
     ErrorMessage,
+    ErrorPayload,
+    GenerationQueuedEvent,
+    GenerationQueuedMessage,
     NewAssistantMessage,
     NewAssistantMessageEvent,
+    ResumeStreamMessage,
+    ResumeStreamPayload,
+    StopGenerationMessage,
     StreamingEvent,
     StreamingMessage,
+    StreamingPayload,
+    encode_compact_frame,
 )
 from assistants.models import AssistantConversation
 from assistants.permissions import ConversationOwner
+from assistants.services.cancellation import arequest_stop
+from assistants.services.stream_replay import aget_replay
 
 
 class ConversationAssistantConsumer(
@@ -38,6 +51,9 @@ class ConversationAssistantConsumer(
 
     log_ignored_actions = ["streaming"]
 
+    # Set per connection by the ?wire=compact query parameter
+    compact_streaming = False
+
     async def build_groups(self) -> list[str]:
         """Build groups based on conversation type (authenticated or anonymous)."""
         # Get conversation_id from URL path
@@ -48,6 +64,24 @@ class ConversationAssistantConsumer(
         else:
             return [f"anonymous_{conversation_id}"]
 
+    async def post_authentication(self) -> None:
+        """Pick the streaming wire format the client asked for."""
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        self.compact_streaming = query.get("wire") == ["compact"]
+
+    async def send_stream_frame(
+        self, message: StreamingMessage | CompleteStreamingMessage
+    ) -> None:
+        """Send a streaming message in the wire format the client asked for.
+
+        Compact frames skip the per-chunk serialization and camelization of
+        the repeated keys, which outweigh the token itself on every chunk.
+        """
+        if self.compact_streaming:
+            await self.send(text_data=encode_compact_frame(message))
+        else:
+            await self.send_message(message)
+
     async def receive_message(
         self, message: AssistantIncomingMessage, **kwargs: Any
     ) -> None:
@@ -55,19 +89,65 @@ class ConversationAssistantConsumer(
         match message:
             case PingMessage():
                 await self.send_message(PongMessage())
+            case ResumeStreamMessage(payload=payload):
+                await self.resume_stream(payload)
+            case StopGenerationMessage(payload=payload):
+                await arequest_stop(str(self.obj.pk), payload.message_id)
             case _:
                 assert_never(message)
 
+    async def resume_stream(self, payload: ResumeStreamPayload) -> None:
+        """Replay stream frames this client missed while it was disconnected."""
+        replay = await aget_replay(
+            str(self.obj.pk), payload.message_id, payload.last_seq
+        )
+        if replay is None:
+            await self.send_message(
+                ErrorMessage(
+                    payload=ErrorPayload(
+                        content="Stream can no longer be resumed",
+                        message_id=str(payload.message_id),
+                    )
+                )
+            )
+            return
+
+        for seq, content in replay["frames"]:
+            await self.send_stream_frame(
+                StreamingMessage(
+                    payload=StreamingPayload(
+                        content=content, message_id=payload.message_id, seq=seq
+                    )
+                )
+            )
+
+        complete_seq = replay["complete_seq"]
+        if complete_seq is not None and complete_seq > payload.last_seq:
+            await self.send_stream_frame(
+                CompleteStreamingMessage(
+                    payload=StreamingPayload(
+                        content="",
+                        is_complete=True,
+                        message_id=payload.message_id,
+                        seq=complete_seq,
+                    )
+                )
+            )
+
     async def receive_event(self, event: AssistantEvent) -> None:
         """Handle incoming channel events."""
         match event:
             case StreamingEvent(payload=payload):
-                await self.send_message(StreamingMessage(payload=payload))
+                await self.send_stream_frame(StreamingMessage(payload=payload))
             case CompleteStreamingEvent(payload=payload):
-                await self.send_message(CompleteStreamingMessage(payload=payload))
+                await self.send_stream_frame(CompleteStreamingMessage(payload=payload))
             case NewAssistantMessageEvent(payload=payload):
                 await self.send_message(NewAssistantMessage(payload=payload))
             case ErrorEvent(payload=payload):
                 await self.send_message(ErrorMessage(payload=payload))
+            case ConversationTitleEvent(payload=payload):
+                await self.send_message(ConversationTitleMessage(payload=payload))
+            case GenerationQueuedEvent(payload=payload):
+                await self.send_message(GenerationQueuedMessage(payload=payload))
             case _:
                 assert_never(event)
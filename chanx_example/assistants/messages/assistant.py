@@ -1,6 +1,7 @@
+import json
 from typing import Any, Literal
 
-from chanx.messages.base import BaseChannelEvent, BaseGroupMessage
+from chanx.messages.base import BaseChannelEvent, BaseGroupMessage, BaseMessage
 from chanx.messages.incoming import PingMessage
 from pydantic import BaseModel
 
@@ -10,6 +11,7 @@ class StreamingPayload(BaseModel):
     content: str
     is_complete: bool = False
     message_id: int
+    seq: int = 0
 
 
 class ErrorPayload(BaseModel):
@@ -21,6 +23,40 @@ class MessagePayload(BaseModel):
     content: str
 
 
+class ConversationTitlePayload(BaseModel):
+    conversation_id: str
+    title: str
+
+
+class GenerationQueuedPayload(BaseModel):
+    message_id: int
+    position: int
+
+
+class ResumeStreamPayload(BaseModel):
+    message_id: int
+    last_seq: int = 0
+
+
+class StopGenerationPayload(BaseModel):
+    message_id: int
+
+
+# Incoming messages (Client → WebSocket)
+class ResumeStreamMessage(BaseMessage):
+    """Request to replay stream frames missed while disconnected."""
+
+    action: Literal["resume_stream"] = "resume_stream"
+    payload: ResumeStreamPayload
+
+
+class StopGenerationMessage(BaseMessage):
+    """Request to stop generating the response to a message."""
+
+    action: Literal["stop_generation"] = "stop_generation"
+    payload: StopGenerationPayload
+
+
 # Outgoing group messages (WebSocket → Client)
 class StreamingMessage(BaseGroupMessage):
     """Streaming message chunk from assistant."""
@@ -36,6 +72,25 @@ class CompleteStreamingMessage(BaseGroupMessage):
     payload: StreamingPayload
 
 
+# Compact streaming frames, sent instead of StreamingMessage and
+# CompleteStreamingMessage to clients connecting with ?wire=compact:
+# ["s", message_id, seq, content] per chunk, ["c", message_id, seq] at the end
+COMPACT_CHUNK = "s"
+COMPACT_COMPLETE = "c"
+
+
+def encode_compact_frame(
+    message: StreamingMessage | CompleteStreamingMessage,
+) -> str:
+    """Encode a streaming message as a positional JSON array."""
+    payload = message.payload
+    if isinstance(message, CompleteStreamingMessage):
+        frame: list[Any] = [COMPACT_COMPLETE, payload.message_id, payload.seq]
+    else:
+        frame = [COMPACT_CHUNK, payload.message_id, payload.seq, payload.content]
+    return json.dumps(frame, ensure_ascii=False, separators=(",", ":"))
+
+
 class NewAssistantMessage(BaseGroupMessage):
     """New assistant message (user or AI)."""
 
@@ -50,6 +105,20 @@ class ErrorMessage(BaseGroupMessage):
     payload: ErrorPayload
 
 
+class ConversationTitleMessage(BaseGroupMessage):
+    """Generated title of the conversation."""
+
+    action: Literal["conversation_title"] = "conversation_title"
+    payload: ConversationTitlePayload
+
+
+class GenerationQueuedMessage(BaseGroupMessage):
+    """Position of a response waiting for a free generation slot."""
+
+    action: Literal["generation_queued"] = "generation_queued"
+    payload: GenerationQueuedPayload
+
+
 # Channel events (Task → Consumer)
 class StreamingEvent(BaseChannelEvent):
     """Channel event for streaming chunks."""
@@ -79,8 +148,27 @@ class ErrorEvent(BaseChannelEvent):
     payload: ErrorPayload
 
 
+class ConversationTitleEvent(BaseChannelEvent):
+    """Channel event for a newly generated conversation title."""
+
+    handler: Literal["handle_conversation_title"] = "handle_conversation_title"
+    payload: ConversationTitlePayload
+
+
+class GenerationQueuedEvent(BaseChannelEvent):
+    """Channel event for a response waiting in the generation queue."""
+
+    handler: Literal["handle_generation_queued"] = "handle_generation_queued"
+    payload: GenerationQueuedPayload
+
+
 # Union types
-AssistantIncomingMessage = PingMessage
+AssistantIncomingMessage = PingMessage | ResumeStreamMessage | StopGenerationMessage
 AssistantEvent = (
-    StreamingEvent | CompleteStreamingEvent | NewAssistantMessageEvent | ErrorEvent
+    StreamingEvent
+    | CompleteStreamingEvent
+    | NewAssistantMessageEvent
+    | ErrorEvent
+    | ConversationTitleEvent
+    | GenerationQueuedEvent
 )
@@ -0,0 +1,65 @@
+from utils.metrics import Counter, Histogram
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+GAP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+SEND_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+RATE_BUCKETS = (5, 10, 20, 40, 60, 80, 100, 150, 200, 400)
+LENGTH_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+history_load_seconds = Histogram(
+    "assistant_history_load_seconds",
+    "Time spent building the prompt history.",
+    LATENCY_BUCKETS,
+)
+time_to_first_token_seconds = Histogram(
+    "assistant_time_to_first_token_seconds",
+    "Time from starting generation to the first streamed token.",
+    LATENCY_BUCKETS,
+    label_names=["model"],
+)
+inter_token_gap_seconds = Histogram(
+    "assistant_inter_token_gap_seconds",
+    "Time between consecutive streamed tokens.",
+    GAP_BUCKETS,
+    label_names=["model"],
+)
+tokens_per_second = Histogram(
+    "assistant_tokens_per_second",
+    "Streaming rate of a response after its first token.",
+    RATE_BUCKETS,
+    label_names=["model"],
+)
+channel_send_seconds = Histogram(
+    "assistant_channel_send_seconds",
+    "Channel layer latency of sending one streaming frame.",
+    SEND_BUCKETS,
+)
+response_length_chars = Histogram(
+    "assistant_response_length_chars",
+    "Length of persisted assistant responses.",
+    LENGTH_BUCKETS,
+    label_names=["model"],
+)
+streamed_tokens = Counter(
+    "assistant_streamed_tokens_total",
+    "Tokens streamed to clients.",
+    label_names=["model"],
+)
+prompt_tokens = Counter(
+    "assistant_prompt_tokens_total",
+    "Input tokens sent to the language model.",
+    label_names=["model"],
+)
+prompt_cached_tokens = Counter(
+    "assistant_prompt_cached_tokens_total",
+    "Input tokens the provider served from its prompt prefix cache.",
+    label_names=["model"],
+)
+expired_conversations = Counter(
+    "assistant_expired_conversations_total",
+    "Idle anonymous conversations deleted by the expiry job.",
+)
+expired_messages = Counter(
+    "assistant_expired_messages_total",
+    "Messages deleted along with expired anonymous conversations.",
+)
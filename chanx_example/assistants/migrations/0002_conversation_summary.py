@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 01:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assistants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assistantconversation",
+            name="summary",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="assistantconversation",
+            name="summary_until_message_id",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="ID of the newest message folded into the summary",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assistants", "0002_conversation_summary"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="assistantmessage",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
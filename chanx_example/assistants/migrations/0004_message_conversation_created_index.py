@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assistants", "0003_message_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="assistantmessage",
+            index=models.Index(
+                fields=["conversation", "created_at", "id"],
+                name="assistant_msg_conv_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:47
+
+from typing import Any
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Concat, Length, Substr
+
+PREVIEW_LENGTH = 100
+
+
+def backfill_last_message(apps: Any, schema_editor: Any) -> None:
+    AssistantConversation = apps.get_model("assistants", "AssistantConversation")
+    AssistantMessage = apps.get_model("assistants", "AssistantMessage")
+
+    newest = AssistantMessage.objects.filter(conversation=OuterRef("pk")).order_by(
+        "-created_at", "-id"
+    )
+    preview = models.Case(
+        models.When(
+            Q(content_length__gt=PREVIEW_LENGTH),
+            then=Concat(Substr("content", 1, PREVIEW_LENGTH), Value("...")),
+        ),
+        default=F("content"),
+        output_field=models.TextField(),
+    )
+    count = (
+        AssistantMessage.objects.filter(conversation=OuterRef("pk"))
+        .order_by()
+        .values("conversation")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    AssistantConversation.objects.filter(
+        pk__in=AssistantMessage.objects.values("conversation")
+    ).update(
+        last_message_at=Subquery(newest.values("created_at")[:1]),
+        last_message_preview=Subquery(
+            newest.annotate(content_length=Length("content"))
+            .annotate(preview=preview)
+            .values("preview")[:1]
+        ),
+        message_count=Subquery(count),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assistants", "0004_message_conversation_created_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assistantconversation",
+            name="last_message_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="assistantconversation",
+            name="last_message_preview",
+            field=models.CharField(blank=True, max_length=103),
+        ),
+        migrations.AddField(
+            model_name="assistantconversation",
+            name="message_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="assistantconversation",
+            index=models.Index(
+                fields=["user", "-updated_at"], name="assistant_conv_user_upd_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_last_message, migrations.RunPython.noop),
+    ]
@@ -6,17 +6,14 @@ from django.conf import settings
 from django.db import models
 from django.db.models import QuerySet
 
-import structlog
 from django_stubs_ext.db.models import TypedModelMeta
 
-from assistants.constants import TRUNCATED_TITLE_LENGTH
+from assistants.constants import MAX_CONTENT_PREVIEW_LENGTH, TRUNCATED_TITLE_LENGTH
 
 if TYPE_CHECKING:  # pragma: no cover
     from accounts.models import User  # noqa: F401
     from assistants.models.assistant_message import AssistantMessage  # noqa: F401
 
-logger = structlog.getLogger(__name__)
-
 
 class AssistantConversation(models.Model):
     """A conversation thread with the AI assistant."""
@@ -33,42 +30,46 @@ class AssistantConversation(models.Model):
     created_at = models.DateTimeField[datetime, datetime](auto_now_add=True)
     updated_at = models.DateTimeField[datetime, datetime](auto_now=True)
 
+    # Running summary of older messages, refreshed in the background so the
+    # prompt only needs the summary plus the most recent messages
+    summary = models.TextField[str, str](blank=True)
+    summary_until_message_id = models.PositiveBigIntegerField[int | None, int | None](
+        null=True,
+        blank=True,
+        help_text="ID of the newest message folded into the summary",
+    )
+
+    # Denormalized from the newest message on every write, so conversation
+    # lists render without querying messages
+    last_message_preview = models.CharField[str, str](
+        max_length=MAX_CONTENT_PREVIEW_LENGTH + len("..."), blank=True
+    )
+    last_message_at = models.DateTimeField[datetime | None, datetime | None](
+        null=True, blank=True
+    )
+    message_count = models.PositiveIntegerField[int, int](default=0)
+
     # Type annotation for reverse relationship
     if TYPE_CHECKING:  # pragma: no cover
+        user_id: int | None
         messages: QuerySet["AssistantMessage"]
 
     class Meta(TypedModelMeta):
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-updated_at"], name="assistant_conv_user_upd_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         user_info = f" ({self.user.email})" if self.user else " (anonymous)"
         return f"Conversation {self.id} - {self.title or 'Untitled'}{user_info}"
 
-    def generate_title_from_first_message(self) -> None:
-        """Generate a title from the first user message if not already set."""
-        if not self.title:
-            from assistants.models.assistant_message import AssistantMessage
-
-            first_message = self.messages.filter(
-                message_type=AssistantMessage.MessageType.USER
-            ).first()
-
-            assert first_message is not None
-            from assistants.tasks.ai_service_tasks import (
-                task_generate_conversation_title,
-            )
-
-            try:
-                generated_title = task_generate_conversation_title(
-                    first_message.content
-                )
-                self.title = generated_title
-                self.save(update_fields=["title"])
-
-            except Exception:
-                # Fallback to simple truncation
-                logger.exception("Failed to generate title")
-                self.title = first_message.content[:TRUNCATED_TITLE_LENGTH]
-                if len(first_message.content) > TRUNCATED_TITLE_LENGTH:
-                    self.title += "..."
-                self.save(update_fields=["title"])
+    @staticmethod
+    def fallback_title(first_message: str) -> str:
+        """Title made by truncating the first message, when generation fails."""
+        title = first_message[:TRUNCATED_TITLE_LENGTH]
+        if len(first_message) > TRUNCATED_TITLE_LENGTH:
+            title += "..."
+        return title
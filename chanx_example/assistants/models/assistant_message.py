@@ -1,14 +1,161 @@
+from collections.abc import Iterable
 from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Concat, Length, Substr
+from django.utils import timezone
 
+from asgiref.sync import sync_to_async
 from django_stubs_ext.db.models import TypedModelMeta
 
-if TYPE_CHECKING:  # pragma: no cover
-    from assistants.models.assistant_conversation import (
-        AssistantConversation,  # noqa: F401
-    )
+from assistants.constants import MAX_CONTENT_PREVIEW_LENGTH
+from assistants.models.assistant_conversation import AssistantConversation
+
+
+def make_preview(content: str) -> str:
+    """Truncate message content for conversation lists."""
+    if len(content) > MAX_CONTENT_PREVIEW_LENGTH:
+        return content[:MAX_CONTENT_PREVIEW_LENGTH] + "..."
+    return content
+
+
+def _record_new_message(
+    conversation: AssistantConversation, message: "AssistantMessage"
+) -> None:
+    """Touch the conversation and its denormalized last-message fields.
+
+    Must run in the transaction inserting the message. The conversation's
+    message_count is set to the row's count including this message.
+    """
+    changes: dict[str, Any] = {
+        "updated_at": timezone.now(),
+        "last_message_preview": make_preview(message.content),
+        "last_message_at": message.created_at,
+    }
+    conversations = AssistantConversation.objects.filter(pk=conversation.pk)
+    conversations.update(message_count=F("message_count") + 1, **changes)
+
+    for field, value in changes.items():
+        setattr(conversation, field, value)
+    # Read back in the updating transaction: the row stays locked until it
+    # commits, so concurrent messages each see their own position
+    conversation.message_count = conversations.values_list(
+        "message_count", flat=True
+    ).get()
+
+
+class AssistantMessageManager(models.Manager["AssistantMessage"]):
+    """Write paths that skip the per-save conversation touch."""
+
+    def add_to_conversation(
+        self,
+        conversation: AssistantConversation,
+        content: str,
+        message_type: str,
+    ) -> "AssistantMessage":
+        """Insert a message and touch its conversation in one transaction.
+
+        Saving a new message issues a single INSERT and a single conversation
+        UPDATE (updated_at, the message count and the last-message fields) in
+        one transaction, then reads the updated count back onto conversation,
+        so it tells whether this was the conversation's first message. Titles are not written here: they are generated
+        alongside the first reply and stored by their own conditional UPDATE,
+        which never overwrites a title set meanwhile.
+
+        Args:
+            conversation: Conversation the message belongs to
+            content: Message content
+            message_type: AssistantMessage.MessageType value
+
+        Returns:
+            The created message
+        """
+        message = self.model(
+            conversation=conversation, content=content, message_type=message_type
+        )
+
+        message.save()
+        return message
+
+    async def aadd_to_conversation(
+        self,
+        conversation: AssistantConversation,
+        content: str,
+        message_type: str,
+    ) -> "AssistantMessage":
+        """See add_to_conversation()"""
+        return await sync_to_async(self.add_to_conversation)(
+            conversation, content, message_type
+        )
+
+    def bulk_import(
+        self, messages: Iterable["AssistantMessage"], batch_size: int = 500
+    ) -> list["AssistantMessage"]:
+        """Insert many messages at once, e.g. to seed or migrate conversations.
+
+        Explicit created_at values are kept. Each touched conversation's
+        updated_at and last-message fields are set from its newest message,
+        and its message count recomputed, in one UPDATE.
+
+        Args:
+            messages: Unsaved messages, possibly spanning several conversations
+            batch_size: Rows per INSERT statement
+
+        Returns:
+            The created messages
+        """
+        with transaction.atomic():
+            created = self.bulk_create(messages, batch_size=batch_size)
+            AssistantConversation.objects.filter(
+                pk__in={message.conversation_id for message in created}
+            ).update(**self.last_message_fields())
+        return created
+
+    def last_message_fields(self) -> dict[str, Any]:
+        """Return expressions recomputing a conversation's denormalized fields.
+
+        Meant for ``AssistantConversation.objects.update()``; each value is a
+        subquery on the conversation's messages.
+        """
+        newest = self.filter(conversation=OuterRef("pk")).order_by("-created_at", "-id")
+        preview = Case(
+            When(
+                Q(content_length__gt=MAX_CONTENT_PREVIEW_LENGTH),
+                then=Concat(
+                    Substr("content", 1, MAX_CONTENT_PREVIEW_LENGTH), Value("...")
+                ),
+            ),
+            default=F("content"),
+            output_field=models.TextField(),
+        )
+        count = (
+            self.filter(conversation=OuterRef("pk"))
+            .order_by()
+            .values("conversation")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return {
+            "updated_at": Subquery(newest.values("created_at")[:1]),
+            "last_message_at": Subquery(newest.values("created_at")[:1]),
+            "last_message_preview": Subquery(
+                newest.annotate(content_length=Length("content"))
+                .annotate(preview=preview)
+                .values("preview")[:1]
+            ),
+            "message_count": Subquery(count),
+        }
 
 
 class AssistantMessage(models.Model):
@@ -27,16 +174,36 @@ class AssistantMessage(models.Model):
     message_type = models.CharField[str, str](
         max_length=10, choices=MessageType.choices, default=MessageType.USER
     )
-    created_at = models.DateTimeField[datetime, datetime](auto_now_add=True)
+    # A default rather than auto_now_add, so imported messages keep their time
+    created_at = models.DateTimeField[datetime, datetime](
+        default=timezone.now, editable=False
+    )
+
+    objects: ClassVar[AssistantMessageManager] = AssistantMessageManager()
+
+    if TYPE_CHECKING:  # pragma: no cover
+        conversation_id: str
 
     class Meta(TypedModelMeta):
         ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["conversation", "created_at", "id"],
+                name="assistant_msg_conv_created_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.message_type}: {self.content[:50]}..."
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         """Update conversation timestamp when message is saved."""
-        super().save(*args, **kwargs)
-        # Update conversation's updated_at timestamp
-        self.conversation.save(update_fields=["updated_at"])
+        if self._state.adding:
+            # Also count the message and refresh the conversation preview
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                _record_new_message(self.conversation, self)
+        else:
+            super().save(*args, **kwargs)
+            # Update conversation's updated_at timestamp
+            self.conversation.save(update_fields=["updated_at"])
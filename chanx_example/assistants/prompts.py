@@ -4,3 +4,16 @@ Generate a short, descriptive title (max 50 characters) for a conversation that
 {{message}}
 
 Title:"""
+
+CONVERSATION_SUMMARY_PROMPT = """
+You maintain a running summary of a conversation between a user and an AI assistant.
+Update the existing summary with the new messages below. Keep every fact, decision,
+preference and open question that later replies may depend on, and stay under 300 words.
+
+Existing summary:
+{summary}
+
+New messages:
+{transcript}
+
+Updated summary:"""
@@ -15,4 +15,12 @@ class AssistantConversationSerializer(
             "title",
             "created_at",
             "updated_at",
+            "last_message_preview",
+            "last_message_at",
+            "message_count",
+        ]
+        read_only_fields = [
+            "last_message_preview",
+            "last_message_at",
+            "message_count",
         ]
@@ -1,3 +1,5 @@
+from typing import Any
+
 from rest_framework import serializers
 from rest_framework.fields import SerializerMethodField
 
@@ -23,6 +25,10 @@ class AssistantMessageSerializer(serializers.ModelSerializer[AssistantMessage]):
         """Return a user-friendly time format."""
         return obj.created_at.strftime("%I:%M %p - %b %d, %Y")
 
+    def create(self, validated_data: dict[str, Any]) -> AssistantMessage:
+        """Insert the message and touch its conversation in one transaction."""
+        return AssistantMessage.objects.add_to_conversation(**validated_data)
+
 
 class CreateAssistantMessageSerializer(serializers.ModelSerializer[AssistantMessage]):
     """Serializer for creating new assistant messages."""
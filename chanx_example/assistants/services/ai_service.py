@@ -1,11 +1,17 @@
-from collections.abc import Iterator
+import abc
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import aclosing
 from typing import TypedDict
 
 from django.conf import settings
+from django.utils.module_loading import import_string
 
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
-from langchain_openai import ChatOpenAI
-from pydantic import SecretStr
+from asgiref.sync import sync_to_async
+from langchain_core.messages import BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+
+from assistants.services.llm_clients import llm_clients
+from assistants.services.prompt import build_prompt, record_prompt_usage, usage_of
 
 
 class ConversationMessage(TypedDict):
@@ -15,30 +21,131 @@ class ConversationMessage(TypedDict):
     content: str
 
 
-class OpenAIService:
+# Backends selectable by name in ASSISTANT_LLM_BACKEND (a dotted path also works)
+LLM_BACKENDS = {
+    "openai": "assistants.services.ai_service.OpenAIService",
+    "fake": "assistants.services.fake_backend.FakeLLMBackend",
+}
+
+
+class LLMBackend(abc.ABC):
+    """Interface of the language model backends answering assistant messages."""
+
+    # Whether prompts may be embedded for the semantic response cache
+    semantic_cache = True
+
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0.7):
+        """Initialize the backend.
+
+        Args:
+            model: Model to use
+            temperature: Temperature for response generation
+        """
+        self.model = model
+        self.temperature = temperature
+
+    @abc.abstractmethod
+    def generate(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> str:
+        """Generate a complete (non-streamed) response.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Returns:
+            The AI response text
+        """
+
+    @abc.abstractmethod
+    def generate_stream(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> Iterator[str]:
+        """Generate a streaming response.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Yields:
+            Tokens from the AI response
+        """
+
+    @abc.abstractmethod
+    def agenerate_stream(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> AsyncGenerator[str, None]:
+        """Generate a streaming response without blocking the event loop.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Yields:
+            Tokens from the AI response
+        """
+
+    async def agenerate(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> str:
+        """Generate a complete response without blocking the event loop.
+
+        Collects agenerate_stream() by default; backends with a native
+        non-streamed async call may override it.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Returns:
+            The AI response text
+        """
+        stream = self.agenerate_stream(message, conversation_history)
+        async with aclosing(stream):
+            return "".join([token async for token in stream])
+
+
+def get_llm_backend(model: str = "gpt-4o", temperature: float = 0.7) -> LLMBackend:
+    """Create the backend configured by ASSISTANT_LLM_BACKEND.
+
+    Args:
+        model: Model to use
+        temperature: Temperature for response generation
+
+    Returns:
+        A backend instance for the given model settings
+    """
+    backend: str = settings.ASSISTANT_LLM_BACKEND
+    backend_class: type[LLMBackend] = import_string(LLM_BACKENDS.get(backend, backend))
+    return backend_class(model=model, temperature=temperature)
+
+
+class OpenAIService(LLMBackend):
     """OpenAI backend using LangChain."""
 
     def __init__(self, model: str = "gpt-4o", temperature: float = 0.7):
         """Initialize OpenAI backend.
 
+        The underlying ChatOpenAI client is shared across the process, see
+        LLMClientRegistry.
+
         Args:
             model: OpenAI model to use
             temperature: Temperature for response generation
         """
 
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            api_key=SecretStr(settings.OPENAI_API_KEY),
-            organization=getattr(settings, "OPENAI_ORG", None),
-            streaming=True,
-        )
+        super().__init__(model, temperature)
+        self.llm = llm_clients.get_chat_model(model, temperature)
 
     def format_messages(
         self, message: str, conversation_history: list[ConversationMessage]
     ) -> list[BaseMessage]:
         """Format conversation history into LangChain messages.
 
+        The system prompt and history form a prefix shared with the previous
+        turn, see assistants.services.prompt.
+
         Args:
             message: Current user message
             conversation_history: Previous conversation messages
@@ -46,19 +153,45 @@ class OpenAIService:
         Returns:
             List of formatted LangChain messages
         """
-        messages: list[BaseMessage] = []
+        return build_prompt(message, conversation_history)
+
+    def generate(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> str:
+        """Generate a complete (non-streamed) response from OpenAI.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Returns:
+            The AI response text
+        """
+        messages = self.format_messages(message, conversation_history)
 
-        # Add conversation history
-        for msg in conversation_history:
-            if msg.get("role") == "user":
-                messages.append(HumanMessage(content=msg["content"]))
-            else:
-                messages.append(AIMessage(content=msg["content"]))
+        with llm_clients.limit():
+            response = self.llm.invoke(messages)
+        record_prompt_usage(self.model, usage_of(response))
+        return response.text()
 
-        # Add current message
-        messages.append(HumanMessage(content=message))
+    async def agenerate(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> str:
+        """Generate a complete response from OpenAI without blocking the event loop.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Returns:
+            The AI response text
+        """
+        messages = self.format_messages(message, conversation_history)
 
-        return messages
+        async with llm_clients.alimit():
+            response = await self.llm.ainvoke(messages)
+        await sync_to_async(record_prompt_usage)(self.model, usage_of(response))
+        return response.text()
 
     def generate_stream(
         self, message: str, conversation_history: list[ConversationMessage]
@@ -74,6 +207,33 @@ class OpenAIService:
         """
         messages = self.format_messages(message, conversation_history)
 
-        # Stream the response
-        for chunk in self.llm.stream(messages):
-            yield chunk.text()
+        usage: UsageMetadata | None = None
+
+        # Stream the response; usage arrives with the last chunk
+        with llm_clients.limit():
+            for chunk in self.llm.stream(messages):
+                usage = usage_of(chunk) or usage
+                yield chunk.text()
+        record_prompt_usage(self.model, usage)
+
+    async def agenerate_stream(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> AsyncGenerator[str, None]:
+        """Generate streaming response from OpenAI without blocking the event loop.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Yields:
+            Tokens from the AI response
+        """
+        messages = self.format_messages(message, conversation_history)
+
+        usage: UsageMetadata | None = None
+
+        async with llm_clients.alimit():
+            async for chunk in self.llm.astream(messages):
+                usage = usage_of(chunk) or usage
+                yield chunk.text()
+        await sync_to_async(record_prompt_usage)(self.model, usage)
@@ -0,0 +1,32 @@
+from django.core.cache import cache
+
+from assistants.constants import STOP_REQUEST_TIMEOUT
+
+
+def _stop_key(conversation_id: str, message_id: int) -> str:
+    return f"assistant_stop:{conversation_id}:{message_id}"
+
+
+async def arequest_stop(conversation_id: str, message_id: int) -> None:
+    """Ask the worker generating a response to stop.
+
+    Stop requests are scoped to the conversation, so a client can only stop
+    responses of the conversation it is connected to.
+
+    Args:
+        conversation_id: Conversation the response belongs to
+        message_id: ID of the user message being answered
+    """
+    await cache.aset(
+        _stop_key(conversation_id, message_id), True, timeout=STOP_REQUEST_TIMEOUT
+    )
+
+
+async def ais_stop_requested(conversation_id: str, message_id: int) -> bool:
+    """Return whether a client asked to stop this response."""
+    return bool(await cache.aget(_stop_key(conversation_id, message_id)))
+
+
+async def aclear_stop(conversation_id: str, message_id: int) -> None:
+    """Forget a stop request once its generation finished."""
+    await cache.adelete(_stop_key(conversation_id, message_id))
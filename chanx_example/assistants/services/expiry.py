@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from assistants.models import AssistantConversation
+
+
+@dataclass
+class ExpiryResult:
+    """Rows removed (or, in a dry run, that would be removed) by an expiry run."""
+
+    conversations: int = 0
+    messages: int = 0
+    dry_run: bool = False
+
+
+def expire_anonymous_conversations(
+    idle_for: timedelta,
+    batch_size: int,
+    max_batches: int,
+    dry_run: bool = False,
+) -> ExpiryResult:
+    """Delete anonymous conversations nobody wrote to for idle_for.
+
+    Conversations are deleted oldest first, batch_size at a time in separate
+    transactions, so locks stay short and a run never removes more than
+    batch_size * max_batches conversations; the next run picks up the rest.
+
+    Args:
+        idle_for: Minimum time since the conversation was last updated
+        batch_size: Conversations deleted per transaction
+        max_batches: Batches per run
+        dry_run: Only count the rows that would be deleted
+
+    Returns:
+        Number of conversations and messages removed
+    """
+    cutoff = timezone.now() - idle_for
+    idle = AssistantConversation.objects.filter(
+        user__isnull=True, updated_at__lt=cutoff
+    ).order_by("updated_at")
+    result = ExpiryResult(dry_run=dry_run)
+
+    if dry_run:
+        message_counts = list(
+            idle.values_list("message_count", flat=True)[: batch_size * max_batches]
+        )
+        result.conversations = len(message_counts)
+        result.messages = sum(message_counts)
+        return result
+
+    for _ in range(max_batches):
+        batch = list(idle.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            break
+
+        with transaction.atomic():
+            # Re-check idleness, a message may have arrived since the select
+            _, deleted = AssistantConversation.objects.filter(
+                pk__in=batch, updated_at__lt=cutoff
+            ).delete()
+        result.conversations += deleted.get("assistants.AssistantConversation", 0)
+        result.messages += deleted.get("assistants.AssistantMessage", 0)
+
+        if len(batch) < batch_size:
+            break
+
+    return result
+
+
+def expire_anonymous_conversations_from_settings(
+    dry_run: bool | None = None,
+) -> ExpiryResult:
+    """Run expire_anonymous_conversations configured by ASSISTANT_ANONYMOUS_*.
+
+    Args:
+        dry_run: Overrides ASSISTANT_ANONYMOUS_EXPIRY_DRY_RUN when given
+    """
+    return expire_anonymous_conversations(
+        idle_for=timedelta(hours=settings.ASSISTANT_ANONYMOUS_CONVERSATION_TTL_HOURS),
+        batch_size=settings.ASSISTANT_ANONYMOUS_EXPIRY_BATCH_SIZE,
+        max_batches=settings.ASSISTANT_ANONYMOUS_EXPIRY_MAX_BATCHES,
+        dry_run=(
+            settings.ASSISTANT_ANONYMOUS_EXPIRY_DRY_RUN if dry_run is None else dry_run
+        ),
+    )
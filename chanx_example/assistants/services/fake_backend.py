@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+import random
+import time
+from collections.abc import AsyncGenerator, Iterator
+
+from django.conf import settings
+
+from assistants.services.ai_service import ConversationMessage, LLMBackend
+
+WORDS = (
+    "the quick brown fox jumps over a lazy dog while streaming tokens flow "
+    "through channels to every connected client in the conversation"
+).split()
+
+
+class FakeLLMBackend(LLMBackend):
+    """Local stand-in for a language model, for load tests and offline work.
+
+    Streams a deterministic response (seeded by the prompt) of
+    ASSISTANT_FAKE_BACKEND_TOKENS tokens at ASSISTANT_FAKE_BACKEND_TOKENS_PER_SECOND
+    after ASSISTANT_FAKE_BACKEND_FIRST_TOKEN_MS, so the rest of the streaming
+    pipeline can be measured without model latency or cost.
+    """
+
+    # Embedding prompts would call the real provider
+    semantic_cache = False
+
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0.7):
+        """Initialize the fake backend.
+
+        Args:
+            model: Model name, only used to vary the generated text
+            temperature: Temperature, only used to vary the generated text
+        """
+        super().__init__(model, temperature)
+        self.token_count: int = settings.ASSISTANT_FAKE_BACKEND_TOKENS
+        tokens_per_second: float = settings.ASSISTANT_FAKE_BACKEND_TOKENS_PER_SECOND
+        self.token_delay = 1 / tokens_per_second if tokens_per_second > 0 else 0.0
+        self.first_token_delay = settings.ASSISTANT_FAKE_BACKEND_FIRST_TOKEN_MS / 1000
+
+    def build_tokens(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> list[str]:
+        """Return the tokens answering a prompt, identical for identical prompts.
+
+        Args:
+            message: User message
+            conversation_history: Previous conversation messages
+
+        Returns:
+            Response tokens, each a word with its leading space
+        """
+        prompt = "\n".join(
+            [self.model, str(self.temperature)]
+            + [entry["content"] for entry in conversation_history]
+            + [message]
+        )
+        seed = int.from_bytes(hashlib.sha256(prompt.encode()).digest()[:8], "big")
+        rng = random.Random(seed)
+        words = [rng.choice(WORDS) for _ in range(self.token_count)]
+        return [word if index == 0 else f" {word}" for index, word in enumerate(words)]
+
+    def generate(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> str:
+        """Return the whole fake response at once."""
+        time.sleep(self.first_token_delay)
+        return "".join(self.build_tokens(message, conversation_history))
+
+    def generate_stream(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> Iterator[str]:
+        """Stream the fake response, sleeping between tokens."""
+        time.sleep(self.first_token_delay)
+        for index, token in enumerate(self.build_tokens(message, conversation_history)):
+            if index:
+                time.sleep(self.token_delay)
+            yield token
+
+    async def agenerate_stream(
+        self, message: str, conversation_history: list[ConversationMessage]
+    ) -> AsyncGenerator[str, None]:
+        """Stream the fake response without blocking the event loop."""
+        await asyncio.sleep(self.first_token_delay)
+        for index, token in enumerate(self.build_tokens(message, conversation_history)):
+            if index:
+                await asyncio.sleep(self.token_delay)
+            yield token
@@ -0,0 +1,263 @@
+import asyncio
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from asgiref.sync import sync_to_async
+
+from assistants.models import AssistantConversation
+from utils.redis_cache import get_redis_client
+
+# Polls seeing a free slot but no queue progress after which the waiters
+# ahead are presumed gone (e.g. their worker died) and skipped one by one
+STALLED_POLLS = 10
+
+# Times a held slot's lease is renewed per lease_timeout
+LEASE_RENEWALS = 3
+
+# Lease renewal and release only act on a slot still holding the caller's
+# token, checked in the same atomic step: a lease that expired and was claimed
+# by another holder meanwhile is left alone
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+OnQueued = Callable[[int], Awaitable[None]]
+IsCancelled = Callable[[], Awaitable[bool]]
+
+
+class GenerationCancelledError(Exception):
+    """Raised when a generation is stopped before it got its slots."""
+
+
+class DistributedSemaphore:
+    """Counting semaphore shared by every worker through the Django cache.
+
+    Each of the ``limit`` slots is a cache key claimed with ``add`` and
+    released on exit. Claims are leases of ``lease_timeout`` seconds, renewed
+    while the slot is held, so a crashed worker cannot leak a slot for long
+    while long generations keep theirs. Waiters take a ticket and are served
+    in ticket order: a counter of served tickets gives each waiter its queue
+    position in one read, and a waiter may only claim a slot while fewer
+    waiters are ahead of it than there are free slots.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        lease_timeout: int,
+        poll_interval: float,
+    ):
+        """Initialize the semaphore.
+
+        Args:
+            name: Cache namespace of the semaphore
+            limit: Number of slots
+            lease_timeout: Seconds after which an unrenewed slot frees itself
+            poll_interval: Seconds between queue polls while waiting
+        """
+        self.name = name
+        self.limit = limit
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+
+        self.slot_keys = [f"generation_limit:{name}:slot:{i}" for i in range(limit)]
+        self.ticket_key = f"generation_limit:{name}:tickets"
+        self.served_key = f"generation_limit:{name}:served"
+
+    async def _serve(self) -> None:
+        await cache.aadd(self.served_key, 0, timeout=None)
+        await cache.aincr(self.served_key)
+
+    async def _claim(self, free: list[str], token: int) -> str | None:
+        for key in free:
+            if await cache.aadd(key, token, timeout=self.lease_timeout):
+                return key
+        return None
+
+    async def _renew(self, slot_key: str, token: int) -> None:
+        while True:
+            await asyncio.sleep(self.lease_timeout / LEASE_RENEWALS)
+            if get_redis_client() is not None:
+                renewed = await sync_to_async(_run_script)(
+                    RENEW_SCRIPT, slot_key, token, self.lease_timeout
+                )
+            elif await cache.aget(slot_key) == token:
+                renewed = await cache.atouch(slot_key, self.lease_timeout)
+            else:
+                renewed = False
+            if not renewed:
+                return
+
+    async def _release(self, slot_key: str, token: int) -> None:
+        if get_redis_client() is not None:
+            await sync_to_async(_run_script)(RELEASE_SCRIPT, slot_key, token)
+        # Other backends (tests, local development) run in a single process
+        elif await cache.aget(slot_key) == token:
+            await cache.adelete(slot_key)
+
+    async def _wait_for_slot(
+        self,
+        ticket: int,
+        token: int,
+        on_queued: OnQueued | None,
+        is_cancelled: IsCancelled | None,
+    ) -> str:
+        last_position = None
+        last_served = None
+        stalled_polls = 0
+        try:
+            while True:
+                state = await cache.aget_many([self.served_key, *self.slot_keys])
+                served: int = state.get(self.served_key, 0)
+                free = [key for key in self.slot_keys if key not in state]
+                position = max(ticket - 1 - served, 0)
+
+                if position < len(free):
+                    slot_key = await self._claim(free, token)
+                    if slot_key is not None:
+                        return slot_key
+                elif free and served == last_served:
+                    stalled_polls += 1
+                    if stalled_polls >= STALLED_POLLS:
+                        # Only one waiter skips each presumed-gone ticket
+                        if await cache.aadd(
+                            f"{self.served_key}:skipped:{served}",
+                            True,
+                            timeout=self.lease_timeout,
+                        ):
+                            await self._serve()
+                        stalled_polls = 0
+                else:
+                    stalled_polls = 0
+                last_served = served
+
+                if is_cancelled is not None and await is_cancelled():
+                    raise GenerationCancelledError
+
+                if on_queued is not None and position != last_position:
+                    await on_queued(position + 1)
+                last_position = position
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            # Served or given up, the ticket no longer holds up later waiters
+            await self._serve()
+
+    @asynccontextmanager
+    async def hold(
+        self,
+        on_queued: OnQueued | None = None,
+        is_cancelled: IsCancelled | None = None,
+    ) -> AsyncIterator[None]:
+        """Wait for a free slot and hold it until the block exits.
+
+        Args:
+            on_queued: Called with the 1-based queue position whenever it
+                changes while waiting
+            is_cancelled: Polled while waiting; GenerationCancelledError is
+                raised once it returns True
+        """
+        # An int, which the Redis cache stores unpickled, so scripts compare it
+        token = uuid.uuid4().int
+        await cache.aadd(self.ticket_key, 0, timeout=None)
+        ticket = await cache.aincr(self.ticket_key)
+
+        slot_key = await self._wait_for_slot(ticket, token, on_queued, is_cancelled)
+        renewal = asyncio.create_task(self._renew(slot_key, token))
+        try:
+            yield
+        finally:
+            renewal.cancel()
+            await self._release(slot_key, token)
+
+
+def _run_script(script: str, key: str, *args: int) -> int:
+    client = get_redis_client()
+    assert client is not None
+    result = client.register_script(script)(
+        keys=[cache.make_and_validate_key(key)], args=list(args)
+    )
+    assert isinstance(result, int)
+    return result
+
+
+def _semaphore(name: str, limit: int) -> DistributedSemaphore:
+    return DistributedSemaphore(
+        name,
+        limit,
+        lease_timeout=settings.ASSISTANT_GENERATION_LEASE_TIMEOUT,
+        poll_interval=settings.ASSISTANT_GENERATION_POLL_INTERVAL,
+    )
+
+
+def get_generation_semaphores(
+    conversation: AssistantConversation,
+) -> list[DistributedSemaphore]:
+    """Return the semaphores a generation for this conversation must hold.
+
+    Generations are limited per user (or per anonymous conversation), across
+    all anonymous conversations, and globally. Limits of 0 are unlimited.
+
+    Args:
+        conversation: Conversation being answered
+
+    Returns:
+        Semaphores in acquisition order, narrowest scope first
+    """
+    if conversation.user_id is None:
+        scopes = [
+            (
+                f"anonymous:{conversation.pk}",
+                settings.ASSISTANT_MAX_GENERATIONS_PER_USER,
+            ),
+            ("anonymous", settings.ASSISTANT_MAX_ANONYMOUS_GENERATIONS),
+        ]
+    else:
+        scopes = [
+            (
+                f"user:{conversation.user_id}",
+                settings.ASSISTANT_MAX_GENERATIONS_PER_USER,
+            )
+        ]
+    scopes.append(("global", settings.ASSISTANT_MAX_GENERATIONS))
+
+    return [_semaphore(name, limit) for name, limit in scopes if limit > 0]
+
+
+@asynccontextmanager
+async def ahold_generation_slot(
+    conversation: AssistantConversation,
+    on_queued: OnQueued | None = None,
+    is_cancelled: IsCancelled | None = None,
+) -> AsyncIterator[None]:
+    """Hold a generation slot in every scope the conversation belongs to.
+
+    Args:
+        conversation: Conversation being answered
+        on_queued: Called with the queue position while waiting for a slot
+        is_cancelled: Checked before queueing and while waiting for a slot
+
+    Raises:
+        GenerationCancelledError: is_cancelled returned True before the slots
+            were held
+    """
+    if is_cancelled is not None and await is_cancelled():
+        raise GenerationCancelledError
+
+    async with AsyncExitStack() as stack:
+        for semaphore in get_generation_semaphores(conversation):
+            await stack.enter_async_context(semaphore.hold(on_queued, is_cancelled))
+        yield
@@ -0,0 +1,164 @@
+from functools import cache
+from typing import TypedDict
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+
+import structlog
+import tiktoken
+
+from assistants.models import AssistantConversation, AssistantMessage
+from assistants.services.ai_service import ConversationMessage
+
+logger = structlog.get_logger(__name__)
+
+# Approximate per-message overhead of the chat format (role, separators)
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+class HistoryEntry(TypedDict):
+    """A cached history message with its precomputed token count."""
+
+    id: int
+    role: str
+    content: str
+    tokens: int
+
+
+class HistoryWindow(TypedDict):
+    """Rolling window of recent messages cached per conversation."""
+
+    last_id: int
+    entries: list[HistoryEntry]
+
+
+@cache
+def _get_encoding(name: str) -> tiktoken.Encoding | None:
+    if not name:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # Encodings are fetched once and cached on disk; fall back when offline
+        logger.warning("Tokenizer unavailable, estimating token counts", name=name)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens a message will use in the prompt.
+
+    Uses the local tiktoken encoding configured by ASSISTANT_HISTORY_TOKENIZER,
+    or a ~4 characters per token estimate when it is not available.
+
+    Args:
+        text: Message content
+
+    Returns:
+        Token count including the per-message overhead
+    """
+    encoding = _get_encoding(settings.ASSISTANT_HISTORY_TOKENIZER)
+    if encoding is None:
+        content_tokens = (len(text) + 3) // 4
+    else:
+        content_tokens = len(encoding.encode(text, disallowed_special=()))
+    return content_tokens + MESSAGE_TOKEN_OVERHEAD
+
+
+def _history_cache_key(conversation_id: str) -> str:
+    return f"assistant_history:{conversation_id}"
+
+
+def _trim_to_budget(entries: list[HistoryEntry], budget: int) -> list[HistoryEntry]:
+    """Drop the oldest entries once their combined tokens overrun the budget.
+
+    The start of the history stays put while it fits, and is then moved by a
+    whole chunk, down to ASSISTANT_HISTORY_TRIM_TARGET of the budget, so the
+    following turns keep sharing their prompt prefix until the next overrun.
+    """
+    total = sum(entry["tokens"] for entry in entries)
+    if total <= budget:
+        return entries
+    target = budget * settings.ASSISTANT_HISTORY_TRIM_TARGET
+    start = 0
+    while start < len(entries) and total > target:
+        total -= entries[start]["tokens"]
+        start += 1
+    return entries[start:]
+
+
+async def _fetch_entries(
+    conversation_id: str, after_id: int | None
+) -> list[HistoryEntry]:
+    queryset = AssistantMessage.objects.filter(conversation_id=conversation_id)
+    if after_id is None:
+        # Cold cache: only the newest messages can fit in the budget anyway
+        queryset = queryset.order_by("-id")[: settings.ASSISTANT_HISTORY_MAX_MESSAGES]
+    else:
+        queryset = queryset.filter(id__gt=after_id).order_by("-id")
+
+    rows = [row async for row in queryset.values_list("id", "content", "message_type")]
+    return [
+        {
+            "id": message_id,
+            "role": "user" if message_type == "user" else "assistant",
+            "content": content,
+            "tokens": count_tokens(content),
+        }
+        for message_id, content, message_type in reversed(rows)
+    ]
+
+
+async def aget_conversation_history(
+    conversation: AssistantConversation, current_message_id: int
+) -> list[ConversationMessage]:
+    """Build the prompt history for a conversation turn.
+
+    The conversation's running summary (if any) comes first as a system
+    message, followed by the unsummarized messages before current_message_id,
+    all within ASSISTANT_HISTORY_TOKEN_BUDGET. A window of recent messages is
+    cached per conversation, so each turn only queries messages newer than the
+    last cached id, and the history of consecutive turns keeps the same start
+    until the budget is overrun.
+
+    Args:
+        conversation: The conversation being answered
+        current_message_id: ID of the user message being answered (excluded)
+
+    Returns:
+        History messages in chronological order
+    """
+    conversation_id = str(conversation.pk)
+    budget: int = settings.ASSISTANT_HISTORY_TOKEN_BUDGET
+    key = _history_cache_key(conversation_id)
+
+    history: list[ConversationMessage] = []
+    if conversation.summary:
+        summary = f"Summary of the earlier conversation:\n{conversation.summary}"
+        history.append({"role": "system", "content": summary})
+        budget -= count_tokens(summary)
+
+    window: HistoryWindow | None = await django_cache.aget(key)
+    if window is None:
+        entries = await _fetch_entries(conversation_id, None)
+    else:
+        new_entries = await _fetch_entries(conversation_id, window["last_id"])
+        entries = window["entries"] + new_entries
+
+    summary_until = conversation.summary_until_message_id or 0
+    entries = [entry for entry in entries if entry["id"] > summary_until]
+    recent = _trim_to_budget(
+        [entry for entry in entries if entry["id"] < current_message_id], budget
+    )
+
+    # The window is cached as trimmed, so its start only moves on an overrun
+    entries = recent + [entry for entry in entries if entry["id"] >= current_message_id]
+    if entries:
+        window = {"last_id": entries[-1]["id"], "entries": entries}
+        await django_cache.aset(
+            key, window, timeout=settings.ASSISTANT_HISTORY_CACHE_TIMEOUT
+        )
+
+    history.extend(
+        {"role": entry["role"], "content": entry["content"]} for entry in recent
+    )
+    return history
@@ -0,0 +1,232 @@
+import asyncio
+import atexit
+import os
+import threading
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from django.conf import settings
+
+import httpx
+from celery.signals import worker_process_shutdown
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from pydantic import SecretStr
+
+from utils import async_worker
+
+ClientKey = tuple[str, float, str | None]
+EmbeddingsKey = tuple[str, int, str | None]
+
+CLOSE_TIMEOUT = 10
+
+
+class LLMClientRegistry:
+    """Process-level cache of ChatOpenAI clients sharing pooled HTTP connections.
+
+    Clients are keyed by (model, temperature, organization) and reuse one
+    keep-alive httpx pool, so TLS/connection setup is paid once per process
+    instead of once per message. httpx async clients are bound to the event
+    loop they were created on, so async state is tracked per loop. A semaphore
+    bounds in-flight requests; everything is rebuilt after a fork.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._http_client: httpx.Client | None = None
+        self._sync_models: dict[ClientKey, ChatOpenAI] = {}
+        self._sync_embeddings: dict[EmbeddingsKey, OpenAIEmbeddings] = {}
+        self._sync_limit = threading.BoundedSemaphore(
+            settings.OPENAI_MAX_CONCURRENT_REQUESTS
+        )
+        self._loop_state: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _LoopState
+        ] = weakref.WeakKeyDictionary()
+
+    def _check_pid(self) -> None:
+        # Connections must never be shared between forked worker processes
+        if self._pid != os.getpid():
+            self._reset()
+
+    def get_chat_model(self, model: str, temperature: float) -> ChatOpenAI:
+        """Return the shared client for the given model settings.
+
+        Args:
+            model: OpenAI model to use
+            temperature: Temperature for response generation
+
+        Returns:
+            A ChatOpenAI bound to the pooled HTTP clients
+        """
+        organization = getattr(settings, "OPENAI_ORG", None) or None
+        key: ClientKey = (model, temperature, organization)
+
+        loop = _get_running_loop()
+
+        with self._lock:
+            self._check_pid()
+            if loop is None:
+                models = self._sync_models
+                async_client = None
+            else:
+                state = self._get_loop_state(loop)
+                models = state.models
+                async_client = state.http_client
+
+            chat_model = models.get(key)
+            if chat_model is None:
+                chat_model = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    api_key=SecretStr(settings.OPENAI_API_KEY),
+                    organization=organization,
+                    streaming=True,
+                    # Reports usage, incl. prompt cache hits, on the last chunk
+                    stream_usage=True,
+                    timeout=settings.OPENAI_REQUEST_TIMEOUT,
+                    http_client=self._get_http_client(),
+                    http_async_client=async_client,
+                )
+                models[key] = chat_model
+            return chat_model
+
+    def get_embeddings(self, model: str, dimensions: int) -> OpenAIEmbeddings:
+        """Return the shared embeddings client for the given model settings.
+
+        Args:
+            model: OpenAI embedding model to use
+            dimensions: Size of the returned vectors
+
+        Returns:
+            An OpenAIEmbeddings bound to the pooled HTTP clients
+        """
+        organization = getattr(settings, "OPENAI_ORG", None) or None
+        key: EmbeddingsKey = (model, dimensions, organization)
+        loop = _get_running_loop()
+
+        with self._lock:
+            self._check_pid()
+            if loop is None:
+                embeddings = self._sync_embeddings
+                async_client = None
+            else:
+                state = self._get_loop_state(loop)
+                embeddings = state.embeddings
+                async_client = state.http_client
+
+            client = embeddings.get(key)
+            if client is None:
+                client = OpenAIEmbeddings(
+                    model=model,
+                    dimensions=dimensions,
+                    api_key=SecretStr(settings.OPENAI_API_KEY),
+                    organization=organization,
+                    timeout=settings.OPENAI_REQUEST_TIMEOUT,
+                    http_client=self._get_http_client(),
+                    http_async_client=async_client,
+                )
+                embeddings[key] = client
+            return client
+
+    @contextmanager
+    def limit(self) -> Iterator[None]:
+        """Hold one of the process-wide request slots for a sync call."""
+        with self._sync_limit:
+            yield
+
+    @asynccontextmanager
+    async def alimit(self) -> AsyncIterator[None]:
+        """Hold one of the current event loop's request slots."""
+        with self._lock:
+            self._check_pid()
+            semaphore = self._get_loop_state(asyncio.get_running_loop()).semaphore
+        async with semaphore:
+            yield
+
+    async def aclose_loop(self) -> None:
+        """Close the running event loop's async clients before the loop ends."""
+        with self._lock:
+            self._check_pid()
+            state = self._loop_state.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.http_client.aclose()
+
+    def close(self) -> None:
+        """Close pooled connections, e.g. on process or worker shutdown.
+
+        Async clients of loops still running in other threads are closed on
+        those loops.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            if self._http_client is not None:
+                self._http_client.close()
+            loop_states = list(self._loop_state.items())
+            self._reset()
+
+        current_loop = _get_running_loop()
+        for loop, state in loop_states:
+            # Async clients can only be closed on the loop they belong to
+            if loop.is_running() and loop is not current_loop:
+                future = asyncio.run_coroutine_threadsafe(
+                    state.http_client.aclose(), loop
+                )
+                future.result(CLOSE_TIMEOUT)
+
+    def _get_http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(limits=_connection_limits())
+        return self._http_client
+
+    def _get_loop_state(self, loop: asyncio.AbstractEventLoop) -> "_LoopState":
+        state = self._loop_state.get(loop)
+        if state is None:
+            state = _LoopState()
+            self._loop_state[loop] = state
+        return state
+
+
+class _LoopState:
+    """Async clients and request limit belonging to a single event loop."""
+
+    def __init__(self) -> None:
+        self.http_client = httpx.AsyncClient(limits=_connection_limits())
+        self.semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENT_REQUESTS)
+        self.models: dict[ClientKey, ChatOpenAI] = {}
+        self.embeddings: dict[EmbeddingsKey, OpenAIEmbeddings] = {}
+
+
+def _get_running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _connection_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+llm_clients = LLMClientRegistry()
+
+
+def _close_llm_clients(**kwargs: Any) -> None:
+    llm_clients.close()
+
+
+# Each loop's async clients are closed on that loop before it goes away
+async_worker.on_loop_close(llm_clients.aclose_loop)
+
+# Prefork Celery children exit without running atexit handlers
+atexit.register(llm_clients.close)
+worker_process_shutdown.connect(_close_llm_clients, weak=False)
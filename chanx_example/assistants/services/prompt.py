@@ -0,0 +1,89 @@
+"""
+Prompt assembly laid out for provider-side prompt prefix caching.
+
+Every prompt is the system prompt, the conversation summary and the history
+oldest first, followed by the new user message. Consecutive turns of a
+conversation therefore only append to the previous prompt, and providers
+caching prompt prefixes (e.g. OpenAI) serve the shared part without
+reprocessing it.
+"""
+
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+import structlog
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+)
+from langchain_core.messages.ai import UsageMetadata
+
+from assistants import metrics
+
+if TYPE_CHECKING:  # pragma: no cover
+    from assistants.services.ai_service import ConversationMessage
+
+logger = structlog.get_logger(__name__)
+
+
+def _to_message(role: str, content: str) -> BaseMessage:
+    if role == "user":
+        return HumanMessage(content=content)
+    if role == "system":
+        return SystemMessage(content=content)
+    return AIMessage(content=content)
+
+
+def build_prompt(
+    message: str, conversation_history: "list[ConversationMessage]"
+) -> list[BaseMessage]:
+    """Assemble the LangChain messages of a prompt.
+
+    Args:
+        message: Current user message
+        conversation_history: Previous conversation messages, oldest first
+
+    Returns:
+        The prefix shared with the previous turn, then the current user message
+    """
+    messages: list[BaseMessage] = []
+    system_prompt: str = settings.ASSISTANT_SYSTEM_PROMPT
+    if system_prompt:
+        messages.append(_to_message("system", system_prompt))
+
+    messages.extend(
+        _to_message(msg.get("role", "assistant"), msg["content"])
+        for msg in conversation_history
+    )
+
+    messages.append(HumanMessage(content=message))
+    return messages
+
+
+def usage_of(message: BaseMessage) -> UsageMetadata | None:
+    """Return the provider usage attached to a response or its last chunk."""
+    return message.usage_metadata if isinstance(message, AIMessage) else None
+
+
+def record_prompt_usage(model: str, usage: UsageMetadata | None) -> None:
+    """Count the prompt tokens and prefix cache hits reported by the provider.
+
+    Args:
+        model: Model that answered the prompt
+        usage: LangChain usage metadata of the response, if it was returned
+    """
+    if not usage:
+        return
+    input_tokens = usage["input_tokens"]
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+    logger.debug(
+        "Prompt usage",
+        model=model,
+        input_tokens=input_tokens,
+        cached_tokens=cached_tokens,
+    )
+    metrics.prompt_tokens.inc(input_tokens, model=model)
+    metrics.prompt_cached_tokens.inc(cached_tokens, model=model)
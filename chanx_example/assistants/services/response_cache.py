@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Callable
+from contextlib import aclosing
+from dataclasses import dataclass
+
+from django.conf import settings
+
+import structlog
+
+from assistants.services.ai_service import ConversationMessage, LLMBackend
+from assistants.services.llm_clients import llm_clients
+
+logger = structlog.get_logger(__name__)
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace and letter case so trivially different prompts match."""
+    return " ".join(text.split()).casefold()
+
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    history: list[ConversationMessage],
+    message: str,
+) -> str:
+    """Build the exact-match key of a prompt.
+
+    Args:
+        model: Model the response is generated with
+        temperature: Temperature the response is generated with
+        history: Prompt history sent along with the message
+        message: Current user message
+
+    Returns:
+        Hex digest identifying the normalized prompt
+    """
+    payload = json.dumps(
+        [
+            model,
+            temperature,
+            [[entry["role"], " ".join(entry["content"].split())] for entry in history],
+            normalize_prompt(message),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _unit_vector(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+@dataclass
+class CachedResponse:
+    """Stored chunks of a generated response."""
+
+    chunks: list[str]
+    scope: str
+    expires_at: float
+    embedding: list[float] | None = None
+
+
+class ResponseCache:
+    """Process-level LRU cache of generated assistant responses.
+
+    Entries expire after a TTL and the least recently used ones are evicted
+    once the cache is full. Entries may carry a prompt embedding, so
+    near-duplicate prompts can be answered by cosine similarity within the
+    same scope (model and temperature).
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses kept
+            ttl: Seconds a response stays valid
+            clock: Monotonic clock, injectable for testing
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        """Create a cache configured by the ASSISTANT_RESPONSE_CACHE_* settings."""
+        return cls(
+            max_entries=settings.ASSISTANT_RESPONSE_CACHE_MAX_ENTRIES,
+            ttl=settings.ASSISTANT_RESPONSE_CACHE_TTL,
+        )
+
+    def get(self, key: str) -> list[str] | None:
+        """Return the chunks stored under key, if still valid."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.chunks
+
+    def find_similar(
+        self, scope: str, embedding: list[float], threshold: float
+    ) -> list[str] | None:
+        """Return the chunks of the most similar prompt above threshold.
+
+        Args:
+            scope: Model settings the response must have been generated with
+            embedding: Embedding of the prompt being answered
+            threshold: Minimum cosine similarity of a match
+
+        Returns:
+            The matching response's chunks, or None
+        """
+        query = _unit_vector(embedding)
+        now = self.clock()
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+                del self._entries[key]
+            candidates = [
+                (key, entry.embedding)
+                for key, entry in self._entries.items()
+                if entry.embedding is not None and entry.scope == scope
+            ]
+
+        # Score outside the lock, so concurrent lookups and writes don't wait
+        best_key = None
+        best_score = threshold
+        for key, vector in candidates:
+            score = sum(a * b for a, b in zip(query, vector, strict=True))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(best_key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return entry.chunks
+
+    async def afind_similar(
+        self, scope: str, embedding: list[float], threshold: float
+    ) -> list[str] | None:
+        """Run find_similar in a worker thread, off the event loop."""
+        return await asyncio.to_thread(self.find_similar, scope, embedding, threshold)
+
+    def set(
+        self,
+        key: str,
+        scope: str,
+        chunks: list[str],
+        embedding: list[float] | None = None,
+    ) -> None:
+        """Store a response, evicting the least recently used ones if full.
+
+        Args:
+            key: Exact-match key from make_cache_key
+            scope: Model settings the response was generated with
+            chunks: Streamed chunks of the response
+            embedding: Optional prompt embedding for similarity lookups
+        """
+        entry = CachedResponse(
+            chunks=chunks,
+            scope=scope,
+            expires_at=self.clock() + self.ttl,
+            embedding=_unit_vector(embedding) if embedding is not None else None,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache.from_settings()
+
+
+async def _aembed_prompt(message: str) -> list[float] | None:
+    embeddings = llm_clients.get_embeddings(
+        settings.ASSISTANT_SEMANTIC_CACHE_MODEL,
+        settings.ASSISTANT_SEMANTIC_CACHE_DIMENSIONS,
+    )
+    try:
+        async with llm_clients.alimit():
+            return await embeddings.aembed_query(normalize_prompt(message))
+    except Exception:
+        logger.warning("Prompt embedding failed, skipping similarity lookup")
+        return None
+
+
+async def astream_response(
+    ai_service: LLMBackend,
+    message: str,
+    history: list[ConversationMessage],
+    allow_similar: bool = False,
+) -> AsyncGenerator[str, None]:
+    """Stream a response, replaying a cached one for repeated prompts.
+
+    Exact repeats (same model settings, history and normalized prompt) are
+    answered from the response cache. With allow_similar and
+    ASSISTANT_SEMANTIC_CACHE_ENABLED, the first message of a conversation may
+    also be answered by a near-duplicate prompt's response, unless the backend
+    opts out of prompt embeddings.
+
+    Args:
+        ai_service: Service generating responses on a cache miss
+        message: User message
+        history: Previous conversation messages
+        allow_similar: Whether near-duplicate prompts may share responses
+
+    Yields:
+        Tokens (or cached chunks) of the response
+    """
+    if not settings.ASSISTANT_RESPONSE_CACHE_ENABLED:
+        async with aclosing(ai_service.agenerate_stream(message, history)) as tokens:
+            async for token in tokens:
+                yield token
+        return
+
+    scope = f"{ai_service.model}:{ai_service.temperature}"
+    key = make_cache_key(ai_service.model, ai_service.temperature, history, message)
+    chunks = response_cache.get(key)
+
+    embedding = None
+    if (
+        chunks is None
+        and allow_similar
+        and not history
+        and settings.ASSISTANT_SEMANTIC_CACHE_ENABLED
+        and ai_service.semantic_cache
+    ):
+        embedding = await _aembed_prompt(message)
+        if embedding is not None:
+            chunks = await response_cache.afind_similar(
+                scope, embedding, settings.ASSISTANT_SEMANTIC_CACHE_THRESHOLD
+            )
+
+    if chunks is not None:
+        logger.info("Response cache hit", key=key)
+        for chunk in chunks:
+            yield chunk
+        return
+
+    generated: list[str] = []
+    async with aclosing(ai_service.agenerate_stream(message, history)) as tokens:
+        async for token in tokens:
+            generated.append(token)
+            yield token
+
+    if generated:
+        response_cache.set(key, scope, generated, embedding)
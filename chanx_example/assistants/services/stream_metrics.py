@@ -0,0 +1,109 @@
+import time
+from collections.abc import Callable
+
+import structlog
+
+from assistants import metrics
+
+logger = structlog.get_logger(__name__)
+
+
+class StreamMetrics:
+    """Latency breakdown of one assistant response.
+
+    Timings are collected in memory while streaming and written once when the
+    response is persisted, as a structured log event and as metrics.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """Initialize an empty collector.
+
+        Args:
+            clock: Monotonic clock, injectable for testing
+        """
+        self.clock = clock
+        self.model = ""
+        self.history_load: float | None = None
+        self.generation_started: float | None = None
+        self.first_token_at: float | None = None
+        self.last_token_at: float | None = None
+        self.token_count = 0
+        self.token_gaps: list[float] = []
+        self.send_latencies: list[float] = []
+
+    def history_loaded(self, started: float) -> None:
+        """Record the history load that began at the given clock time."""
+        self.history_load = self.clock() - started
+
+    def start_generation(self, model: str) -> None:
+        """Mark the moment the backend is asked for a response."""
+        self.model = model
+        self.generation_started = self.clock()
+
+    def token_received(self) -> None:
+        """Record the arrival of a streamed token."""
+        now = self.clock()
+        if self.first_token_at is None:
+            self.first_token_at = now
+        else:
+            assert self.last_token_at is not None
+            self.token_gaps.append(now - self.last_token_at)
+        self.last_token_at = now
+        self.token_count += 1
+
+    def frame_sent(self, started: float) -> None:
+        """Record the channel layer send that began at the given clock time."""
+        self.send_latencies.append(self.clock() - started)
+
+    @property
+    def time_to_first_token(self) -> float | None:
+        if self.first_token_at is None or self.generation_started is None:
+            return None
+        return self.first_token_at - self.generation_started
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        if self.first_token_at is None or self.last_token_at is None:
+            return None
+        elapsed = self.last_token_at - self.first_token_at
+        return len(self.token_gaps) / elapsed if elapsed > 0 else None
+
+    async def arecord(self, message_id: int, persisted_length: int) -> None:
+        """Log the timings of the response and add them to the metrics.
+
+        Args:
+            message_id: ID of the user message that was answered
+            persisted_length: Length of the stored response
+        """
+        ttft = self.time_to_first_token
+        rate = self.tokens_per_second
+        logger.info(
+            "Assistant response streamed",
+            message_id=message_id,
+            model=self.model,
+            history_load_ms=_ms(self.history_load),
+            time_to_first_token_ms=_ms(ttft),
+            tokens=self.token_count,
+            tokens_per_second=round(rate, 1) if rate is not None else None,
+            max_token_gap_ms=_ms(max(self.token_gaps, default=None)),
+            frames=len(self.send_latencies),
+            max_send_ms=_ms(max(self.send_latencies, default=None)),
+            persisted_length=persisted_length,
+        )
+
+        if self.history_load is not None:
+            await metrics.history_load_seconds.aobserve(self.history_load)
+        if ttft is not None:
+            await metrics.time_to_first_token_seconds.aobserve(ttft, model=self.model)
+        if rate is not None:
+            await metrics.tokens_per_second.aobserve(rate, model=self.model)
+        await metrics.inter_token_gap_seconds.aobserve_many(
+            self.token_gaps, model=self.model
+        )
+        await metrics.channel_send_seconds.aobserve_many(self.send_latencies)
+        await metrics.response_length_chars.aobserve(persisted_length, model=self.model)
+        await metrics.streamed_tokens.ainc(self.token_count, model=self.model)
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 1) if seconds is not None else None
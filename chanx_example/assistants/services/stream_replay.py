@@ -0,0 +1,199 @@
+import json
+from typing import TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from asgiref.sync import sync_to_async
+
+from utils.redis_cache import get_redis_client
+
+
+class StreamState(TypedDict):
+    """Progress of an in-flight (or recently finished) assistant stream."""
+
+    conversation_id: str
+    last_seq: int
+    complete_seq: int | None
+
+
+class StreamReplay(TypedDict):
+    """Frames a client missed, plus the completion seq if the stream ended."""
+
+    frames: list[tuple[int, str]]
+    complete_seq: int | None
+
+
+def _state_key(message_id: int) -> str:
+    return f"assistant_stream:{message_id}"
+
+
+def _frame_key(message_id: int, seq: int) -> str:
+    return f"assistant_stream:{message_id}:{seq}"
+
+
+def _frames_key(message_id: int) -> str:
+    return f"assistant_stream:{message_id}:frames"
+
+
+async def arecord_frame(
+    conversation_id: str, message_id: int, seq: int, content: str
+) -> None:
+    """Store a streamed frame so reconnecting clients can replay it.
+
+    Only the newest ASSISTANT_STREAM_REPLAY_MAX_FRAMES frames are kept. On the
+    Redis cache they form one capped list, written in a single pipelined round
+    trip that also pushes the whole buffer's expiry
+    ASSISTANT_STREAM_REPLAY_TIMEOUT seconds out. Other cache backends keep a
+    key per frame that expires on its own, so a stream outliving the timeout
+    loses its early frames, and replays needing them return None.
+
+    Args:
+        conversation_id: Conversation the stream belongs to
+        message_id: ID of the user message being answered
+        seq: Sequence number of the frame
+        content: Frame content
+    """
+    state: StreamState = {
+        "conversation_id": conversation_id,
+        "last_seq": seq,
+        "complete_seq": None,
+    }
+    if get_redis_client() is not None:
+        await sync_to_async(_record_frame_in_redis)(message_id, state, content)
+        return
+
+    await cache.aset_many(
+        {_frame_key(message_id, seq): content, _state_key(message_id): state},
+        timeout=settings.ASSISTANT_STREAM_REPLAY_TIMEOUT,
+    )
+
+    expired_seq = seq - settings.ASSISTANT_STREAM_REPLAY_MAX_FRAMES
+    if expired_seq > 0:
+        await cache.adelete(_frame_key(message_id, expired_seq))
+
+
+def _record_frame_in_redis(message_id: int, state: StreamState, content: str) -> None:
+    client = get_redis_client()
+    assert client is not None
+    frames_key = cache.make_and_validate_key(_frames_key(message_id))
+    timeout = settings.ASSISTANT_STREAM_REPLAY_TIMEOUT
+
+    with client.pipeline(transaction=False) as pipe:
+        pipe.rpush(frames_key, json.dumps([state["last_seq"], content]))
+        pipe.ltrim(frames_key, -settings.ASSISTANT_STREAM_REPLAY_MAX_FRAMES, -1)
+        pipe.expire(frames_key, timeout)
+        pipe.set(
+            cache.make_and_validate_key(_state_key(message_id)),
+            json.dumps(state),
+            ex=timeout,
+        )
+        pipe.execute()
+
+
+async def arecord_complete(
+    conversation_id: str, message_id: int, last_seq: int
+) -> None:
+    """Mark a stream as finished after its last frame.
+
+    Args:
+        conversation_id: Conversation the stream belongs to
+        message_id: ID of the user message being answered
+        last_seq: Sequence number of the last content frame
+    """
+    state: StreamState = {
+        "conversation_id": conversation_id,
+        "last_seq": last_seq,
+        "complete_seq": last_seq + 1,
+    }
+    if get_redis_client() is not None:
+        await sync_to_async(_record_complete_in_redis)(message_id, state)
+        return
+
+    await cache.aset(
+        _state_key(message_id), state, timeout=settings.ASSISTANT_STREAM_REPLAY_TIMEOUT
+    )
+
+
+def _record_complete_in_redis(message_id: int, state: StreamState) -> None:
+    client = get_redis_client()
+    assert client is not None
+    timeout = settings.ASSISTANT_STREAM_REPLAY_TIMEOUT
+
+    with client.pipeline(transaction=False) as pipe:
+        pipe.set(
+            cache.make_and_validate_key(_state_key(message_id)),
+            json.dumps(state),
+            ex=timeout,
+        )
+        pipe.expire(cache.make_and_validate_key(_frames_key(message_id)), timeout)
+        pipe.execute()
+
+
+async def aget_replay(
+    conversation_id: str, message_id: int, after_seq: int
+) -> StreamReplay | None:
+    """Return the frames of a stream that came after after_seq.
+
+    Args:
+        conversation_id: Conversation the client is connected to; streams of
+            other conversations are never replayed
+        message_id: ID of the user message being answered
+        after_seq: Last sequence number the client received
+
+    Returns:
+        The missed frames in order, or None when the stream is unknown,
+        expired, or older frames were already dropped from the buffer
+    """
+    if get_redis_client() is not None:
+        return await sync_to_async(_get_replay_from_redis)(
+            conversation_id, message_id, after_seq
+        )
+
+    state: StreamState | None = await cache.aget(_state_key(message_id))
+    if state is None or state["conversation_id"] != conversation_id:
+        return None
+
+    last_seq = state["last_seq"]
+    if last_seq - after_seq > settings.ASSISTANT_STREAM_REPLAY_MAX_FRAMES:
+        return None
+
+    seqs = range(max(after_seq, 0) + 1, last_seq + 1)
+    stored = await cache.aget_many([_frame_key(message_id, seq) for seq in seqs])
+    frames: list[tuple[int, str]] = []
+    for seq in seqs:
+        key = _frame_key(message_id, seq)
+        if key not in stored:
+            return None
+        frames.append((seq, stored[key]))
+
+    return {"frames": frames, "complete_seq": state["complete_seq"]}
+
+
+def _get_replay_from_redis(
+    conversation_id: str, message_id: int, after_seq: int
+) -> StreamReplay | None:
+    client = get_redis_client()
+    assert client is not None
+
+    with client.pipeline(transaction=False) as pipe:
+        pipe.get(cache.make_and_validate_key(_state_key(message_id)))
+        pipe.lrange(cache.make_and_validate_key(_frames_key(message_id)), 0, -1)
+        raw_state, raw_frames = pipe.execute()
+
+    if raw_state is None:
+        return None
+    state: StreamState = json.loads(raw_state)
+    if state["conversation_id"] != conversation_id:
+        return None
+
+    stored = [json.loads(raw_frame) for raw_frame in raw_frames]
+    frames = [(seq, content) for seq, content in stored if seq > after_seq]
+    # Frames right after after_seq were already trimmed from the buffer
+    expected_first = max(after_seq, 0) + 1
+    if expected_first <= state["last_seq"] and (
+        not frames or frames[0][0] != expected_first
+    ):
+        return None
+
+    return {"frames": frames, "complete_seq": state["complete_seq"]}
@@ -0,0 +1,110 @@
+import time
+from collections.abc import Callable
+
+from django.conf import settings
+
+
+class TokenBatcher:
+    """Coalesce streamed LLM tokens into time/size-bounded frames.
+
+    Tokens are buffered until either the flush interval has elapsed since the
+    last emitted frame or adding another token would exceed the frame size
+    limit. While no token arrives, flush_due emits a buffer that has waited
+    out the interval. Each emitted frame gets a monotonically increasing
+    sequence number. When batching is disabled every token becomes its own
+    frame.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float,
+        max_frame_bytes: int,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            flush_interval: Maximum seconds a token may wait before being emitted
+            max_frame_bytes: Maximum UTF-8 size of a frame (a single oversized
+                token is still emitted as one frame)
+            enabled: Whether to batch at all; False emits one frame per token
+            clock: Monotonic clock, injectable for testing
+        """
+        self.flush_interval = flush_interval
+        self.max_frame_bytes = max_frame_bytes
+        self.enabled = enabled
+        self.clock = clock
+
+        self.seq = 0
+        self._buffer: list[str] = []
+        self._buffer_bytes = 0
+        self._last_flush = clock()
+
+    @classmethod
+    def from_settings(cls) -> "TokenBatcher":
+        """Build a batcher configured from the ASSISTANT_STREAM_* settings."""
+        return cls(
+            flush_interval=settings.ASSISTANT_STREAM_FLUSH_INTERVAL_MS / 1000,
+            max_frame_bytes=settings.ASSISTANT_STREAM_MAX_FRAME_BYTES,
+            enabled=settings.ASSISTANT_STREAM_BATCHING,
+        )
+
+    def add(self, token: str) -> list[tuple[int, str]]:
+        """Buffer a token and return any frames that are ready to be sent.
+
+        Args:
+            token: Token text from the model stream
+
+        Returns:
+            List of (sequence number, content) frames, possibly empty
+        """
+        if not token:
+            return []
+
+        if not self.enabled:
+            return [self._emit(token)]
+
+        frames: list[tuple[int, str]] = []
+        token_bytes = len(token.encode())
+
+        if self._buffer and self._buffer_bytes + token_bytes > self.max_frame_bytes:
+            frames.append(self._emit_buffer())
+
+        self._buffer.append(token)
+        self._buffer_bytes += token_bytes
+
+        if (
+            self._buffer_bytes >= self.max_frame_bytes
+            or self.clock() - self._last_flush >= self.flush_interval
+        ):
+            frames.append(self._emit_buffer())
+
+        return frames
+
+    def flush_due(self) -> list[tuple[int, str]]:
+        """Emit the buffer if its flush interval has elapsed without a new token.
+
+        Called while the upstream stalls, so buffered tokens are not held back
+        until the next one arrives.
+        """
+        if not self._buffer or self.clock() - self._last_flush < self.flush_interval:
+            return []
+        return [self._emit_buffer()]
+
+    def flush(self) -> list[tuple[int, str]]:
+        """Emit whatever is still buffered, e.g. when the stream ends."""
+        if not self._buffer:
+            return []
+        return [self._emit_buffer()]
+
+    def _emit_buffer(self) -> tuple[int, str]:
+        content = "".join(self._buffer)
+        self._buffer = []
+        self._buffer_bytes = 0
+        return self._emit(content)
+
+    def _emit(self, content: str) -> tuple[int, str]:
+        self.seq += 1
+        self._last_flush = self.clock()
+        return self.seq, content
@@ -1,11 +1,20 @@
 from .ai_service_tasks import (
-    task_generate_conversation_title,
+    aupdate_conversation_title,
+    task_summarize_conversation,
 )
-from .assistant_tasks import task_handle_new_assistant_message
+from .assistant_tasks import (
+    atask_handle_new_assistant_message,
+    task_handle_new_assistant_message,
+)
+from .housekeeping_tasks import task_expire_anonymous_conversations
 
 __all__ = [
     # Main assistant tasks
     "task_handle_new_assistant_message",
+    "atask_handle_new_assistant_message",
     # AI service tasks
-    "task_generate_conversation_title",
+    "task_summarize_conversation",
+    "aupdate_conversation_title",
+    # Housekeeping tasks
+    "task_expire_anonymous_conversations",
 ]
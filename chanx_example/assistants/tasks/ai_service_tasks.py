@@ -1,29 +1,109 @@
 import logging
 
-from assistants.prompts import SUMMARY_TEMPLATE_PROMPT
-from assistants.services.ai_service import OpenAIService
+from django.conf import settings
+from django.core.cache import cache
+
+from assistants.constants import SUMMARY_MAX_FOLD_MESSAGES
+from assistants.consumers import ConversationAssistantConsumer
+from assistants.messages.assistant import (
+    ConversationTitleEvent,
+    ConversationTitlePayload,
+)
+from assistants.models import AssistantConversation
+from assistants.prompts import CONVERSATION_SUMMARY_PROMPT, SUMMARY_TEMPLATE_PROMPT
+from assistants.services.ai_service import get_llm_backend
+from assistants.utils import get_channel_name
+from utils.celery import shared_task
 
 logger = logging.getLogger(__name__)
 
 
-def task_generate_conversation_title(message: str) -> str:
+async def aupdate_conversation_title(
+    conversation: AssistantConversation, first_message: str
+) -> None:
     """
-    Generate a title for a conversation based on the first message.
+    Generate a conversation's title and push it to connected clients.
+
+    Runs concurrently with the first reply (see atask_handle_new_assistant_message),
+    so the title lands as soon as it is ready instead of delaying the reply.
 
     Args:
-        message: First user message in the conversation
+        conversation: Untitled conversation
+        first_message: Content of its first user message
+    """
+    ai_service = get_llm_backend(model="gpt-4o-mini", temperature=0.3)
+    try:
+        summary_prompt = SUMMARY_TEMPLATE_PROMPT.format(message=first_message)
+        title = (await ai_service.agenerate(summary_prompt, [])).strip()
+    except Exception:
+        # Fallback to simple truncation
+        logger.exception("Failed to generate title")
+        title = AssistantConversation.fallback_title(first_message)
+
+    # update() leaves updated_at alone and never overwrites a title set meanwhile
+    if not await AssistantConversation.objects.filter(
+        pk=conversation.pk, title=""
+    ).aupdate(title=title):
+        return
+    conversation.title = title
+
+    await ConversationAssistantConsumer.asend_channel_event(
+        get_channel_name(conversation),
+        ConversationTitleEvent(
+            payload=ConversationTitlePayload(
+                conversation_id=str(conversation.pk),
+                title=title,
+            )
+        ),
+    )
+
 
-    Returns:
-        str: Generated title
+def get_summary_lock_key(conversation_id: str) -> str:
+    return f"assistant_summary_lock:{conversation_id}"
+
+
+@shared_task()
+def task_summarize_conversation(conversation_id: str) -> None:
+    """
+    Fold older messages of a conversation into its running summary.
+
+    The newest ASSISTANT_SUMMARY_RECENT_MESSAGES messages stay verbatim in the
+    prompt; anything older that is not yet summarized is merged into
+    AssistantConversation.summary.
+
+    Args:
+        conversation_id: ID of the conversation to summarize
     """
-    ai_service = OpenAIService(model="gpt-4o-mini", temperature=0.3)
+    try:
+        conversation = AssistantConversation.objects.get(pk=conversation_id)
+        summary_until = conversation.summary_until_message_id
 
-    summary_prompt = SUMMARY_TEMPLATE_PROMPT.format(message=message)
+        messages = list(
+            conversation.messages.filter(id__gt=summary_until or 0)
+            .order_by("id")
+            .values_list("id", "content", "message_type")
+        )
+        fold_count = len(messages) - settings.ASSISTANT_SUMMARY_RECENT_MESSAGES
+        to_fold = messages[: max(0, min(fold_count, SUMMARY_MAX_FOLD_MESSAGES))]
+        if not to_fold:
+            return
 
-    # Use invoke method to get a single response
-    response = ai_service.llm.invoke(ai_service.format_messages(summary_prompt, []))
+        transcript = "\n".join(
+            f"{'User' if message_type == 'user' else 'Assistant'}: {content}"
+            for _, content, message_type in to_fold
+        )
+        prompt = CONVERSATION_SUMMARY_PROMPT.format(
+            summary=conversation.summary or "(none yet)",
+            transcript=transcript,
+        )
 
-    # Extract content from the response - LangChain returns an AIMessage object
-    title = response.text().strip()
+        ai_service = get_llm_backend(model="gpt-4o-mini", temperature=0.3)
+        summary = ai_service.generate(prompt, []).strip()
 
-    return title
+        # Skip the write if another run already moved the summary forward.
+        # update() also leaves updated_at (sidebar ordering) untouched.
+        AssistantConversation.objects.filter(
+            pk=conversation.pk, summary_until_message_id=summary_until
+        ).update(summary=summary, summary_until_message_id=to_fold[-1][0])
+    finally:
+        cache.delete(get_summary_lock_key(conversation_id))
@@ -1,22 +1,51 @@
-import logging
-from dataclasses import dataclass
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass, field
 from typing import Any, cast
 
 from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
 
+import structlog
+from asgiref.sync import sync_to_async
+
+from assistants.constants import SUMMARY_LOCK_TIMEOUT
 from assistants.consumers import ConversationAssistantConsumer
 from assistants.messages.assistant import (
     CompleteStreamingEvent,
+    GenerationQueuedEvent,
+    GenerationQueuedPayload,
     NewAssistantMessageEvent,
     StreamingEvent,
     StreamingPayload,
 )
 from assistants.models import AssistantConversation, AssistantMessage
 from assistants.serializers import AssistantMessageSerializer
-from assistants.services.ai_service import ConversationMessage, OpenAIService
+from assistants.services.ai_service import ConversationMessage, get_llm_backend
+from assistants.services.cancellation import aclear_stop, ais_stop_requested
+from assistants.services.generation_limiter import (
+    GenerationCancelledError,
+    ahold_generation_slot,
+)
+from assistants.services.history import aget_conversation_history
+from assistants.services.response_cache import astream_response
+from assistants.services.stream_metrics import StreamMetrics
+from assistants.services.stream_replay import arecord_complete, arecord_frame
+from assistants.services.token_batcher import TokenBatcher
+from assistants.tasks.ai_service_tasks import (
+    aupdate_conversation_title,
+    get_summary_lock_key,
+    task_summarize_conversation,
+)
+from assistants.utils import get_channel_name
+from utils import async_worker
+from utils.celery import shared_task
 
 channel_layer = get_channel_layer()
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
 
 
 @dataclass
@@ -26,54 +55,58 @@ class StreamingContext:
     user_content: str
     history: list[ConversationMessage]
     channel_name: str
+    conversation_id: str
     message_id: int
+    is_anonymous: bool = False
+    metrics: StreamMetrics = field(default_factory=StreamMetrics)
 
 
-def _get_conversation_history(
-    conversation: AssistantConversation,
-) -> list[ConversationMessage]:
-    conversation_history = list(
-        conversation.messages.order_by("created_at").values("content", "message_type")
+@shared_task()
+def task_handle_new_assistant_message(
+    user_message_id: int, is_first_message: bool = False
+) -> None:
+    """
+    Generate the AI response for a new user message.
+
+    The async pipeline runs on the worker's shared event loop, so a threaded
+    llm worker keeps many streams in flight without blocking on each one.
+
+    Args:
+        user_message_id: ID of the user message to respond to
+        is_first_message: Whether it opened the conversation, so a title is
+            generated alongside the reply
+    """
+    async_worker.run(
+        atask_handle_new_assistant_message, user_message_id, is_first_message
     )
-    # Convert to OpenAI format (exclude current message)
-    formatted_history: list[ConversationMessage] = []
-    for msg in conversation_history[:-1]:
-        role = "user" if msg["message_type"] == "user" else "assistant"
-        formatted_history.append({"role": role, "content": msg["content"]})
-    return formatted_history
-
-
-def get_channel_name(conversation: AssistantConversation) -> str:
-    conversation_id = conversation.pk
-    # Build channel name based on conversation type
-    if conversation.user is None:
-        channel_name = f"anonymous_{conversation_id}"
-    else:
-        user_id = conversation.user.pk
-        assert user_id is not None
-        channel_name = f"user_{user_id}_conversation_{conversation_id}"
-    return channel_name
-
-
-def task_handle_new_assistant_message(user_message_id: int) -> None:
+
+
+async def atask_handle_new_assistant_message(
+    user_message_id: int, is_first_message: bool = False
+) -> None:
     """
     Handle a new user message and generate AI response.
     Works for both authenticated and anonymous conversations.
 
     Args:
         user_message_id: ID of the user message to respond to
+        is_first_message: Whether it opened the conversation, so a title is
+            generated alongside the reply
     """
     assert channel_layer is not None
 
     # Get the user message and conversation
-    user_message = AssistantMessage.objects.select_related("conversation").get(
+    user_message = await AssistantMessage.objects.select_related("conversation").aget(
         id=user_message_id
     )
     conversation = user_message.conversation
     channel_name = get_channel_name(conversation)
 
-    # Get conversation history
-    formatted_history = _get_conversation_history(conversation)
+    # Get the conversation summary plus token-budgeted recent history
+    metrics = StreamMetrics()
+    history_started = metrics.clock()
+    formatted_history = await aget_conversation_history(conversation, user_message_id)
+    metrics.history_loaded(history_started)
 
     # Broadcast the user message first
     message_serializer = AssistantMessageSerializer(user_message)
@@ -84,56 +117,210 @@ def task_handle_new_assistant_message(user_message_id: int) -> None:
         user_content=user_message.content,
         history=formatted_history,
         channel_name=channel_name,
+        conversation_id=str(conversation.pk),
         message_id=user_message_id,
+        is_anonymous=conversation.user_id is None,
+        metrics=metrics,
     )
 
     # Generate and stream AI response
-    ConversationAssistantConsumer.send_channel_event(
+    await ConversationAssistantConsumer.asend_channel_event(
         channel_name,
         NewAssistantMessageEvent(payload=message_data),
     )
 
-    complete_msg = _generate_streaming_response(context)
+    async def notify_queued(position: int) -> None:
+        await ConversationAssistantConsumer.asend_channel_event(
+            channel_name,
+            GenerationQueuedEvent(
+                payload=GenerationQueuedPayload(
+                    message_id=user_message_id, position=position
+                )
+            ),
+        )
+
+    # Title a new conversation alongside its first reply rather than before it
+    title_task = None
+    if is_first_message and not conversation.title:
+        title_task = asyncio.create_task(
+            aupdate_conversation_title(conversation, user_message.content)
+        )
+
+    async def is_stopped() -> bool:
+        return await ais_stop_requested(context.conversation_id, user_message_id)
+
+    try:
+        # Bound concurrent generations per user, for anonymous users and globally
+        async with ahold_generation_slot(
+            conversation, on_queued=notify_queued, is_cancelled=is_stopped
+        ):
+            complete_msg = await _generate_streaming_response(context)
+
+        await AssistantMessage.objects.aadd_to_conversation(
+            conversation, complete_msg, AssistantMessage.MessageType.ASSISTANT
+        )
+        await metrics.arecord(user_message_id, len(complete_msg))
+    except GenerationCancelledError:
+        # Stopped before generating anything, so there is no reply to keep
+        logger.info("Generation stopped while queued", message_id=user_message_id)
+        await _complete_stream(context, TokenBatcher.from_settings())
+        return
+    finally:
+        if title_task is not None:
+            await title_task
+
+    await schedule_summary_if_needed(conversation)
+
 
-    AssistantMessage.objects.create(
-        conversation=conversation,
-        content=complete_msg,
-        message_type=AssistantMessage.MessageType.ASSISTANT,
+async def schedule_summary_if_needed(conversation: AssistantConversation) -> None:
+    """Refresh the running summary once enough messages piled up past it."""
+    unsummarized = await conversation.messages.filter(
+        id__gt=conversation.summary_until_message_id or 0
+    ).acount()
+    threshold = (
+        settings.ASSISTANT_SUMMARY_RECENT_MESSAGES
+        + settings.ASSISTANT_SUMMARY_TRIGGER_MESSAGES
     )
+    if unsummarized < threshold:
+        return
 
+    conversation_id = str(conversation.pk)
+    if await cache.aadd(
+        get_summary_lock_key(conversation_id), True, timeout=SUMMARY_LOCK_TIMEOUT
+    ):
+        await sync_to_async(task_summarize_conversation.delay)(conversation_id)
 
-def _generate_streaming_response(context: StreamingContext) -> str:
-    """Generate streaming AI response and broadcast chunks."""
+
+async def _generate_streaming_response(context: StreamingContext) -> str:
+    """Generate streaming AI response and broadcast coalesced chunks.
+
+    Stops early, keeping the partial response, when the client sends a
+    stop_generation message, even while the upstream stalls between tokens.
+    """
     complete_response = ""
 
-    ai_service = OpenAIService()
+    ai_service = get_llm_backend()
+    batcher = TokenBatcher.from_settings()
+    stop_check_interval = settings.ASSISTANT_STOP_CHECK_INTERVAL_MS / 1000
+    next_stop_check = time.monotonic()
+    # Wake up during upstream stalls to check for stops and flush held tokens
+    stall_interval = min(
+        (
+            interval
+            for interval in (
+                stop_check_interval,
+                batcher.flush_interval if batcher.enabled else 0,
+            )
+            if interval > 0
+        ),
+        default=0,
+    )
+    context.metrics.start_generation(ai_service.model)
 
-    # Generate streaming response
-    for token in ai_service.generate_stream(context.user_content, context.history):
-        complete_response += token
+    # Generate streaming response, or replay a cached one for repeated prompts
+    stream = astream_response(
+        ai_service,
+        context.user_content,
+        context.history,
+        allow_similar=context.is_anonymous,
+    )
+    # Closing the stream on stop aborts the upstream request right away
+    async with (
+        aclosing(stream),
+        aclosing(_race_stalls(stream, stall_interval)) as tokens,
+    ):
+        async for token in tokens:
+            if token is None:
+                frames = batcher.flush_due()
+            else:
+                context.metrics.token_received()
+                complete_response += token
+                frames = batcher.add(token)
 
-        # Send streaming chunk
-        ConversationAssistantConsumer.send_channel_event(
-            context.channel_name,
-            StreamingEvent(
-                payload=StreamingPayload(
-                    content=token,
-                    is_complete=False,
-                    message_id=context.message_id,
-                )
-            ),
-        )
+            # Send streaming chunks once a frame is ready
+            for seq, content in frames:
+                await _send_streaming_chunk(context, content, seq)
+
+            # Also checked while the upstream stalls, when no token arrives
+            if time.monotonic() >= next_stop_check:
+                if await ais_stop_requested(
+                    context.conversation_id, context.message_id
+                ):
+                    logger.info("Generation stopped", message_id=context.message_id)
+                    break
+                next_stop_check = time.monotonic() + stop_check_interval
+
+    await _complete_stream(context, batcher)
+    return complete_response
+
+
+async def _race_stalls(
+    stream: AsyncIterator[str], interval: float
+) -> AsyncGenerator[str | None, None]:
+    """Yield the stream's tokens, and None whenever none arrived for interval.
+
+    The pending read is kept across stalls, so a slow upstream loses nothing,
+    and is cancelled when the caller stops iterating. An interval of 0 never
+    reports stalls.
+    """
+    timeout = interval if interval > 0 else None
+    pending = asyncio.ensure_future(anext(stream))
+    try:
+        while True:
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield None
+                continue
+            try:
+                token = pending.result()
+            except StopAsyncIteration:
+                return
+            yield token
+            pending = asyncio.ensure_future(anext(stream))
+    finally:
+        pending.cancel()
+        # The stream can only be closed once the cancelled read let go of it
+        await asyncio.wait({pending})
+
+
+async def _complete_stream(context: StreamingContext, batcher: TokenBatcher) -> None:
+    """Send the buffered chunks and the completion signal of a response."""
+    await aclear_stop(context.conversation_id, context.message_id)
+
+    for seq, content in batcher.flush():
+        await _send_streaming_chunk(context, content, seq)
 
     # Send completion signal
-    ConversationAssistantConsumer.send_channel_event(
+    await arecord_complete(context.conversation_id, context.message_id, batcher.seq)
+    await ConversationAssistantConsumer.asend_channel_event(
         context.channel_name,
         CompleteStreamingEvent(
             payload=StreamingPayload(
                 content="",
                 is_complete=True,
                 message_id=context.message_id,
+                seq=batcher.seq + 1,
             )
         ),
     )
 
-    return complete_response
+
+async def _send_streaming_chunk(
+    context: StreamingContext, content: str, seq: int
+) -> None:
+    # Buffer before broadcasting so a client resuming right after never
+    # misses a frame; duplicates are dropped client-side by seq
+    await arecord_frame(context.conversation_id, context.message_id, seq, content)
+    send_started = context.metrics.clock()
+    await ConversationAssistantConsumer.asend_channel_event(
+        context.channel_name,
+        StreamingEvent(
+            payload=StreamingPayload(
+                content=content,
+                is_complete=False,
+                message_id=context.message_id,
+                seq=seq,
+            )
+        ),
+    )
+    context.metrics.frame_sent(send_started)
@@ -0,0 +1,33 @@
+import structlog
+
+from assistants import metrics
+from assistants.services.expiry import expire_anonymous_conversations_from_settings
+from utils.celery import shared_task
+
+logger = structlog.get_logger(__name__)
+
+
+@shared_task()
+def task_expire_anonymous_conversations(dry_run: bool | None = None) -> int:
+    """
+    Delete idle anonymous conversations, scheduled by CELERY_BEAT_SCHEDULE.
+
+    Args:
+        dry_run: Only count what would be deleted; defaults to
+            ASSISTANT_ANONYMOUS_EXPIRY_DRY_RUN
+
+    Returns:
+        int: Number of conversations deleted (or that would be)
+    """
+    result = expire_anonymous_conversations_from_settings(dry_run)
+    logger.info(
+        "Expired anonymous conversations",
+        conversations=result.conversations,
+        messages=result.messages,
+        dry_run=result.dry_run,
+    )
+
+    if not result.dry_run:
+        metrics.expired_conversations.inc(result.conversations)
+        metrics.expired_messages.inc(result.messages)
+    return result.conversations
@@ -1,3 +1,5 @@
+import json
+
 from rest_framework import status
 
 from chanx.messages.incoming import PingMessage
@@ -6,12 +8,23 @@ from chanx.messages.outgoing import PongMessage
 from assistants.consumers.conversation_consumer import ConversationAssistantConsumer
 from assistants.factories import AssistantConversationFactory
 from assistants.messages.assistant import (
+    CompleteStreamingEvent,
+    ConversationTitleEvent,
+    ConversationTitlePayload,
     ErrorEvent,
     ErrorPayload,
+    GenerationQueuedEvent,
+    GenerationQueuedPayload,
     NewAssistantMessageEvent,
+    ResumeStreamMessage,
+    ResumeStreamPayload,
+    StopGenerationMessage,
+    StopGenerationPayload,
     StreamingEvent,
     StreamingPayload,
 )
+from assistants.services.cancellation import ais_stop_requested
+from assistants.services.stream_replay import arecord_complete, arecord_frame
 from test_utils.testing import WebsocketTestCase
 
 
@@ -205,6 +218,167 @@ class TestConversationAssistantConsumer(WebsocketTestCase):
         assert message["payload"]["content"] == "Something went wrong"
         assert message["payload"]["message_id"] == "msg_id"
 
+    async def test_conversation_title_event_broadcast(self) -> None:
+        """Test consumer forwards generated conversation titles"""
+        await self.auth_communicator.connect()
+        await self.auth_communicator.assert_authenticated_status_ok()
+
+        await ConversationAssistantConsumer.asend_channel_event(
+            f"user_{self.user.pk}_conversation_{self.conversation.pk}",
+            ConversationTitleEvent(
+                payload=ConversationTitlePayload(
+                    conversation_id=str(self.conversation.pk),
+                    title="Trip planning",
+                )
+            ),
+        )
+
+        all_messages = await self.auth_communicator.receive_all_json()
+
+        assert len(all_messages) == 1
+        message = all_messages[0]
+        assert message["action"] == "conversation_title"
+        assert message["payload"] == {
+            "conversation_id": str(self.conversation.pk),
+            "title": "Trip planning",
+        }
+
+    async def test_generation_queued_event_broadcast(self) -> None:
+        """Test consumer forwards queue positions of pending responses"""
+        await self.auth_communicator.connect()
+        await self.auth_communicator.assert_authenticated_status_ok()
+
+        await ConversationAssistantConsumer.asend_channel_event(
+            f"user_{self.user.pk}_conversation_{self.conversation.pk}",
+            GenerationQueuedEvent(
+                payload=GenerationQueuedPayload(message_id=123, position=3)
+            ),
+        )
+
+        all_messages = await self.auth_communicator.receive_all_json()
+
+        assert len(all_messages) == 1
+        message = all_messages[0]
+        assert message["action"] == "generation_queued"
+        assert message["payload"] == {"message_id": 123, "position": 3}
+
+    async def test_resume_stream_replays_missed_frames(self) -> None:
+        """Test resuming replays buffered frames after the client's last seq"""
+        conversation_id = str(self.conversation.pk)
+        await arecord_frame(conversation_id, 321, 1, "Hello")
+        await arecord_frame(conversation_id, 321, 2, " world")
+        await arecord_complete(conversation_id, 321, 2)
+
+        await self.auth_communicator.connect()
+        await self.auth_communicator.assert_authenticated_status_ok()
+
+        await self.auth_communicator.send_message(
+            ResumeStreamMessage(payload=ResumeStreamPayload(message_id=321, last_seq=1))
+        )
+
+        all_messages = await self.auth_communicator.receive_all_json()
+        assert [
+            (message["action"], message["payload"]) for message in all_messages
+        ] == [
+            (
+                "streaming",
+                {
+                    "content": " world",
+                    "is_complete": False,
+                    "message_id": 321,
+                    "seq": 2,
+                },
+            ),
+            (
+                "complete_streaming",
+                {"content": "", "is_complete": True, "message_id": 321, "seq": 3},
+            ),
+        ]
+
+    async def test_resume_stream_of_other_conversation(self) -> None:
+        """Test streams of other conversations cannot be resumed"""
+        other_conversation = await AssistantConversationFactory.acreate(user=self.user)
+        await arecord_frame(str(other_conversation.pk), 654, 1, "Private")
+
+        await self.auth_communicator.connect()
+        await self.auth_communicator.assert_authenticated_status_ok()
+
+        await self.auth_communicator.send_message(
+            ResumeStreamMessage(payload=ResumeStreamPayload(message_id=654, last_seq=0))
+        )
+
+        all_messages = await self.auth_communicator.receive_all_json()
+        assert len(all_messages) == 1
+        assert all_messages[0]["action"] == "error"
+        assert all_messages[0]["payload"] == {
+            "content": "Stream can no longer be resumed",
+            "message_id": "654",
+        }
+
+    async def test_compact_wire_format(self) -> None:
+        """Test ?wire=compact clients receive streaming frames as arrays"""
+        communicator = self.create_communicator(
+            ws_path=f"{self.ws_path}?wire=compact", headers=self.ws_headers
+        )
+        await communicator.connect()
+        await communicator.assert_authenticated_status_ok()
+
+        group = f"user_{self.user.pk}_conversation_{self.conversation.pk}"
+        await ConversationAssistantConsumer.asend_channel_event(
+            group,
+            StreamingEvent(
+                payload=StreamingPayload(content="Héllo", message_id=123, seq=1)
+            ),
+        )
+        await ConversationAssistantConsumer.asend_channel_event(
+            group,
+            CompleteStreamingEvent(
+                payload=StreamingPayload(
+                    content="", is_complete=True, message_id=123, seq=2
+                )
+            ),
+        )
+
+        frames = [json.loads(await communicator.receive_from()) for _ in range(4)]
+        # Each event is still followed by chanx's JSON completion marker
+        assert [frame for frame in frames if isinstance(frame, list)] == [
+            ["s", 123, 1, "Héllo"],
+            ["c", 123, 2],
+        ]
+        await communicator.disconnect()
+
+    async def test_compact_wire_format_resume(self) -> None:
+        """Test replayed frames use the compact format too"""
+        conversation_id = str(self.conversation.pk)
+        await arecord_frame(conversation_id, 321, 1, "Hello")
+        await arecord_complete(conversation_id, 321, 1)
+
+        communicator = self.create_communicator(
+            ws_path=f"{self.ws_path}?wire=compact", headers=self.ws_headers
+        )
+        await communicator.connect()
+        await communicator.assert_authenticated_status_ok()
+
+        await communicator.send_message(
+            ResumeStreamMessage(payload=ResumeStreamPayload(message_id=321, last_seq=0))
+        )
+
+        assert json.loads(await communicator.receive_from()) == ["s", 321, 1, "Hello"]
+        assert json.loads(await communicator.receive_from()) == ["c", 321, 2]
+        await communicator.disconnect()
+
+    async def test_stop_generation_requests_stop(self) -> None:
+        """Test a stop message flags the response of this conversation"""
+        await self.auth_communicator.connect()
+        await self.auth_communicator.assert_authenticated_status_ok()
+
+        await self.auth_communicator.send_message(
+            StopGenerationMessage(payload=StopGenerationPayload(message_id=987))
+        )
+        await self.auth_communicator.receive_all_json()
+
+        assert await ais_stop_requested(str(self.conversation.pk), 987)
+
     async def test_build_groups_returns_conversation_specific_group_authenticated(
         self,
     ) -> None:
@@ -1,11 +1,12 @@
 from typing import Any, cast
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from django.conf import settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from asgiref.sync import sync_to_async
+from chanx.testing import WebsocketCommunicator
 
 from assistants.factories import AssistantConversationFactory
 from assistants.messages.assistant import StreamingMessage, StreamingPayload
@@ -20,6 +21,20 @@ from test_utils.openai_test_utils import (
 from test_utils.testing import WebsocketTestCase
 
 
+async def without_title(
+    communicator: WebsocketCommunicator,
+    messages: list[dict[str, Any]],
+    title_message: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Drop the title event, generated alongside the reply so it lands anywhere."""
+    if title_message not in messages:
+        messages += await communicator.receive_until_action(
+            "conversation_title", 1000, inclusive=True
+        )
+    assert messages.count(title_message) == 1
+    return [message for message in messages if message != title_message]
+
+
 class TestAuthorizedAssistantConsumerIntegration(WebsocketTestCase):
     """Integration tests for ConversationAssistantConsumer - tests full API → WebSocket flow"""
 
@@ -32,9 +47,13 @@ class TestAuthorizedAssistantConsumerIntegration(WebsocketTestCase):
         # Set up authenticated API client
         self.api_client = AuthAPITestCase.get_client_for_user(self.user)
 
+    @patch(
+        "openai.resources.chat.completions.AsyncCompletions.create",
+        new_callable=AsyncMock,
+    )
     @patch("openai.resources.chat.completions.Completions.create")
     async def test_full_flow_with_streaming_and_api_call(
-        self, mock_create: Mock
+        self, mock_create: Mock, mock_acreate: AsyncMock
     ) -> None:
         """Test the complete flow"""
         # Clear conversation title
@@ -77,6 +96,7 @@ class TestAuthorizedAssistantConsumerIntegration(WebsocketTestCase):
             return res
 
         mock_create.side_effect = mock_create_side_effect
+        mock_acreate.side_effect = mock_create_side_effect
 
         # Connect to WebSocket
         await self.auth_communicator.connect()
@@ -127,9 +147,12 @@ class TestAuthorizedAssistantConsumerIntegration(WebsocketTestCase):
                     content=token,
                     is_complete=False,
                     message_id=user_first_message_db.pk,
+                    seq=seq,
                 )
             ).model_dump()
-            for token in tokenize_for_streaming(ai_first_msg_response)
+            for seq, token in enumerate(
+                tokenize_for_streaming(ai_first_msg_response), start=1
+            )
         ]
         streaming_messages = [
             {**msg, "is_mine": False, "is_current": False}
@@ -141,11 +164,23 @@ class TestAuthorizedAssistantConsumerIntegration(WebsocketTestCase):
                 "content": "",
                 "is_complete": True,
                 "message_id": user_first_message_db.pk,
+                "seq": len(raw_streaming_messages) + 1,
             },
             "is_mine": False,
             "is_current": False,
         }
-        assert all_messages == [
+        title_message = {
+            "action": "conversation_title",
+            "payload": {
+                "conversation_id": str(self.conversation.pk),
+                "title": ai_conversation_title,
+            },
+            "is_mine": False,
+            "is_current": False,
+        }
+        assert await without_title(
+            self.auth_communicator, all_messages, title_message
+        ) == [
             user_message,
             *streaming_messages,
             finish_message,
@@ -190,9 +225,12 @@ class TestAuthorizedAssistantConsumerIntegration(WebsocketTestCase):
                     content=token,
                     is_complete=False,
                     message_id=user_second_message_db.pk,
+                    seq=seq,
                 )
             ).model_dump()
-            for token in tokenize_for_streaming(ai_second_msg_response)
+            for seq, token in enumerate(
+                tokenize_for_streaming(ai_second_msg_response), start=1
+            )
         ]
         streaming_messages = [
             {**msg, "is_mine": False, "is_current": False}
@@ -204,6 +242,7 @@ class TestAuthorizedAssistantConsumerIntegration(WebsocketTestCase):
                 "content": "",
                 "is_complete": True,
                 "message_id": user_second_message_db.pk,
+                "seq": len(raw_streaming_messages) + 1,
             },
             "is_mine": False,
             "is_current": False,
@@ -225,9 +264,13 @@ class TestAnonymousAssistantConsumerIntegration(WebsocketTestCase):
         # Set up authenticated API client
         self.api_client = APIClient()
 
+    @patch(
+        "openai.resources.chat.completions.AsyncCompletions.create",
+        new_callable=AsyncMock,
+    )
     @patch("openai.resources.chat.completions.Completions.create")
     async def test_full_anonymous_flow_with_streaming_and_api_call(
-        self, mock_create: Mock
+        self, mock_create: Mock, mock_acreate: AsyncMock
     ) -> None:
         """Test the complete flow"""
         # Clear conversation title
@@ -270,6 +313,7 @@ class TestAnonymousAssistantConsumerIntegration(WebsocketTestCase):
             return res
 
         mock_create.side_effect = mock_create_side_effect
+        mock_acreate.side_effect = mock_create_side_effect
 
         # Connect to WebSocket with unauthenticated communicator
         communicator = self.create_communicator(
@@ -323,9 +367,12 @@ class TestAnonymousAssistantConsumerIntegration(WebsocketTestCase):
                     content=token,
                     is_complete=False,
                     message_id=user_first_message_db.pk,
+                    seq=seq,
                 )
             ).model_dump()
-            for token in tokenize_for_streaming(ai_first_msg_response)
+            for seq, token in enumerate(
+                tokenize_for_streaming(ai_first_msg_response), start=1
+            )
         ]
         streaming_messages = [
             {**msg, "is_mine": False, "is_current": False}
@@ -337,11 +384,21 @@ class TestAnonymousAssistantConsumerIntegration(WebsocketTestCase):
                 "content": "",
                 "is_complete": True,
                 "message_id": user_first_message_db.pk,
+                "seq": len(raw_streaming_messages) + 1,
             },
             "is_mine": False,
             "is_current": False,
         }
-        assert all_messages == [
+        title_message = {
+            "action": "conversation_title",
+            "payload": {
+                "conversation_id": str(self.conversation.pk),
+                "title": ai_conversation_title,
+            },
+            "is_mine": False,
+            "is_current": False,
+        }
+        assert await without_title(communicator, all_messages, title_message) == [
             user_message,
             *streaming_messages,
             finish_message,
@@ -386,9 +443,12 @@ class TestAnonymousAssistantConsumerIntegration(WebsocketTestCase):
                     content=token,
                     is_complete=False,
                     message_id=user_second_message_db.pk,
+                    seq=seq,
                 )
             ).model_dump()
-            for token in tokenize_for_streaming(ai_second_msg_response)
+            for seq, token in enumerate(
+                tokenize_for_streaming(ai_second_msg_response), start=1
+            )
         ]
         streaming_messages = [
             {**msg, "is_mine": False, "is_current": False}
@@ -400,6 +460,7 @@ class TestAnonymousAssistantConsumerIntegration(WebsocketTestCase):
                 "content": "",
                 "is_complete": True,
                 "message_id": user_second_message_db.pk,
+                "seq": len(raw_streaming_messages) + 1,
             },
             "is_mine": False,
             "is_current": False,
@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
 
 from accounts.factories.user import UserFactory
 from assistants.models import AssistantConversation, AssistantMessage
@@ -54,3 +57,90 @@ class AssistantMessageModelTest(TestCase):
         )
         expected = f"user: {short_content}..."
         assert str(message) == expected
+
+    def test_add_to_conversation(self) -> None:
+        """Test a message is added with one conversation update."""
+        previous_updated_at = self.conversation.updated_at
+
+        # savepoint, insert, update, count read back, release
+        with self.assertNumQueries(5):
+            message = AssistantMessage.objects.add_to_conversation(
+                self.conversation,
+                "Hello",
+                AssistantMessage.MessageType.ASSISTANT,
+            )
+
+        assert message.pk is not None
+        assert self.conversation.message_count == 1
+        self.conversation.refresh_from_db()
+        assert self.conversation.title == "Test Conversation"
+        assert self.conversation.message_count == 1
+        assert self.conversation.last_message_preview == "Hello"
+        assert self.conversation.updated_at > previous_updated_at
+        assert list(self.conversation.messages.values_list("content", flat=True)) == [
+            "Hello"
+        ]
+
+    def test_add_to_conversation_reads_back_count(self) -> None:
+        """Test the count comes from the row, not the in-memory instance."""
+        stale = AssistantConversation.objects.get(pk=self.conversation.pk)
+        AssistantMessage.objects.add_to_conversation(
+            self.conversation, "First", AssistantMessage.MessageType.USER
+        )
+
+        AssistantMessage.objects.add_to_conversation(
+            stale, "Second", AssistantMessage.MessageType.USER
+        )
+
+        assert stale.message_count == 2
+
+    def test_save_updates_last_message_fields(self) -> None:
+        """Test creating a message counts it and refreshes the preview."""
+        AssistantMessage.objects.create(conversation=self.conversation, content="Hi")
+        message = AssistantMessage.objects.create(
+            conversation=self.conversation, content="B" * 150
+        )
+
+        self.conversation.refresh_from_db()
+        assert self.conversation.message_count == 2
+        assert self.conversation.last_message_preview == "B" * 100 + "..."
+        assert self.conversation.last_message_at == message.created_at
+
+        message.content = "Edited"
+        message.save()
+
+        self.conversation.refresh_from_db()
+        assert self.conversation.message_count == 2
+
+    def test_bulk_import(self) -> None:
+        """Test imported messages keep their timestamps and touch conversations."""
+        other = AssistantConversation.objects.create(user=self.user)
+        sent_at = timezone.now() - timedelta(days=3)
+
+        messages = AssistantMessage.objects.bulk_import(
+            [
+                AssistantMessage(
+                    conversation=self.conversation,
+                    content="Hi",
+                    created_at=sent_at,
+                ),
+                AssistantMessage(
+                    conversation=self.conversation,
+                    content="Hello!",
+                    message_type=AssistantMessage.MessageType.ASSISTANT,
+                    created_at=sent_at + timedelta(minutes=1),
+                ),
+                AssistantMessage(conversation=other, content="Hey", created_at=sent_at),
+            ]
+        )
+
+        assert all(message.pk for message in messages)
+        self.conversation.refresh_from_db()
+        other.refresh_from_db()
+        assert self.conversation.updated_at == sent_at + timedelta(minutes=1)
+        assert self.conversation.last_message_at == sent_at + timedelta(minutes=1)
+        assert self.conversation.last_message_preview == "Hello!"
+        assert self.conversation.message_count == 2
+        assert other.updated_at == sent_at
+        assert other.message_count == 1
+        assert self.conversation.messages.count() == 2
@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from asgiref.sync import async_to_sync
+
+from assistants.factories import AssistantConversationFactory, AssistantMessageFactory
+from assistants.models import AssistantMessage
+from assistants.services.ai_service import OpenAIService, get_llm_backend
+from assistants.services.fake_backend import FakeLLMBackend
+from assistants.tasks import task_handle_new_assistant_message
+
+FAST_FAKE_BACKEND = {
+    "ASSISTANT_LLM_BACKEND": "fake",
+    "ASSISTANT_FAKE_BACKEND_TOKENS": 20,
+    "ASSISTANT_FAKE_BACKEND_TOKENS_PER_SECOND": 0,
+    "ASSISTANT_FAKE_BACKEND_FIRST_TOKEN_MS": 0,
+}
+
+
+@override_settings(**FAST_FAKE_BACKEND)
+class FakeLLMBackendTest(SimpleTestCase):
+    """Test cases for FakeLLMBackend."""
+
+    def test_registry_selects_backend(self) -> None:
+        """Test ASSISTANT_LLM_BACKEND picks the backend class."""
+        backend = get_llm_backend(model="gpt-4o-mini", temperature=0.3)
+
+        assert isinstance(backend, FakeLLMBackend)
+        assert (backend.model, backend.temperature) == ("gpt-4o-mini", 0.3)
+
+        with override_settings(ASSISTANT_LLM_BACKEND="openai"):
+            assert isinstance(get_llm_backend(), OpenAIService)
+        with override_settings(
+            ASSISTANT_LLM_BACKEND="assistants.services.fake_backend.FakeLLMBackend"
+        ):
+            assert isinstance(get_llm_backend(), FakeLLMBackend)
+
+    def test_responses_are_deterministic(self) -> None:
+        """Test identical prompts get identical responses of the set length."""
+        backend = FakeLLMBackend()
+
+        tokens = backend.build_tokens("Hello", [])
+
+        assert len(tokens) == 20
+        assert tokens == backend.build_tokens("Hello", [])
+        assert tokens != backend.build_tokens(
+            "Hello", [{"role": "user", "content": "Hi"}]
+        )
+        assert backend.generate("Hello", []) == "".join(tokens)
+        assert list(backend.generate_stream("Hello", [])) == tokens
+
+    def test_async_stream(self) -> None:
+        """Test the async stream yields the same tokens."""
+        backend = FakeLLMBackend()
+
+        async def collect() -> list[str]:
+            return [token async for token in backend.agenerate_stream("Hello", [])]
+
+        assert async_to_sync(collect)() == backend.build_tokens("Hello", [])
+
+
+@override_settings(**FAST_FAKE_BACKEND)
+class FakeBackendPipelineTest(TestCase):
+    """Test the assistant pipeline runs end to end on the fake backend."""
+
+    def test_reply_is_generated_offline(self) -> None:
+        """Test a reply is streamed and stored without calling OpenAI."""
+        conversation = AssistantConversationFactory.create()
+        user_message = AssistantMessageFactory.create_user_message(
+            conversation=conversation, content="Hi"
+        )
+
+        task_handle_new_assistant_message(user_message.pk)
+
+        reply = AssistantMessage.objects.get(
+            conversation=conversation,
+            message_type=AssistantMessage.MessageType.ASSISTANT,
+        )
+        assert reply.content == FakeLLMBackend().generate("Hi", [])
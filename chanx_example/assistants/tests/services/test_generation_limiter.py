@@ -0,0 +1,212 @@
+import asyncio
+from collections.abc import Callable
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from asgiref.sync import async_to_sync
+
+from accounts.factories.user import UserFactory
+from assistants.factories import AssistantConversationFactory
+from assistants.services.generation_limiter import (
+    RELEASE_SCRIPT,
+    DistributedSemaphore,
+    GenerationCancelledError,
+    get_generation_semaphores,
+)
+
+
+class DistributedSemaphoreTest(TestCase):
+    """Test cases for DistributedSemaphore."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def make_semaphore(self, limit: int) -> DistributedSemaphore:
+        return DistributedSemaphore("test", limit, lease_timeout=60, poll_interval=0.01)
+
+    def test_bounds_concurrency(self) -> None:
+        """Test at most limit holders run at once."""
+        semaphore = self.make_semaphore(2)
+        active = 0
+        peak = 0
+
+        async def work() -> None:
+            nonlocal active, peak
+            async with semaphore.hold():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+
+        async def run_all() -> None:
+            await asyncio.gather(*(work() for _ in range(5)))
+
+        async_to_sync(run_all)()
+
+        assert peak == 2
+        assert cache.get_many(semaphore.slot_keys) == {}
+
+    def test_waiters_served_in_order(self) -> None:
+        """Test queued holders get slots in arrival order and see their position."""
+        semaphore = self.make_semaphore(1)
+        order: list[int] = []
+        positions: dict[int, list[int]] = {0: [], 1: [], 2: []}
+
+        async def wait_for(condition: Callable[[], bool]) -> None:
+            while not condition():
+                await asyncio.sleep(0.005)
+
+        async def work(index: int, done: asyncio.Event) -> None:
+            async def on_queued(position: int) -> None:
+                positions[index].append(position)
+
+            async with semaphore.hold(on_queued):
+                order.append(index)
+                await done.wait()
+
+        async def run_all() -> None:
+            done = [asyncio.Event() for _ in range(3)]
+            tasks = [asyncio.create_task(work(0, done[0]))]
+            await wait_for(lambda: order == [0])
+            tasks.append(asyncio.create_task(work(1, done[1])))
+            await wait_for(lambda: bool(positions[1]))
+            tasks.append(asyncio.create_task(work(2, done[2])))
+            await wait_for(lambda: bool(positions[2]))
+
+            for event in done:
+                event.set()
+            await asyncio.gather(*tasks)
+
+        async_to_sync(run_all)()
+
+        assert order == [0, 1, 2]
+        assert positions[0] == []
+        assert positions[1] == [1]
+        assert positions[2][0] == 2
+
+    def test_cancelled_while_waiting(self) -> None:
+        """Test a waiter gives up its place once it is cancelled."""
+        semaphore = self.make_semaphore(1)
+        stopped = False
+
+        async def is_cancelled() -> bool:
+            return stopped
+
+        async def wait() -> None:
+            async with semaphore.hold(is_cancelled=is_cancelled):
+                pass  # pragma: no cover
+
+        async def run() -> None:
+            nonlocal stopped
+            async with semaphore.hold():
+                waiter = asyncio.create_task(wait())
+                await asyncio.sleep(0.03)
+                stopped = True
+                with self.assertRaises(GenerationCancelledError):
+                    await waiter
+
+        async_to_sync(run)()
+
+        assert cache.get_many(semaphore.slot_keys) == {}
+
+    def test_renews_lease_while_held(self) -> None:
+        """Test a slot held past its lease timeout is not freed."""
+        semaphore = DistributedSemaphore("test", 1, lease_timeout=1, poll_interval=0.01)
+
+        async def run() -> None:
+            async with semaphore.hold():
+                await asyncio.sleep(1.2)
+                assert cache.get_many(semaphore.slot_keys) != {}
+
+        async_to_sync(run)()
+
+        assert cache.get_many(semaphore.slot_keys) == {}
+
+    def test_release_keeps_slot_claimed_by_another_holder(self) -> None:
+        """Test a lease that expired and was re-claimed is not released."""
+        semaphore = self.make_semaphore(1)
+
+        async def run() -> None:
+            async with semaphore.hold():
+                # The lease expired and another worker claimed the slot
+                await cache.aset(semaphore.slot_keys[0], 42)
+
+        async_to_sync(run)()
+
+        assert cache.get(semaphore.slot_keys[0]) == 42
+
+    def test_release_compares_and_deletes_on_redis(self) -> None:
+        """Test the Redis release checks the token and deletes in one script."""
+        semaphore = self.make_semaphore(1)
+        client = MagicMock()
+        script = client.register_script.return_value
+        script.return_value = 1
+
+        async def run() -> None:
+            async with semaphore.hold():
+                pass
+
+        with patch(
+            "assistants.services.generation_limiter.get_redis_client",
+            return_value=client,
+        ):
+            async_to_sync(run)()
+
+        client.register_script.assert_called_once_with(RELEASE_SCRIPT)
+        token = cache.get(semaphore.slot_keys[0])
+        script.assert_called_once_with(
+            keys=[cache.make_and_validate_key(semaphore.slot_keys[0])], args=[token]
+        )
+
+    def test_skips_tickets_of_gone_waiters(self) -> None:
+        """Test a ticket whose waiter died does not block the queue forever."""
+        semaphore = self.make_semaphore(1)
+        # A waiter took ticket 1, then its worker died before being served
+        cache.set(semaphore.ticket_key, 1, timeout=None)
+
+        async def run() -> None:
+            async with semaphore.hold():
+                pass
+
+        async_to_sync(run)()
+
+        assert cache.get(semaphore.served_key) == 2
+
+
+class GenerationSemaphoresTest(TestCase):
+    """Test cases for the scopes a generation is limited by."""
+
+    @override_settings(
+        ASSISTANT_MAX_GENERATIONS_PER_USER=2,
+        ASSISTANT_MAX_ANONYMOUS_GENERATIONS=4,
+        ASSISTANT_MAX_GENERATIONS=8,
+    )
+    def test_scopes(self) -> None:
+        """Test users and anonymous conversations get their own scopes."""
+        user = UserFactory.create()
+        conversation = AssistantConversationFactory.create(user=user)
+        anonymous = AssistantConversationFactory.create(user=None)
+
+        assert [
+            (semaphore.name, semaphore.limit)
+            for semaphore in get_generation_semaphores(conversation)
+        ] == [(f"user:{user.pk}", 2), ("global", 8)]
+        assert [
+            (semaphore.name, semaphore.limit)
+            for semaphore in get_generation_semaphores(anonymous)
+        ] == [(f"anonymous:{anonymous.pk}", 2), ("anonymous", 4), ("global", 8)]
+
+    @override_settings(
+        ASSISTANT_MAX_GENERATIONS_PER_USER=0,
+        ASSISTANT_MAX_ANONYMOUS_GENERATIONS=0,
+        ASSISTANT_MAX_GENERATIONS=8,
+    )
+    def test_zero_disables_limit(self) -> None:
+        """Test scopes with a limit of 0 are not enforced."""
+        anonymous = AssistantConversationFactory.create(user=None)
+
+        assert [
+            semaphore.name for semaphore in get_generation_semaphores(anonymous)
+        ] == ["global"]
@@ -0,0 +1,166 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from asgiref.sync import async_to_sync
+
+from assistants.factories import AssistantConversationFactory, AssistantMessageFactory
+from assistants.models import AssistantConversation, AssistantMessage
+from assistants.services.ai_service import ConversationMessage
+from assistants.services.history import (
+    MESSAGE_TOKEN_OVERHEAD,
+    aget_conversation_history,
+    count_tokens,
+)
+
+
+class ConversationHistoryTest(TestCase):
+    """Test cases for the token-budgeted conversation history."""
+
+    conversation: AssistantConversation
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.conversation = AssistantConversationFactory.create()
+
+    def add_turn(self, user: str, assistant: str) -> None:
+        AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content=user
+        )
+        AssistantMessageFactory.create_assistant_message(
+            conversation=self.conversation, content=assistant
+        )
+
+    def get_history(self, current: AssistantMessage) -> list[ConversationMessage]:
+        return async_to_sync(aget_conversation_history)(self.conversation, current.pk)
+
+    def test_excludes_current_message(self) -> None:
+        """Test history holds previous messages in order, without the current one."""
+        self.add_turn("Hi", "Hello!")
+        current = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="How are you?"
+        )
+
+        assert self.get_history(current) == [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello!"},
+        ]
+
+    def test_empty_conversation(self) -> None:
+        """Test the first message has no history."""
+        current = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="First"
+        )
+
+        assert self.get_history(current) == []
+
+    def test_applies_token_budget(self) -> None:
+        """Test an overrun budget drops the oldest messages as one chunk."""
+        self.add_turn("a" * 40, "b" * 40)
+        self.add_turn("c" * 40, "d" * 40)
+        current = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="e"
+        )
+
+        # Each 40 character message is estimated at 10 + overhead tokens, and
+        # trimming goes down to 3/4 of the budget
+        budget = 3 * (10 + MESSAGE_TOKEN_OVERHEAD)
+        with override_settings(ASSISTANT_HISTORY_TOKEN_BUDGET=budget):
+            history = self.get_history(current)
+
+        assert [msg["content"][0] for msg in history] == ["c", "d"]
+
+    def test_consecutive_turns_share_prefix(self) -> None:
+        """Test the history start stays fixed between budget overruns."""
+        budget = 6 * (10 + MESSAGE_TOKEN_OVERHEAD)
+        histories: list[list[ConversationMessage]] = []
+        with override_settings(ASSISTANT_HISTORY_TOKEN_BUDGET=budget):
+            for turn in range(5):
+                current = AssistantMessageFactory.create_user_message(
+                    conversation=self.conversation, content=f"{turn}" * 40
+                )
+                histories.append(self.get_history(current))
+                AssistantMessageFactory.create_assistant_message(
+                    conversation=self.conversation, content=f"{turn}" * 40
+                )
+
+        # The fifth turn overruns the budget, the others only append
+        assert [len(history) for history in histories] == [0, 2, 4, 6, 4]
+        for previous, history in zip(histories[:3], histories[1:4], strict=True):
+            assert history[: len(previous)] == previous
+        assert histories[4][0]["content"] == "2" * 40
+
+    def test_only_fetches_new_messages_after_caching(self) -> None:
+        """Test cached messages are reused and newer ones appended."""
+        self.add_turn("Hi", "Hello!")
+        current = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="Question"
+        )
+        self.get_history(current)
+
+        # Changes to already cached rows are not re-read
+        AssistantMessage.objects.filter(content="Hi").update(content="Changed")
+        AssistantMessageFactory.create_assistant_message(
+            conversation=self.conversation, content="Answer"
+        )
+        follow_up = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="Follow up"
+        )
+
+        with self.assertNumQueries(1):
+            history = self.get_history(follow_up)
+
+        assert [msg["content"] for msg in history] == [
+            "Hi",
+            "Hello!",
+            "Question",
+            "Answer",
+        ]
+
+    @override_settings(ASSISTANT_HISTORY_MAX_MESSAGES=2)
+    def test_cold_cache_loads_newest_messages_only(self) -> None:
+        """Test an uncached conversation only loads the newest messages."""
+        self.add_turn("Old", "Older reply")
+        self.add_turn("Recent", "Recent reply")
+        current = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="Now"
+        )
+
+        assert self.get_history(current) == [
+            {"role": "assistant", "content": "Recent reply"},
+        ]
+
+    def test_prepends_summary_and_skips_summarized_messages(self) -> None:
+        """Test summarized messages are replaced by the running summary."""
+        self.add_turn("Old question", "Old answer")
+        last_summarized = self.conversation.messages.order_by("id").last()
+        assert last_summarized is not None
+        self.conversation.summary = "User asked an old question."
+        self.conversation.summary_until_message_id = last_summarized.pk
+        self.conversation.save()
+        self.add_turn("New question", "New answer")
+        current = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="Latest"
+        )
+
+        assert self.get_history(current) == [
+            {
+                "role": "system",
+                "content": (
+                    "Summary of the earlier conversation:\n"
+                    "User asked an old question."
+                ),
+            },
+            {"role": "user", "content": "New question"},
+            {"role": "assistant", "content": "New answer"},
+        ]
+
+
+class CountTokensTest(TestCase):
+    """Test cases for count_tokens."""
+
+    @override_settings(ASSISTANT_HISTORY_TOKENIZER="")
+    def test_estimates_without_tokenizer(self) -> None:
+        """Test the length based estimate is used without an encoding."""
+        assert count_tokens("") == MESSAGE_TOKEN_OVERHEAD
+        assert count_tokens("abcd") == 1 + MESSAGE_TOKEN_OVERHEAD
+        assert count_tokens("abcde") == 2 + MESSAGE_TOKEN_OVERHEAD
@@ -0,0 +1,117 @@
+import asyncio
+
+from django.test import SimpleTestCase, override_settings
+
+import httpx
+from asgiref.sync import async_to_sync
+from langchain_openai import ChatOpenAI
+
+from assistants.services.llm_clients import LLMClientRegistry
+from utils import async_worker
+
+
+class LLMClientRegistryTest(SimpleTestCase):
+    """Test cases for LLMClientRegistry."""
+
+    registry: LLMClientRegistry
+
+    def setUp(self) -> None:
+        self.registry = LLMClientRegistry()
+
+    def tearDown(self) -> None:
+        self.registry.close()
+
+    def test_reuses_client_for_same_key(self) -> None:
+        """Test the same model settings return the cached client."""
+        first = self.registry.get_chat_model("gpt-4o", 0.7)
+        second = self.registry.get_chat_model("gpt-4o", 0.7)
+
+        assert first is second
+
+    def test_clients_share_http_pool(self) -> None:
+        """Test different model settings get separate clients on one pool."""
+        chat = self.registry.get_chat_model("gpt-4o", 0.7)
+        title = self.registry.get_chat_model("gpt-4o-mini", 0.3)
+
+        assert chat is not title
+        assert chat.http_client is title.http_client
+        assert chat.http_client is not None
+
+    def test_async_clients_are_per_event_loop(self) -> None:
+        """Test async callers get clients bound to their own loop."""
+
+        async def get_pair() -> tuple[object, object]:
+            return (
+                self.registry.get_chat_model("gpt-4o", 0.7),
+                self.registry.get_chat_model("gpt-4o", 0.7),
+            )
+
+        first, second = async_to_sync(get_pair)()
+        sync_client = self.registry.get_chat_model("gpt-4o", 0.7)
+        other_loop_client = asyncio.run(get_pair())[0]
+
+        assert first is second
+        assert first is not sync_client
+        assert first is not other_loop_client
+
+    def test_aclose_loop_closes_async_client(self) -> None:
+        """Test the running loop's async client is closed and then rebuilt."""
+
+        async def close_and_reopen() -> tuple[ChatOpenAI, ChatOpenAI]:
+            chat = self.registry.get_chat_model("gpt-4o", 0.7)
+            await self.registry.aclose_loop()
+            return chat, self.registry.get_chat_model("gpt-4o", 0.7)
+
+        chat, reopened = async_to_sync(close_and_reopen)()
+
+        assert isinstance(chat.http_async_client, httpx.AsyncClient)
+        assert chat.http_async_client.is_closed
+        assert reopened is not chat
+
+    def test_close_closes_async_clients_on_their_loop(self) -> None:
+        """Test close() awaits the async clients of loops in other threads."""
+
+        async def get_async_client() -> object:
+            return self.registry.get_chat_model("gpt-4o", 0.7).http_async_client
+
+        client = asyncio.run_coroutine_threadsafe(
+            get_async_client(), async_worker.get_loop()
+        ).result(5)
+
+        self.registry.close()
+
+        assert isinstance(client, httpx.AsyncClient)
+        assert client.is_closed
+
+    def test_close_discards_clients(self) -> None:
+        """Test clients are rebuilt after the registry is closed."""
+        chat = self.registry.get_chat_model("gpt-4o", 0.7)
+        http_client = chat.http_client
+        assert http_client is not None
+
+        self.registry.close()
+
+        assert http_client.is_closed
+        assert self.registry.get_chat_model("gpt-4o", 0.7) is not chat
+
+    @override_settings(OPENAI_MAX_CONCURRENT_REQUESTS=2)
+    def test_alimit_bounds_concurrency(self) -> None:
+        """Test at most OPENAI_MAX_CONCURRENT_REQUESTS run at once."""
+        registry = LLMClientRegistry()
+        active = 0
+        peak = 0
+
+        async def request() -> None:
+            nonlocal active, peak
+            async with registry.alimit():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        async def run_all() -> None:
+            await asyncio.gather(*(request() for _ in range(5)))
+
+        asyncio.run(run_all())
+
+        assert peak == 2
@@ -0,0 +1,126 @@
+from collections.abc import AsyncIterator
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from asgiref.sync import async_to_sync
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+)
+
+from assistants import metrics
+from assistants.services.ai_service import ConversationMessage, OpenAIService
+from assistants.services.prompt import build_prompt, record_prompt_usage
+
+
+@override_settings(ASSISTANT_SYSTEM_PROMPT="Be brief.")
+class BuildPromptTest(SimpleTestCase):
+    """Test cases for build_prompt."""
+
+    history: list[ConversationMessage] = [
+        {"role": "system", "content": "Summary of the earlier conversation:\nHi"},
+        {"role": "user", "content": "What is Django?"},
+        {"role": "assistant", "content": "A web framework."},
+    ]
+
+    def test_layout(self) -> None:
+        """Test the system prompt and history precede the new message."""
+        messages = build_prompt("And Channels?", self.history)
+
+        assert [(type(m), m.content) for m in messages] == [
+            (SystemMessage, "Be brief."),
+            (SystemMessage, "Summary of the earlier conversation:\nHi"),
+            (HumanMessage, "What is Django?"),
+            (AIMessage, "A web framework."),
+            (HumanMessage, "And Channels?"),
+        ]
+
+    def test_next_turn_extends_prefix(self) -> None:
+        """Test the next turn's prompt starts with the previous prompt."""
+        first = build_prompt("And Channels?", self.history)
+        second = build_prompt(
+            "Thanks",
+            [
+                *self.history,
+                {"role": "user", "content": "And Channels?"},
+                {"role": "assistant", "content": "WebSockets for Django."},
+            ],
+        )
+
+        assert second[: len(first)] == first
+
+    @override_settings(ASSISTANT_SYSTEM_PROMPT="")
+    def test_without_system_prompt(self) -> None:
+        """Test an empty system prompt is left out."""
+        messages = build_prompt("Hi", [])
+
+        assert [(type(m), m.content) for m in messages] == [(HumanMessage, "Hi")]
+
+
+class PromptUsageTest(SimpleTestCase):
+    """Test cases for recording prompt cache statistics."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_records_cache_hits(self) -> None:
+        """Test input tokens and prefix cache hits are counted per model."""
+        record_prompt_usage(
+            "gpt-4o",
+            {
+                "input_tokens": 1500,
+                "output_tokens": 20,
+                "total_tokens": 1520,
+                "input_token_details": {"cache_read": 1024},
+            },
+        )
+
+        assert metrics.prompt_tokens.render()[2:] == [
+            'assistant_prompt_tokens_total{model="gpt-4o"} 1500'
+        ]
+        assert metrics.prompt_cached_tokens.render()[2:] == [
+            'assistant_prompt_cached_tokens_total{model="gpt-4o"} 1024'
+        ]
+
+    def test_missing_usage(self) -> None:
+        """Test responses without usage are not counted."""
+        record_prompt_usage("gpt-4o", None)
+
+        assert metrics.prompt_tokens.render()[2:] == []
+
+    def test_stream_records_usage_of_last_chunk(self) -> None:
+        """Test a streamed response counts the usage sent with its last chunk."""
+        service = OpenAIService()
+        llm = MagicMock()
+
+        async def astream(messages: list[BaseMessage]) -> AsyncIterator[AIMessageChunk]:
+            yield AIMessageChunk(content="Hello")
+            yield AIMessageChunk(
+                content="",
+                usage_metadata={
+                    "input_tokens": 100,
+                    "output_tokens": 1,
+                    "total_tokens": 101,
+                },
+            )
+
+        llm.astream = astream
+
+        async def collect() -> list[str]:
+            return [token async for token in service.agenerate_stream("Hi", [])]
+
+        with patch.object(service, "llm", llm):
+            tokens = async_to_sync(collect)()
+
+        assert tokens == ["Hello", ""]
+        assert metrics.prompt_tokens.render()[2:] == [
+            'assistant_prompt_tokens_total{model="gpt-4o"} 100'
+        ]
+        assert metrics.prompt_cached_tokens.render()[2:] == [
+            'assistant_prompt_cached_tokens_total{model="gpt-4o"} 0'
+        ]
@@ -0,0 +1,166 @@
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from asgiref.sync import async_to_sync
+
+from assistants.services.ai_service import (
+    ConversationMessage,
+    LLMBackend,
+    OpenAIService,
+)
+from assistants.services.fake_backend import FakeLLMBackend
+from assistants.services.response_cache import (
+    ResponseCache,
+    astream_response,
+    make_cache_key,
+    response_cache,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ResponseCacheTest(SimpleTestCase):
+    """Test cases for ResponseCache."""
+
+    clock: FakeClock
+    cache: ResponseCache
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_entries=2, ttl=60, clock=self.clock)
+
+    def test_key_normalizes_prompt(self) -> None:
+        """Test whitespace and case differences map to the same key."""
+        history: list[ConversationMessage] = [{"role": "user", "content": "Hi"}]
+
+        assert make_cache_key("gpt-4o", 0.7, history, "What  is Django?") == (
+            make_cache_key("gpt-4o", 0.7, history, " what is django? ")
+        )
+        assert make_cache_key("gpt-4o", 0.7, history, "What is Django?") != (
+            make_cache_key("gpt-4o", 0.7, [], "What is Django?")
+        )
+        assert make_cache_key("gpt-4o", 0.7, [], "What is Django?") != (
+            make_cache_key("gpt-4o", 0.3, [], "What is Django?")
+        )
+
+    def test_expires_after_ttl(self) -> None:
+        """Test entries are dropped once their TTL elapsed."""
+        self.cache.set("a", "gpt-4o:0.7", ["Hello"])
+        assert self.cache.get("a") == ["Hello"]
+
+        self.clock.now = 60
+        assert self.cache.get("a") is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the least recently used entry is evicted when full."""
+        self.cache.set("a", "gpt-4o:0.7", ["A"])
+        self.cache.set("b", "gpt-4o:0.7", ["B"])
+        self.cache.get("a")
+        self.cache.set("c", "gpt-4o:0.7", ["C"])
+
+        assert self.cache.get("a") == ["A"]
+        assert self.cache.get("b") is None
+        assert self.cache.get("c") == ["C"]
+
+    def test_find_similar(self) -> None:
+        """Test similar prompts of the same scope match above the threshold."""
+        self.cache.set("a", "gpt-4o:0.7", ["A"], embedding=[1.0, 0.0])
+        self.cache.set("b", "gpt-4o-mini:0.7", ["B"], embedding=[0.0, 1.0])
+
+        assert self.cache.find_similar("gpt-4o:0.7", [0.99, 0.05], 0.95) == ["A"]
+        assert self.cache.find_similar("gpt-4o:0.7", [0.5, 0.5], 0.95) is None
+        assert self.cache.find_similar("gpt-4o:0.7", [0.0, 1.0], 0.95) is None
+
+
+async def fake_stream(
+    message: str, history: list[ConversationMessage]
+) -> AsyncIterator[str]:
+    for token in ["Django ", "is ", "a framework."]:
+        yield token
+
+
+@override_settings(ASSISTANT_RESPONSE_CACHE_ENABLED=True)
+class StreamResponseTest(SimpleTestCase):
+    """Test cases for astream_response."""
+
+    ai_service: LLMBackend
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        self.ai_service = OpenAIService()
+
+    def tearDown(self) -> None:
+        response_cache.clear()
+
+    def stream(self, message: str, allow_similar: bool = False) -> list[str]:
+        async def collect() -> list[str]:
+            return [
+                token
+                async for token in astream_response(
+                    self.ai_service, message, [], allow_similar=allow_similar
+                )
+            ]
+
+        return async_to_sync(collect)()
+
+    def test_replays_exact_repeat(self) -> None:
+        """Test a repeated prompt is answered from the cache."""
+        with patch.object(
+            OpenAIService, "agenerate_stream", side_effect=fake_stream
+        ) as mock_stream:
+            first = self.stream("What is Django?")
+            second = self.stream("what is  django?")
+
+        assert first == second == ["Django ", "is ", "a framework."]
+        mock_stream.assert_called_once()
+
+    @override_settings(ASSISTANT_RESPONSE_CACHE_ENABLED=False)
+    def test_disabled(self) -> None:
+        """Test every prompt is generated when the cache is disabled."""
+        with patch.object(
+            OpenAIService, "agenerate_stream", side_effect=fake_stream
+        ) as mock_stream:
+            self.stream("What is Django?")
+            self.stream("What is Django?")
+
+        assert mock_stream.call_count == 2
+
+    @override_settings(ASSISTANT_SEMANTIC_CACHE_ENABLED=True)
+    @patch("langchain_openai.OpenAIEmbeddings.aembed_query", new_callable=AsyncMock)
+    def test_replays_similar_prompt(self, mock_embed: AsyncMock) -> None:
+        """Test near-duplicate prompts share a response when allowed."""
+        mock_embed.side_effect = [[1.0, 0.0], [0.99, 0.01], [0.98, 0.02]]
+
+        with patch.object(
+            OpenAIService, "agenerate_stream", side_effect=fake_stream
+        ) as mock_stream:
+            self.stream("What is Django?", allow_similar=True)
+            similar = self.stream("Can you tell me what Django is?", allow_similar=True)
+            self.stream("Could you explain Django?")
+
+        assert similar == ["Django ", "is ", "a framework."]
+        assert mock_stream.call_count == 2
+        assert mock_embed.call_count == 2
+
+    @override_settings(ASSISTANT_SEMANTIC_CACHE_ENABLED=True)
+    @patch("langchain_openai.OpenAIEmbeddings.aembed_query", new_callable=AsyncMock)
+    def test_fake_backend_skips_similarity(self, mock_embed: AsyncMock) -> None:
+        """Test the fake backend never embeds prompts with the provider."""
+        self.ai_service = FakeLLMBackend()
+
+        with patch.object(
+            FakeLLMBackend, "agenerate_stream", side_effect=fake_stream
+        ) as mock_stream:
+            self.stream("What is Django?", allow_similar=True)
+            self.stream("Can you tell me what Django is?", allow_similar=True)
+
+        assert mock_stream.call_count == 2
+        mock_embed.assert_not_called()
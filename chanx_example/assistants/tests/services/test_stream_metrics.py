@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from asgiref.sync import async_to_sync
+
+from assistants import metrics
+from assistants.services.stream_metrics import StreamMetrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StreamMetricsTest(SimpleTestCase):
+    """Test cases for StreamMetrics."""
+
+    clock: FakeClock
+    stream_metrics: StreamMetrics
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.clock = FakeClock()
+        self.stream_metrics = StreamMetrics(clock=self.clock)
+
+    def _stream(self, token_times: list[float]) -> None:
+        self.stream_metrics.history_loaded(0.0)
+        self.stream_metrics.start_generation("gpt-4o")
+        for now in token_times:
+            self.clock.now = now
+            self.stream_metrics.token_received()
+
+    def test_time_to_first_token_and_rate(self) -> None:
+        """Test latency and rate are measured from generation start and first token."""
+        self.clock.now = 0.5
+        self._stream([1.5, 1.75, 2.0, 2.5])
+
+        assert self.stream_metrics.history_load == 0.5
+        assert self.stream_metrics.time_to_first_token == 1.0
+        assert self.stream_metrics.token_gaps == [0.25, 0.25, 0.5]
+        assert self.stream_metrics.tokens_per_second == 3.0
+
+    def test_no_tokens(self) -> None:
+        """Test an empty response has no first token or rate."""
+        self._stream([])
+
+        assert self.stream_metrics.time_to_first_token is None
+        assert self.stream_metrics.tokens_per_second is None
+
+    def test_record_observes_metrics(self) -> None:
+        """Test recording adds the response to the assistant metrics."""
+        self._stream([1.0, 1.1])
+        self.stream_metrics.frame_sent(1.0)
+
+        async_to_sync(self.stream_metrics.arecord)(1, persisted_length=42)
+
+        assert 'assistant_streamed_tokens_total{model="gpt-4o"} 2' in (
+            metrics.streamed_tokens.render()
+        )
+        assert 'assistant_response_length_chars_count{model="gpt-4o"} 1' in (
+            metrics.response_length_chars.render()
+        )
+        assert "assistant_channel_send_seconds_count 1" in (
+            metrics.channel_send_seconds.render()
+        )
@@ -0,0 +1,123 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from asgiref.sync import async_to_sync
+
+from assistants.services.stream_replay import (
+    StreamReplay,
+    aget_replay,
+    arecord_complete,
+    arecord_frame,
+)
+
+
+class StreamReplayTest(SimpleTestCase):
+    """Test cases for the assistant stream replay buffer."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def record(self, *frames: str, conversation_id: str = "conv") -> None:
+        for seq, content in enumerate(frames, start=1):
+            async_to_sync(arecord_frame)(conversation_id, 1, seq, content)
+
+    def replay(
+        self, after_seq: int, conversation_id: str = "conv"
+    ) -> StreamReplay | None:
+        return async_to_sync(aget_replay)(conversation_id, 1, after_seq)
+
+    def test_replays_frames_after_seq(self) -> None:
+        """Test only frames newer than the client's last seq are returned."""
+        self.record("Hello", " there", "!")
+
+        assert self.replay(1) == {
+            "frames": [(2, " there"), (3, "!")],
+            "complete_seq": None,
+        }
+        assert self.replay(3) == {"frames": [], "complete_seq": None}
+
+    def test_replays_completion(self) -> None:
+        """Test a finished stream reports the seq of its completion frame."""
+        self.record("Hello")
+        async_to_sync(arecord_complete)("conv", 1, 1)
+
+        assert self.replay(0) == {"frames": [(1, "Hello")], "complete_seq": 2}
+
+    def test_unknown_stream(self) -> None:
+        """Test nothing is replayed for a stream that was never recorded."""
+        assert self.replay(0) is None
+
+    def test_other_conversation(self) -> None:
+        """Test streams are not replayed into a different conversation."""
+        self.record("secret")
+
+        assert self.replay(0, conversation_id="other") is None
+
+    @override_settings(ASSISTANT_STREAM_REPLAY_MAX_FRAMES=2)
+    def test_bounded_buffer(self) -> None:
+        """Test frames older than the buffer size are dropped."""
+        self.record("a", "b", "c", "d")
+
+        assert self.replay(2) == {
+            "frames": [(3, "c"), (4, "d")],
+            "complete_seq": None,
+        }
+        assert self.replay(1) is None
+        assert cache.get("assistant_stream:1:2") is None
+
+
+@override_settings(
+    ASSISTANT_STREAM_REPLAY_MAX_FRAMES=2, ASSISTANT_STREAM_REPLAY_TIMEOUT=60
+)
+class RedisStreamReplayTest(SimpleTestCase):
+    """Test cases for the replay buffer on the Redis cache."""
+
+    def setUp(self) -> None:
+        self.redis_client = MagicMock()
+        self.pipe = self.redis_client.pipeline.return_value.__enter__.return_value
+        patcher = patch(
+            "assistants.services.stream_replay.get_redis_client",
+            return_value=self.redis_client,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stored(self, last_seq: int, *frames: tuple[int, str]) -> None:
+        state = {"conversation_id": "conv", "last_seq": last_seq, "complete_seq": None}
+        self.pipe.execute.return_value = [
+            json.dumps(state),
+            [json.dumps(frame) for frame in frames],
+        ]
+
+    def test_frame_is_written_in_one_pipeline(self) -> None:
+        """Test a frame is pushed onto a capped list whose expiry is refreshed."""
+        async_to_sync(arecord_frame)("conv", 1, 3, "Hi")
+
+        frames_key = cache.make_and_validate_key("assistant_stream:1:frames")
+        self.redis_client.pipeline.assert_called_once_with(transaction=False)
+        self.pipe.rpush.assert_called_once_with(frames_key, json.dumps([3, "Hi"]))
+        self.pipe.ltrim.assert_called_once_with(frames_key, -2, -1)
+        self.pipe.expire.assert_called_once_with(frames_key, 60)
+        self.pipe.set.assert_called_once()
+        self.pipe.execute.assert_called_once_with()
+
+    def test_replays_frames_after_seq(self) -> None:
+        """Test frames newer than the client's last seq are read from the list."""
+        self.stored(4, (3, "c"), (4, "d"))
+
+        replay = async_to_sync(aget_replay)("conv", 1, 2)
+
+        assert replay == {"frames": [(3, "c"), (4, "d")], "complete_seq": None}
+
+    def test_trimmed_frames(self) -> None:
+        """Test nothing is replayed once needed frames were trimmed."""
+        self.stored(4, (3, "c"), (4, "d"))
+
+        assert async_to_sync(aget_replay)("conv", 1, 1) is None
+        assert async_to_sync(aget_replay)("conv", 1, 4) == {
+            "frames": [],
+            "complete_seq": None,
+        }
@@ -0,0 +1,113 @@
+from django.test import SimpleTestCase, override_settings
+
+from assistants.services.token_batcher import TokenBatcher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TokenBatcherTest(SimpleTestCase):
+    """Test cases for TokenBatcher."""
+
+    clock: FakeClock
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+
+    def make_batcher(
+        self, max_frame_bytes: int = 16, enabled: bool = True
+    ) -> TokenBatcher:
+        return TokenBatcher(
+            flush_interval=0.04,
+            max_frame_bytes=max_frame_bytes,
+            enabled=enabled,
+            clock=self.clock,
+        )
+
+    def test_buffers_tokens_within_interval(self) -> None:
+        """Test tokens arriving inside the interval are held back."""
+        batcher = self.make_batcher()
+
+        assert batcher.add("Hello") == []
+        assert batcher.add(" world") == []
+        assert batcher.flush() == [(1, "Hello world")]
+        assert batcher.flush() == []
+
+    def test_flushes_when_interval_elapses(self) -> None:
+        """Test a frame is emitted once the flush interval has passed."""
+        batcher = self.make_batcher()
+
+        assert batcher.add("Hello") == []
+        self.clock.now = 0.05
+        assert batcher.add(" world") == [(1, "Hello world")]
+
+        assert batcher.add("!") == []
+        self.clock.now = 0.1
+        assert batcher.add("?") == [(2, "!?")]
+
+    def test_flush_due_emits_after_interval(self) -> None:
+        """Test a stalled buffer is emitted once the interval has passed."""
+        batcher = self.make_batcher()
+
+        assert batcher.flush_due() == []
+        assert batcher.add("Hello") == []
+        assert batcher.flush_due() == []
+        self.clock.now = 0.05
+        assert batcher.flush_due() == [(1, "Hello")]
+        assert batcher.flush_due() == []
+
+    def test_flushes_before_exceeding_max_frame_bytes(self) -> None:
+        """Test the buffer is emitted before a token would overflow the frame."""
+        batcher = self.make_batcher(max_frame_bytes=10)
+
+        assert batcher.add("12345") == []
+        assert batcher.add("678901") == [(1, "12345")]
+        assert batcher.flush() == [(2, "678901")]
+
+    def test_oversized_token_is_emitted_whole(self) -> None:
+        """Test a token larger than the frame limit is not split."""
+        batcher = self.make_batcher(max_frame_bytes=4)
+
+        assert batcher.add("ab") == []
+        assert batcher.add("abcdefgh") == [(1, "ab"), (2, "abcdefgh")]
+        assert batcher.flush() == []
+
+    def test_counts_utf8_bytes(self) -> None:
+        """Test frame size is measured in encoded bytes, not characters."""
+        batcher = self.make_batcher(max_frame_bytes=4)
+
+        assert batcher.add("é") == []
+        assert batcher.add("é") == [(1, "éé")]
+
+    def test_disabled_emits_one_frame_per_token(self) -> None:
+        """Test per-token fallback when batching is disabled."""
+        batcher = self.make_batcher(enabled=False)
+
+        assert batcher.add("Hello") == [(1, "Hello")]
+        assert batcher.add(" world") == [(2, " world")]
+        assert batcher.flush() == []
+
+    def test_ignores_empty_tokens(self) -> None:
+        """Test empty tokens never produce frames."""
+        batcher = self.make_batcher(enabled=False)
+
+        assert batcher.add("") == []
+        assert batcher.seq == 0
+
+    @override_settings(
+        ASSISTANT_STREAM_BATCHING=True,
+        ASSISTANT_STREAM_FLUSH_INTERVAL_MS=25,
+        ASSISTANT_STREAM_MAX_FRAME_BYTES=512,
+    )
+    def test_from_settings(self) -> None:
+        """Test the batcher picks up the streaming settings."""
+        batcher = TokenBatcher.from_settings()
+
+        assert batcher.enabled is True
+        assert batcher.flush_interval == 0.025
+        assert batcher.max_frame_bytes == 512
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.factories.user import UserFactory
+from assistants import metrics
+from assistants.factories import AssistantConversationFactory, AssistantMessageFactory
+from assistants.models import AssistantConversation, AssistantMessage
+from assistants.tasks import task_expire_anonymous_conversations
+
+
+@override_settings(
+    ASSISTANT_ANONYMOUS_CONVERSATION_TTL_HOURS=24,
+    ASSISTANT_ANONYMOUS_EXPIRY_BATCH_SIZE=2,
+    ASSISTANT_ANONYMOUS_EXPIRY_MAX_BATCHES=10,
+    ASSISTANT_ANONYMOUS_EXPIRY_DRY_RUN=False,
+)
+class ExpireAnonymousConversationsTest(TestCase):
+    """Test cases for the anonymous conversation expiry job."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.idle = [self._conversation(idle=True) for _ in range(3)]
+        self.active = self._conversation(idle=False)
+        self.owned = self._conversation(idle=True, user=UserFactory.create())
+
+    def _conversation(self, idle: bool, **kwargs: object) -> AssistantConversation:
+        if "user" in kwargs:
+            conversation = AssistantConversationFactory.create(**kwargs)
+        else:
+            conversation = AssistantConversationFactory.create_anonymous()
+        AssistantMessageFactory.create_user_message(conversation=conversation)
+        if idle:
+            AssistantConversation.objects.filter(pk=conversation.pk).update(
+                updated_at=timezone.now() - timedelta(days=2)
+            )
+        return conversation
+
+    def test_deletes_idle_anonymous_conversations(self) -> None:
+        """Test only idle anonymous conversations and their messages are deleted."""
+        assert task_expire_anonymous_conversations() == 3
+
+        remaining = set(AssistantConversation.objects.values_list("pk", flat=True))
+        assert remaining == {self.active.pk, self.owned.pk}
+        assert AssistantMessage.objects.count() == 2
+        assert "assistant_expired_conversations_total 3" in (
+            metrics.expired_conversations.render()
+        )
+        assert "assistant_expired_messages_total 3" in (
+            metrics.expired_messages.render()
+        )
+
+    @override_settings(ASSISTANT_ANONYMOUS_EXPIRY_MAX_BATCHES=1)
+    def test_bounded_batches(self) -> None:
+        """Test a run deletes at most batch size times max batches, oldest first."""
+        AssistantConversation.objects.filter(pk=self.idle[2].pk).update(
+            updated_at=timezone.now() - timedelta(days=1, hours=1)
+        )
+
+        assert task_expire_anonymous_conversations() == 2
+        assert AssistantConversation.objects.filter(pk=self.idle[2].pk).exists()
+
+        assert task_expire_anonymous_conversations() == 1
+        assert not AssistantConversation.objects.filter(pk=self.idle[2].pk).exists()
+
+    def test_dry_run(self) -> None:
+        """Test a dry run counts the idle conversations without deleting them."""
+        assert task_expire_anonymous_conversations(dry_run=True) == 3
+
+        assert AssistantConversation.objects.count() == 5
+        assert metrics.expired_conversations.render()[2:] == []
@@ -0,0 +1,155 @@
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from asgiref.sync import async_to_sync
+
+from assistants.consumers import ConversationAssistantConsumer
+from assistants.factories import AssistantConversationFactory, AssistantMessageFactory
+from assistants.messages.assistant import CompleteStreamingEvent, StreamingEvent
+from assistants.models import AssistantMessage
+from assistants.services.ai_service import ConversationMessage, OpenAIService
+from assistants.services.cancellation import ais_stop_requested, arequest_stop
+from assistants.tasks import task_handle_new_assistant_message
+
+
+async def fake_stream(
+    message: str, history: list[ConversationMessage]
+) -> AsyncIterator[str]:
+    for token in ["Hello", " there", ", how", " can", " I", " help?"]:
+        yield token
+
+
+@patch.object(OpenAIService, "agenerate_stream", side_effect=fake_stream)
+@patch.object(
+    ConversationAssistantConsumer, "asend_channel_event", new_callable=AsyncMock
+)
+class StopGenerationTest(TestCase):
+    """Test cases for stopping an in-flight generation."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.conversation = AssistantConversationFactory.create()
+        self.user_message = AssistantMessageFactory.create_user_message(
+            conversation=self.conversation, content="Hi"
+        )
+        self.conversation_id = str(self.conversation.pk)
+
+    def get_reply(self) -> AssistantMessage:
+        return AssistantMessage.objects.get(
+            conversation=self.conversation,
+            message_type=AssistantMessage.MessageType.ASSISTANT,
+        )
+
+    def test_stop_before_generation(
+        self, mock_send: AsyncMock, mock_stream: AsyncMock
+    ) -> None:
+        """Test a response stopped before it started is never generated."""
+        async_to_sync(arequest_stop)(self.conversation_id, self.user_message.pk)
+
+        task_handle_new_assistant_message(self.user_message.pk)
+
+        mock_stream.assert_not_called()
+        assert not AssistantMessage.objects.filter(
+            conversation=self.conversation,
+            message_type=AssistantMessage.MessageType.ASSISTANT,
+        ).exists()
+        events = [call.args[1] for call in mock_send.call_args_list]
+        assert isinstance(events[-1], CompleteStreamingEvent)
+        assert not async_to_sync(ais_stop_requested)(
+            self.conversation_id, self.user_message.pk
+        )
+
+    @override_settings(ASSISTANT_STOP_CHECK_INTERVAL_MS=0)
+    def test_stop_keeps_partial_response(
+        self, mock_send: AsyncMock, mock_stream: AsyncMock
+    ) -> None:
+        """Test a stopped generation persists what was streamed and completes."""
+
+        async def stopped_stream(
+            message: str, history: list[ConversationMessage]
+        ) -> AsyncIterator[str]:
+            yield "Hello"
+            await arequest_stop(self.conversation_id, self.user_message.pk)
+            yield " there"
+            yield ", how"
+
+        mock_stream.side_effect = stopped_stream
+
+        task_handle_new_assistant_message(self.user_message.pk)
+
+        assert self.get_reply().content == "Hello there"
+        events = [call.args[1] for call in mock_send.call_args_list]
+        assert [type(event) for event in events[-2:]] == [
+            StreamingEvent,
+            CompleteStreamingEvent,
+        ]
+        assert not async_to_sync(ais_stop_requested)(
+            self.conversation_id, self.user_message.pk
+        )
+
+    @override_settings(ASSISTANT_STOP_CHECK_INTERVAL_MS=10)
+    def test_stop_while_upstream_stalls(
+        self, mock_send: AsyncMock, mock_stream: AsyncMock
+    ) -> None:
+        """Test a stop is noticed while no token arrives."""
+
+        async def stalled_stream(
+            message: str, history: list[ConversationMessage]
+        ) -> AsyncIterator[str]:
+            yield "Hello"
+            await arequest_stop(self.conversation_id, self.user_message.pk)
+            await asyncio.sleep(60)
+            yield " there"
+
+        mock_stream.side_effect = stalled_stream
+
+        task_handle_new_assistant_message(self.user_message.pk)
+
+        assert self.get_reply().content == "Hello"
+
+    @override_settings(
+        ASSISTANT_STREAM_FLUSH_INTERVAL_MS=10, ASSISTANT_STOP_CHECK_INTERVAL_MS=0
+    )
+    def test_flushes_buffered_tokens_while_upstream_stalls(
+        self, mock_send: AsyncMock, mock_stream: AsyncMock
+    ) -> None:
+        """Test buffered tokens are sent without waiting for the next token."""
+
+        def sent_contents() -> list[str]:
+            return [
+                call.args[1].payload.content
+                for call in mock_send.call_args_list
+                if isinstance(call.args[1], StreamingEvent)
+            ]
+
+        async def frame_sent() -> None:
+            while not sent_contents():
+                await asyncio.sleep(0.01)
+
+        async def stalled_stream(
+            message: str, history: list[ConversationMessage]
+        ) -> AsyncIterator[str]:
+            yield "Hello"
+            await asyncio.wait_for(frame_sent(), timeout=5)
+            yield " there"
+
+        mock_stream.side_effect = stalled_stream
+
+        task_handle_new_assistant_message(self.user_message.pk)
+
+        assert sent_contents() == ["Hello", " there"]
+
+    def test_stop_of_other_conversation_is_ignored(
+        self, mock_send: AsyncMock, mock_stream: AsyncMock
+    ) -> None:
+        """Test stop requests only apply within their own conversation."""
+        other = AssistantConversationFactory.create()
+        async_to_sync(arequest_stop)(str(other.pk), self.user_message.pk)
+
+        task_handle_new_assistant_message(self.user_message.pk)
+
+        assert self.get_reply().content == "Hello there, how can I help?"
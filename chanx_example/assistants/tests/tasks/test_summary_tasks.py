@@ -0,0 +1,135 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from asgiref.sync import async_to_sync
+
+from assistants.factories import AssistantConversationFactory, AssistantMessageFactory
+from assistants.models import AssistantConversation, AssistantMessage
+from assistants.tasks.ai_service_tasks import (
+    get_summary_lock_key,
+    task_summarize_conversation,
+)
+from assistants.tasks.assistant_tasks import schedule_summary_if_needed
+from test_utils.openai_test_utils import OpenAIChatCompletionMockFactory
+
+
+class SummarizeConversationTaskTest(TestCase):
+    """Test cases for task_summarize_conversation."""
+
+    conversation: AssistantConversation
+    messages: list[AssistantMessage]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.conversation = AssistantConversationFactory.create()
+        self.messages = [
+            AssistantMessageFactory.create(
+                conversation=self.conversation,
+                content=f"Message {index}",
+                message_type=(
+                    AssistantMessage.MessageType.USER
+                    if index % 2 == 0
+                    else AssistantMessage.MessageType.ASSISTANT
+                ),
+            )
+            for index in range(6)
+        ]
+
+    @override_settings(ASSISTANT_SUMMARY_RECENT_MESSAGES=2)
+    @patch("openai.resources.chat.completions.Completions.create")
+    def test_folds_older_messages_into_summary(self, mock_create: Mock) -> None:
+        """Test messages before the recent window are summarized."""
+        mock_create.return_value = OpenAIChatCompletionMockFactory.build(
+            content="User and assistant exchanged four messages.", streaming=True
+        )
+        lock_key = get_summary_lock_key(str(self.conversation.pk))
+        cache.set(lock_key, True)
+
+        task_summarize_conversation(str(self.conversation.pk))
+
+        self.conversation.refresh_from_db()
+        assert self.conversation.summary == (
+            "User and assistant exchanged four messages."
+        )
+        assert self.conversation.summary_until_message_id == self.messages[3].pk
+        assert cache.get(lock_key) is None
+
+        prompt: str = mock_create.call_args.kwargs["messages"][-1]["content"]
+        assert "(none yet)" in prompt
+        assert "User: Message 0\nAssistant: Message 1" in prompt
+        assert "Message 3" in prompt
+        assert "Message 4" not in prompt
+
+    @override_settings(ASSISTANT_SUMMARY_RECENT_MESSAGES=2)
+    @patch("openai.resources.chat.completions.Completions.create")
+    def test_extends_existing_summary(self, mock_create: Mock) -> None:
+        """Test only messages after the previous summary are folded in."""
+        mock_create.return_value = OpenAIChatCompletionMockFactory.build(
+            content="Updated summary", streaming=True
+        )
+        self.conversation.summary = "Earlier summary"
+        self.conversation.summary_until_message_id = self.messages[1].pk
+        self.conversation.save()
+
+        task_summarize_conversation(str(self.conversation.pk))
+
+        self.conversation.refresh_from_db()
+        assert self.conversation.summary == "Updated summary"
+        assert self.conversation.summary_until_message_id == self.messages[3].pk
+
+        prompt: str = mock_create.call_args.kwargs["messages"][-1]["content"]
+        assert "Earlier summary" in prompt
+        assert "Message 1" not in prompt
+        assert "User: Message 2\nAssistant: Message 3" in prompt
+
+    @override_settings(ASSISTANT_SUMMARY_RECENT_MESSAGES=10)
+    @patch("openai.resources.chat.completions.Completions.create")
+    def test_skips_when_everything_is_recent(self, mock_create: Mock) -> None:
+        """Test no LLM call is made when no message is old enough."""
+        task_summarize_conversation(str(self.conversation.pk))
+
+        mock_create.assert_not_called()
+        self.conversation.refresh_from_db()
+        assert self.conversation.summary == ""
+        assert self.conversation.summary_until_message_id is None
+
+
+@override_settings(
+    ASSISTANT_SUMMARY_RECENT_MESSAGES=2, ASSISTANT_SUMMARY_TRIGGER_MESSAGES=2
+)
+class ScheduleSummaryTest(TestCase):
+    """Test cases for scheduling background summaries."""
+
+    conversation: AssistantConversation
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.conversation = AssistantConversationFactory.create()
+
+    def add_messages(self, count: int) -> None:
+        for _ in range(count):
+            AssistantMessageFactory.create(conversation=self.conversation)
+
+    def schedule(self) -> None:
+        async_to_sync(schedule_summary_if_needed)(self.conversation)
+
+    @patch("assistants.tasks.assistant_tasks.task_summarize_conversation")
+    def test_waits_for_threshold(self, mock_task: Mock) -> None:
+        """Test no summary is scheduled below the threshold."""
+        self.add_messages(3)
+
+        self.schedule()
+
+        mock_task.delay.assert_not_called()
+
+    @patch("assistants.tasks.assistant_tasks.task_summarize_conversation")
+    def test_schedules_once_past_threshold(self, mock_task: Mock) -> None:
+        """Test a summary is scheduled once, guarded by the lock."""
+        self.add_messages(4)
+
+        self.schedule()
+        self.schedule()
+
+        mock_task.delay.assert_called_once_with(str(self.conversation.pk))
@@ -0,0 +1,147 @@
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from asgiref.sync import async_to_sync
+
+from assistants.consumers import ConversationAssistantConsumer
+from assistants.factories import AssistantConversationFactory, AssistantMessageFactory
+from assistants.messages.assistant import (
+    CompleteStreamingEvent,
+    ConversationTitleEvent,
+    ConversationTitlePayload,
+)
+from assistants.models import AssistantConversation
+from assistants.services.ai_service import ConversationMessage, OpenAIService
+from assistants.tasks import (
+    aupdate_conversation_title,
+    task_handle_new_assistant_message,
+)
+
+
+@patch.object(
+    ConversationAssistantConsumer, "asend_channel_event", new_callable=AsyncMock
+)
+class UpdateConversationTitleTest(TestCase):
+    """Test cases for aupdate_conversation_title."""
+
+    conversation: AssistantConversation
+
+    def setUp(self) -> None:
+        self.conversation = AssistantConversationFactory.create(title="")
+
+    @patch.object(OpenAIService, "agenerate", new_callable=AsyncMock)
+    def test_generates_and_broadcasts_title(
+        self, mock_generate: AsyncMock, mock_send: AsyncMock
+    ) -> None:
+        """Test the title is saved and pushed to the conversation group."""
+        mock_generate.return_value = " Japan trip\n"
+
+        async_to_sync(aupdate_conversation_title)(
+            self.conversation, "Plan a trip to Japan"
+        )
+
+        self.conversation.refresh_from_db()
+        assert self.conversation.title == "Japan trip"
+        mock_send.assert_called_once_with(
+            f"user_{self.conversation.user_id}_conversation_{self.conversation.pk}",
+            ConversationTitleEvent(
+                payload=ConversationTitlePayload(
+                    conversation_id=str(self.conversation.pk), title="Japan trip"
+                )
+            ),
+        )
+
+    @patch.object(OpenAIService, "agenerate", new_callable=AsyncMock)
+    def test_falls_back_to_truncation(
+        self, mock_generate: AsyncMock, mock_send: AsyncMock
+    ) -> None:
+        """Test a failed generation titles the conversation with the message."""
+        mock_generate.side_effect = Exception("API Error")
+
+        async_to_sync(aupdate_conversation_title)(self.conversation, "A" * 60)
+
+        self.conversation.refresh_from_db()
+        assert self.conversation.title == "A" * 50 + "..."
+        mock_send.assert_called_once()
+
+    @patch.object(OpenAIService, "agenerate", new_callable=AsyncMock)
+    def test_keeps_title_set_meanwhile(
+        self, mock_generate: AsyncMock, mock_send: AsyncMock
+    ) -> None:
+        """Test a title set while generating is not overwritten."""
+        mock_generate.return_value = "Generated"
+        AssistantConversation.objects.filter(pk=self.conversation.pk).update(
+            title="Renamed"
+        )
+
+        async_to_sync(aupdate_conversation_title)(self.conversation, "Hi")
+
+        self.conversation.refresh_from_db()
+        assert self.conversation.title == "Renamed"
+        mock_send.assert_not_called()
+
+
+@patch.object(
+    ConversationAssistantConsumer, "asend_channel_event", new_callable=AsyncMock
+)
+class FirstReplyTitleTest(TestCase):
+    """Test cases for titling a conversation alongside its first reply."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_title_generated_while_streaming(self, mock_send: AsyncMock) -> None:
+        """Test the title request is issued while the reply is still streaming."""
+        conversation = AssistantConversationFactory.create(title="")
+        message = AssistantMessageFactory.create_user_message(
+            conversation=conversation, content="Plan a trip to Japan"
+        )
+        title_started = asyncio.Event()
+
+        async def stream(
+            message: str, history: list[ConversationMessage]
+        ) -> AsyncIterator[str]:
+            yield "Sure"
+            # Only finishes once the title request is in flight
+            await asyncio.wait_for(title_started.wait(), timeout=5)
+            yield ", let's plan it."
+
+        async def generate(message: str, history: list[ConversationMessage]) -> str:
+            title_started.set()
+            return "Japan trip"
+
+        with (
+            patch.object(OpenAIService, "agenerate_stream", side_effect=stream),
+            patch.object(OpenAIService, "agenerate", side_effect=generate),
+        ):
+            task_handle_new_assistant_message(message.pk, is_first_message=True)
+
+        conversation.refresh_from_db()
+        assert conversation.title == "Japan trip"
+        event_types: set[type] = {
+            type(call.args[1]) for call in mock_send.call_args_list
+        }
+        assert {ConversationTitleEvent, CompleteStreamingEvent} <= event_types
+
+    @patch.object(OpenAIService, "agenerate", new_callable=AsyncMock)
+    def test_later_messages_skip_title(
+        self, mock_generate: AsyncMock, mock_send: AsyncMock
+    ) -> None:
+        """Test only a conversation's first message triggers a title."""
+        conversation = AssistantConversationFactory.create(title="")
+        AssistantMessageFactory.create_user_message(conversation=conversation)
+        message = AssistantMessageFactory.create_user_message(conversation=conversation)
+
+        async def stream(
+            message: str, history: list[ConversationMessage]
+        ) -> AsyncIterator[str]:
+            yield "Hi"
+
+        with patch.object(OpenAIService, "agenerate_stream", side_effect=stream):
+            task_handle_new_assistant_message(message.pk, is_first_message=False)
+
+        mock_generate.assert_not_called()
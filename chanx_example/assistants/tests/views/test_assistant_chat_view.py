@@ -1,4 +1,5 @@
 from typing import cast
+from unittest.mock import patch
 from uuid import uuid4
 
 from django.http import HttpResponseRedirect
@@ -185,6 +186,28 @@ class AssistantChatViewTestCase(AuthAPITestCase):
         # Most recently updated should be first
         assert context_conversations[0].title == "Conv 2"
 
+    def test_sidebar_uses_denormalized_fields(self) -> None:
+        """Test the sidebar is limited and renders without per-row queries."""
+        for i in range(3):
+            conversation = AssistantConversationFactory.create(
+                user=self.user, title=f"Conv {i}"
+            )
+            AssistantMessageFactory.create_user_message(
+                conversation=conversation, content=f"Preview {i}"
+            )
+
+        with patch("assistants.views.chat_view.SIDEBAR_CONVERSATION_LIMIT", 2):
+            response = self.auth_client.get(self.home_url)
+
+        conversations: list[AssistantConversation] = response.context["conversations"]
+        assert [conv.title for conv in conversations] == ["Conv 2", "Conv 1"]
+        assert conversations[0].message_count == 1
+        assert "Preview 2" in response.content.decode()
+
+        with self.assertNumQueries(0):
+            for conversation in conversations:
+                assert conversation.last_message_preview
+
 
 class AssistantChatViewUnauthenticatedTestCase(TestCase):
     """Test cases for unauthenticated users - using regular TestCase."""
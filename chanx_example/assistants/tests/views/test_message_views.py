@@ -1,8 +1,10 @@
+from datetime import timedelta
 from typing import Any
 from unittest.mock import Mock, patch
 
 from django.contrib.auth.models import AnonymousUser
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIRequestFactory
 
@@ -45,8 +47,41 @@ class AssistantMessageViewSetTestCase(AuthAPITestCase):
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert len(data["results"]) == 2
-        assert data["results"][0]["content"] == "First message"
-        assert data["results"][1]["content"] == "AI response"
+        # Newest first
+        assert data["results"][0]["content"] == "AI response"
+        assert data["results"][1]["content"] == "First message"
+        assert data["before"] is None
+
+    def test_list_messages_keyset_pages(self) -> None:
+        """Test older pages are fetched with the before cursor, ties broken by id."""
+        created_at = timezone.now()
+        messages = [
+            AssistantMessageFactory.create_user_message(
+                conversation=self.conversation,
+                content=f"Message {index}",
+                created_at=created_at - timedelta(seconds=index // 2),
+            )
+            for index in range(5)
+        ]
+        expected = sorted(messages, key=lambda m: (m.created_at, m.pk), reverse=True)
+
+        contents: list[str] = []
+        url = f"{self.messages_url}?limit=2"
+        pages = 0
+        while url:
+            data = self.auth_client.get(url).json()
+            contents.extend(message["content"] for message in data["results"])
+            url = data["next"]
+            pages += 1
+
+        assert pages == 3
+        assert contents == [message.content for message in expected]
+
+    def test_list_messages_invalid_cursor(self) -> None:
+        """Test a malformed before cursor is rejected."""
+        response = self.auth_client.get(f"{self.messages_url}?before=not-a-cursor")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_list_messages_not_owner(self) -> None:
         """Test user cannot list messages from conversation they don't own."""
@@ -144,7 +179,21 @@ class AssistantMessageViewSetTestCase(AuthAPITestCase):
         assert message.message_type == AssistantMessage.MessageType.USER
 
         # Verify AI task was triggered
-        mock_task.assert_called_once_with(user_message_id=message.pk)
+        mock_task.delay.assert_called_once_with(
+            user_message_id=message.pk, is_first_message=True
+        )
+
+    @patch("assistants.views.message_views.task_handle_new_assistant_message")
+    def test_create_follow_up_message(self, mock_task: Mock) -> None:
+        """Test only the first message of a conversation asks for a title."""
+        AssistantMessageFactory.create_user_message(conversation=self.conversation)
+
+        response = self.auth_client.post(self.messages_url, {"content": "And?"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        mock_task.delay.assert_called_once_with(
+            user_message_id=response.json()["id"], is_first_message=False
+        )
 
     @patch("assistants.views.message_views.task_handle_new_assistant_message")
     def test_create_message_anonymous(self, mock_task: Mock) -> None:
@@ -173,7 +222,9 @@ class AssistantMessageViewSetTestCase(AuthAPITestCase):
         assert message.conversation == anon_conversation
 
         # Verify AI task was triggered
-        mock_task.assert_called_once_with(user_message_id=message.pk)
+        mock_task.delay.assert_called_once_with(
+            user_message_id=message.pk, is_first_message=True
+        )
 
     def test_create_message_unauthenticated_to_authenticated_conversation(self) -> None:
         """Test unauthenticated user cannot create message in authenticated conversation."""
@@ -258,7 +309,9 @@ class AssistantMessageViewSetTestCase(AuthAPITestCase):
         assert message.message_type == AssistantMessage.MessageType.USER
 
         # Verify task was called
-        mock_task.assert_called_once_with(user_message_id=message.pk)
+        mock_task.delay.assert_called_once_with(
+            user_message_id=message.pk, is_first_message=True
+        )
 
     def test_retrieve_message_authenticated(self) -> None:
         """Test retrieving a specific message."""
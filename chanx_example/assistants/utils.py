@@ -0,0 +1,13 @@
+from assistants.models import AssistantConversation
+
+
+def get_channel_name(conversation: AssistantConversation) -> str:
+    conversation_id = conversation.pk
+    # Build channel name based on conversation type
+    # Use the raw FK so this is safe to call from async code
+    user_id = conversation.user_id
+    if user_id is None:
+        channel_name = f"anonymous_{conversation_id}"
+    else:
+        channel_name = f"user_{user_id}_conversation_{conversation_id}"
+    return channel_name
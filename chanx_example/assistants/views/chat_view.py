@@ -8,6 +8,7 @@ from rest_framework.renderers import TemplateHTMLRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from assistants.constants import SIDEBAR_CONVERSATION_LIMIT
 from assistants.models import AssistantConversation
 from utils.request import AuthenticatedRequest
 
@@ -41,12 +42,8 @@ class AssistantChatView(APIView):
         }
 
         if request.user.is_authenticated:
-            request_auth = cast(AuthenticatedRequest, request)
             # Get user's conversations for sidebar
-            conversations = AssistantConversation.objects.filter(
-                user=request_auth.user
-            ).order_by("-updated_at")
-            context["conversations"] = conversations
+            context["conversations"] = self._get_user_conversations(request)
 
         return Response(context, template_name="assistants/home.html")
 
@@ -89,12 +86,23 @@ class AssistantChatView(APIView):
     def _get_user_conversations(
         self, request: HttpRequest
     ) -> list[AssistantConversation]:
-        """Get conversations for sidebar (only for authenticated users)."""
+        """Get the most recent conversations for sidebar (authenticated users only).
+
+        Reads only the denormalized columns the sidebar shows, through the
+        (user, updated_at) index; older conversations stay reachable through
+        the conversations API.
+        """
         if request.user.is_authenticated:
             request_auth = cast(AuthenticatedRequest, request)
             return list(
-                AssistantConversation.objects.filter(user=request_auth.user).order_by(
-                    "-updated_at"
-                )
+                AssistantConversation.objects.filter(user=request_auth.user)
+                .order_by("-updated_at")
+                .only(
+                    "id",
+                    "title",
+                    "updated_at",
+                    "last_message_preview",
+                    "message_count",
+                )[:SIDEBAR_CONVERSATION_LIMIT]
             )
         return []
@@ -12,6 +12,7 @@ from assistants.serializers import (
     AssistantMessageSerializer,
 )
 from assistants.tasks import task_handle_new_assistant_message
+from utils.pagination import KeysetPagination
 from utils.request import AuthenticatedRequest
 
 
@@ -20,6 +21,8 @@ class AssistantMessageViewSet(ModelViewSet[AssistantMessage]):
 
     permission_classes = [AllowAny]
     serializer_class = AssistantMessageSerializer
+    # Newest-first pages with a "before" cursor, so long threads load cheaply
+    pagination_class = KeysetPagination
 
     # Only allow read and create operations
     http_method_names = ["get", "post", "head", "options"]
@@ -42,7 +45,7 @@ class AssistantMessageViewSet(ModelViewSet[AssistantMessage]):
                 AssistantConversation, id=conversation_id, user__isnull=True
             )
 
-        return conversation.messages.order_by("created_at")
+        return conversation.messages.all()
 
     def perform_create(self, serializer: BaseSerializer[AssistantMessage]) -> None:
         """Create a new user message and trigger AI response."""
@@ -69,12 +72,14 @@ class AssistantMessageViewSet(ModelViewSet[AssistantMessage]):
                 message_type=AssistantMessage.MessageType.USER,
             )
 
-            # Generate title if this is the first message
-            if conversation.messages.count() == 1:
-                conversation.generate_title_from_first_message()
-
-            # Trigger async task to generate AI response
-            task_handle_new_assistant_message(user_message_id=user_message.pk)
+            # Trigger async task to generate AI response (and, for the first
+            # message, the conversation title alongside it). Saving set the
+            # count from the row it incremented, so concurrent first messages
+            # never both count as the first
+            task_handle_new_assistant_message.delay(
+                user_message_id=user_message.pk,
+                is_first_message=conversation.message_count == 1,
+            )
 
         except AssistantConversation.DoesNotExist:
             raise ValidationError("Conversation not found or access denied") from None
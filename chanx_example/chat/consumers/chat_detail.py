@@ -1,7 +1,10 @@
-from typing import Any
+import asyncio
+from typing import Any, cast
 
+from django.conf import settings
 from rest_framework.permissions import IsAuthenticated
 
+from asgiref.sync import async_to_sync
 from chanx.generic.websocket import AsyncJsonWebsocketConsumer
 from chanx.messages.incoming import PingMessage
 from chanx.messages.outgoing import PongMessage
@@ -16,12 +19,15 @@ from chat.messages.chat import (
     NewChatMessageEvent,
     NotifyMemberAddedEvent,
     NotifyMemberRemovedEvent,
+    ResumeChatMessage,
+    ResyncRequiredMessage,
     UserRemovedFromGroupMessage,
 )
 from chat.messages.member import MemberMessage
-from chat.models import ChatMember, GroupChat
+from chat.models import ChatMember, ChatMessage, GroupChat
 from chat.permissions import IsGroupChatMember
-from chat.utils import name_group_chat
+from chat.serializers import ChatMessageSerializer
+from chat.utils import name_group_chat_shard, name_group_chat_shards
 
 
 class ChatDetailConsumer(
@@ -34,10 +40,30 @@ class ChatDetailConsumer(
 
     member: ChatMember
 
+    @classmethod
+    async def abroadcast_event(cls, group_chat_id: int, event: ChatDetailEvent) -> None:
+        """Send an event to every viewer of a group chat.
+
+        Large rooms are split over CHAT_GROUP_SHARDS channel layer groups, so
+        each group_send only walks a fraction of the viewers; the shards are
+        sent to in parallel.
+        """
+        await asyncio.gather(
+            *(
+                cls.asend_channel_event(group, event)
+                for group in name_group_chat_shards(group_chat_id)
+            )
+        )
+
+    @classmethod
+    def broadcast_event(cls, group_chat_id: int, event: ChatDetailEvent) -> None:
+        """Synchronous version of abroadcast_event for tasks and views."""
+        async_to_sync(cls.abroadcast_event)(group_chat_id, event)
+
     async def build_groups(self) -> list[str]:
         """Build the list of groups to join."""
         assert self.obj
-        self.group_name = name_group_chat(self.obj.pk)
+        self.group_name = name_group_chat_shard(self.obj.pk, self.channel_name)
         return [self.group_name]
 
     async def post_authentication(self) -> None:
@@ -53,9 +79,41 @@ class ChatDetailConsumer(
         match message:
             case PingMessage():
                 await self.send_message(PongMessage())
+            case ResumeChatMessage(payload=payload):
+                await self.resume_messages(payload.after_seq)
             case _:
                 assert_never(message)
 
+    async def resume_messages(self, after_seq: int) -> None:
+        """Replay the messages sent after after_seq, oldest first.
+
+        A client missing more than CHAT_RESUME_MAX_MESSAGES is asked to
+        reload the room instead.
+        """
+        assert self.user is not None
+        assert self.obj
+        limit: int = settings.CHAT_RESUME_MAX_MESSAGES
+        missed = (
+            ChatMessage.objects.filter(group_chat_id=self.obj.pk, seq__gt=after_seq)
+            .select_related("sender__user")
+            .order_by("seq")
+        )
+        messages = [message async for message in missed[: limit + 1]]
+        if len(messages) > limit:
+            await self.send_message(ResyncRequiredMessage())
+            return
+
+        for message in messages:
+            await self.send_message(
+                MemberMessage(
+                    payload=cast(dict[str, Any], ChatMessageSerializer(message).data),
+                    is_mine=bool(
+                        message.sender and message.sender.user.pk == self.user.pk
+                    ),
+                    is_current=False,
+                )
+            )
+
     async def receive_event(self, event: ChatDetailEvent) -> None:
         match event:
             case NotifyMemberAddedEvent(payload=payload):
@@ -64,11 +122,11 @@ class ChatDetailConsumer(
                 await self.handle_notify_member_remove_event(payload)
             case NewChatMessageEvent(payload=payload):
                 assert self.user is not None
-                await self.send_message(
-                    MemberMessage(
-                        payload=payload.message_data,
-                        is_mine=self.user.pk == payload.user_pk,
-                        is_current=False,
+                # Encoded once by the broadcasting task for the whole group
+                is_mine = self.user.pk == payload.user_pk
+                await self.send(
+                    text_data=(
+                        payload.message.mine if is_mine else payload.message.others
                     )
                 )
             case _:
@@ -4,7 +4,28 @@ from chanx.messages.base import BaseChannelEvent, BaseMessage
 from chanx.messages.incoming import PingMessage
 from pydantic import BaseModel
 
-ChatIncomingMessage = PingMessage
+from chat.messages.member import EncodedMemberMessage
+
+
+class ResumeChatPayload(BaseModel):
+    after_seq: int
+
+
+class ResumeChatMessage(BaseMessage):
+    """Request to replay the messages sent after a sequence number."""
+
+    action: Literal["resume"] = "resume"
+    payload: ResumeChatPayload
+
+
+ChatIncomingMessage = PingMessage | ResumeChatMessage
+
+
+class ResyncRequiredMessage(BaseMessage):
+    """Too many messages were missed to replay, the client must reload them."""
+
+    action: Literal["resync_required"] = "resync_required"
+    payload: None = None
 
 
 class MemberAddedMessage(BaseMessage):
@@ -43,7 +64,7 @@ class NotifyMemberRemovedEvent(BaseChannelEvent):
 
 class NewChatMessageEvent(BaseChannelEvent):
     class Payload(BaseModel):
-        message_data: dict[str, Any]
+        message: EncodedMemberMessage
         user_pk: int | None
 
     handler: Literal["new_chat_message"] = "new_chat_message"
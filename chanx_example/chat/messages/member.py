@@ -1,8 +1,41 @@
+import json
 from typing import Any, Literal
 
+import humps
 from chanx.messages.base import BaseGroupMessage
+from chanx.settings import chanx_settings
+from pydantic import BaseModel
 
 
 class MemberMessage(BaseGroupMessage):
     action: Literal["member_message"] = "member_message"
     payload: dict[str, Any]
+
+
+class EncodedMemberMessage(BaseModel):
+    """A MemberMessage encoded once for every recipient of a broadcast.
+
+    Holds the final websocket text for the sender and for everyone else, so
+    consumers forward it as is instead of rebuilding, camelizing and encoding
+    the message for each connected socket.
+    """
+
+    mine: str
+    others: str
+
+    @classmethod
+    def encode(cls, message_data: dict[str, Any]) -> "EncodedMemberMessage":
+        """Encode a message the way send_message would for each recipient."""
+        content = MemberMessage(
+            payload=message_data, is_mine=False, is_current=False
+        ).model_dump(mode="json")
+        return cls(
+            mine=_encode_json({**content, "is_mine": True}),
+            others=_encode_json(content),
+        )
+
+
+def _encode_json(content: dict[str, Any]) -> str:
+    if chanx_settings.CAMELIZE:
+        content = humps.camelize(content)
+    return json.dumps(content)
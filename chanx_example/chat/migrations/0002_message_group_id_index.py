@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(
+                fields=["group_chat", "id"], name="chat_msg_group_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:29
+
+from typing import Any
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_seq(apps: Any, schema_editor: Any) -> None:
+    GroupChat = apps.get_model("chat", "GroupChat")
+    GroupChatSequence = apps.get_model("chat", "GroupChatSequence")
+    ChatMessage = apps.get_model("chat", "ChatMessage")
+
+    for group_chat_id in GroupChat.objects.values_list("pk", flat=True).iterator():
+        messages = list(
+            ChatMessage.objects.filter(group_chat_id=group_chat_id)
+            .order_by("id")
+            .only("id")
+        )
+        if not messages:
+            continue
+        for seq, message in enumerate(messages, start=1):
+            message.seq = seq
+        ChatMessage.objects.bulk_update(messages, ["seq"], batch_size=BATCH_SIZE)
+        GroupChatSequence.objects.create(
+            group_chat_id=group_chat_id, last_seq=len(messages)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0002_message_group_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatmessage",
+            name="seq",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Position of the message in its group chat"
+            ),
+        ),
+        migrations.CreateModel(
+            name="GroupChatSequence",
+            fields=[
+                (
+                    "group_chat",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="message_sequence",
+                        serialize=False,
+                        to="chat.groupchat",
+                    ),
+                ),
+                (
+                    "last_seq",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Sequence number of the newest message"
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_seq, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="chatmessage",
+            constraint=models.UniqueConstraint(
+                fields=("group_chat", "seq"), name="chat_msg_group_seq_uniq"
+            ),
+        ),
+    ]
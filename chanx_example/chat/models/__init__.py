@@ -1,9 +1,11 @@
 from .chat_member import ChatMember
 from .chat_message import ChatMessage
 from .group_chat import GroupChat
+from .group_chat_sequence import GroupChatSequence
 
 __all__ = [
     "ChatMember",
     "ChatMessage",
     "GroupChat",
+    "GroupChatSequence",
 ]
@@ -1,14 +1,69 @@
+from collections import defaultdict
+from collections.abc import Iterable
 from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from django.db import models
+from django.db import models, transaction
 
 from django_stubs_ext.db.models import TypedModelMeta
 
+from chat.models.group_chat_sequence import GroupChatSequence
+
 if TYPE_CHECKING:  # pragma: no cover
     from chat.models import ChatMember, GroupChat  # noqa: F401
 
 
+def _notify_activity(latest: dict[int, datetime]) -> None:
+    # Imported here since the chat tasks import the chat models
+    from chat.tasks import notify_group_chat_activity
+
+    for group_chat_id, activity_at in latest.items():
+        notify_group_chat_activity(group_chat_id, activity_at)
+
+
+class ChatMessageManager(models.Manager["ChatMessage"]):
+    """Numbers messages inserted in bulk, which never goes through save()."""
+
+    def bulk_create(
+        self, objs: Iterable["ChatMessage"], *args: Any, **kwargs: Any
+    ) -> list["ChatMessage"]:
+        """Insert messages at once, reserving one seq block per group chat.
+
+        Messages that already carry a seq keep it. Like save(), records each
+        group chat's activity, at its newest message, once committed.
+
+        Args:
+            objs: Unsaved messages, possibly spanning several group chats
+            *args: Positional arguments for Manager.bulk_create
+            **kwargs: Keyword arguments for Manager.bulk_create
+
+        Returns:
+            The created messages
+        """
+        messages = list(objs)
+        unnumbered: defaultdict[int, list[ChatMessage]] = defaultdict(list)
+        for message in messages:
+            if not message.seq:
+                unnumbered[message.group_chat_id].append(message)
+
+        with transaction.atomic():
+            # A fixed order keeps concurrent inserts from deadlocking
+            for group_chat_id in sorted(unnumbered):
+                block = unnumbered[group_chat_id]
+                last_seq = GroupChatSequence.reserve(group_chat_id, len(block))
+                for seq, message in enumerate(block, start=last_seq - len(block) + 1):
+                    message.seq = seq
+            created = super().bulk_create(messages, *args, **kwargs)
+
+        latest: dict[int, datetime] = {}
+        for message in created:
+            at = latest.get(message.group_chat_id)
+            if at is None or message.created_at > at:
+                latest[message.group_chat_id] = message.created_at
+        transaction.on_commit(lambda: _notify_activity(latest))
+        return created
+
+
 class ChatMessage(models.Model):
     group_chat = models.ForeignKey["GroupChat", "GroupChat"](
         "chat.GroupChat", on_delete=models.CASCADE, related_name="messages"
@@ -25,16 +80,42 @@ class ChatMessage(models.Model):
     created_at = models.DateTimeField[datetime, datetime](auto_now_add=True)
     updated_at = models.DateTimeField[datetime, datetime](auto_now=True)
     is_edited = models.BooleanField[bool, bool](default=False)
+    seq = models.PositiveIntegerField[int, int](
+        default=0, help_text="Position of the message in its group chat"
+    )
+
+    objects: ClassVar[ChatMessageManager] = ChatMessageManager()
+
+    if TYPE_CHECKING:  # pragma: no cover
+        group_chat_id: int
 
     class Meta(TypedModelMeta):
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination of a group chat's messages
+            models.Index(fields=["group_chat", "id"], name="chat_msg_group_id_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["group_chat", "seq"], name="chat_msg_group_seq_uniq"
+            ),
+        ]
 
     def save(self, *args: Any, **kwargs: Any) -> None:
-        """Override save to update group chat last activity."""
-        is_new = self.pk is None
+        """Override save to number new messages in their group chat.
 
-        super().save(*args, **kwargs)
+        A new message also records the group chat's last activity once it is
+        committed, coalesced per interval rather than written on every insert.
+        """
+        adding = self._state.adding
+        if self.pk is None and not self.seq:
+            # The seq row stays locked until the message is committed
+            with transaction.atomic():
+                self.seq = GroupChatSequence.reserve(self.group_chat_id)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
-        # Update group chat last activity timestamp if new message
-        if is_new:
-            self.group_chat.update_last_activity()
+        if adding:
+            activity = {self.group_chat_id: self.created_at}
+            transaction.on_commit(lambda: _notify_activity(activity))
@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING
+
+from django.db import connection, models
+
+if TYPE_CHECKING:  # pragma: no cover
+    from chat.models import GroupChat  # noqa: F401
+
+
+class GroupChatSequence(models.Model):
+    """Message counter of a group chat, kept apart from its GroupChat row.
+
+    Numbering a message only locks this row, so it never waits on (or holds
+    up) edits of the group chat and its last activity timestamp.
+    """
+
+    group_chat = models.OneToOneField["GroupChat", "GroupChat"](
+        "chat.GroupChat",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="message_sequence",
+    )
+    last_seq = models.PositiveIntegerField[int, int](
+        default=0, help_text="Sequence number of the newest message"
+    )
+
+    @classmethod
+    def reserve(cls, group_chat_id: int, count: int = 1) -> int:
+        """Reserve the sequence numbers of new messages in a group chat.
+
+        A single upsert advances the counter by count and returns it. Must run
+        in the transaction inserting the messages: the row lock is held until
+        it commits, so messages of a room commit in seq order and a reader
+        never sees a seq before the ones below it.
+
+        Args:
+            group_chat_id: ID of the group chat receiving the messages
+            count: Number of messages to reserve seqs for
+
+        Returns:
+            The last reserved sequence number; the messages get the count
+            numbers ending with it
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (group_chat_id, last_seq) VALUES (%s, %s) "
+                f"ON CONFLICT (group_chat_id) DO UPDATE "
+                f"SET last_seq = {table}.last_seq + %s RETURNING last_seq",
+                [group_chat_id, count, count],
+            )
+            row = cursor.fetchone()
+        assert row is not None
+        seq: int = row[0]
+        return seq
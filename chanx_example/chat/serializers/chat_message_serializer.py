@@ -17,6 +17,7 @@ class ChatMessageSerializer(serializers.ModelSerializer[ChatMessage]):
         model = ChatMessage
         fields = [
             "id",
+            "seq",
             "is_mine",
             "sender",
             "content",
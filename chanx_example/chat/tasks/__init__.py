@@ -1,4 +1,6 @@
 from .group import (
+    notify_group_chat_activity,
+    task_flush_group_chat_activity,
     task_handle_group_chat_update,
 )
 from .member import (
@@ -11,6 +13,8 @@ from .message import (
 
 __all__ = [
     # Group chat tasks
+    "notify_group_chat_activity",
+    "task_flush_group_chat_activity",
     "task_handle_group_chat_update",
     # Member tasks
     "task_handle_new_group_member",
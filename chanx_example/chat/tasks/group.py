@@ -1,12 +1,21 @@
+from datetime import datetime
+
 from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
 
 from chat.consumers.group import GroupChatConsumer
 from chat.messages.group import GroupChatUpdatePayload, NotifyGroupChatUpdateEvent
 from chat.models import GroupChat
+from utils.celery import shared_task
 
 channel_layer = get_channel_layer()
 
+# Recorded activity outlives any realistic delay of its deferred flush
+ACTIVITY_TIMEOUT = 60 * 60
+
 
+@shared_task()
 def task_handle_group_chat_update(group_chat_id: int) -> None:
     """
     Handle broadcasting group chat updates to all members of that specific group.
@@ -34,3 +43,60 @@ def task_handle_group_chat_update(group_chat_id: int) -> None:
             )
         ),
     )
+
+
+def _activity_key(group_chat_id: int, name: str) -> str:
+    return f"chat_activity:{group_chat_id}:{name}"
+
+
+@shared_task()
+def task_flush_group_chat_activity(group_chat_id: int) -> None:
+    """
+    Write a group chat's latest recorded activity and broadcast it.
+
+    Flushing opens a new CHAT_ACTIVITY_BROADCAST_INTERVAL, so activity
+    recorded after it waits for the next deferred flush.
+
+    Args:
+        group_chat_id: ID of the group chat to flush
+    """
+    interval: int = settings.CHAT_ACTIVITY_BROADCAST_INTERVAL
+    cache.set(_activity_key(group_chat_id, "window"), True, timeout=interval)
+    cache.delete(_activity_key(group_chat_id, "pending"))
+
+    activity_at: datetime | None = cache.get(_activity_key(group_chat_id, "at"))
+    if activity_at is not None:
+        GroupChat.objects.filter(pk=group_chat_id, updated_at__lt=activity_at).update(
+            updated_at=activity_at
+        )
+    task_handle_group_chat_update(group_chat_id)
+
+
+def notify_group_chat_activity(group_chat_id: int, activity_at: datetime) -> None:
+    """
+    Record a group chat's new activity, coalesced per group chat.
+
+    The activity time is kept in the cache and flushed to GroupChat.updated_at,
+    then broadcast to the members' chat lists, about once per
+    CHAT_ACTIVITY_BROADCAST_INTERVAL: the first activity after a quiet interval
+    is flushed right away, any further activity by one deferred flush of the
+    latest time at the end of the interval. Busy rooms therefore write and
+    broadcast their last activity once per interval instead of once per
+    message. Flushes run as tasks, so callers such as ChatMessage.save() only
+    pay for a few cache writes.
+
+    Args:
+        group_chat_id: ID of the group chat with new activity
+        activity_at: When the activity happened
+    """
+    interval: int = settings.CHAT_ACTIVITY_BROADCAST_INTERVAL
+    if interval <= 0:
+        GroupChat.objects.filter(pk=group_chat_id).update(updated_at=activity_at)
+        task_handle_group_chat_update.delay(group_chat_id)
+        return
+
+    cache.set(_activity_key(group_chat_id, "at"), activity_at, timeout=ACTIVITY_TIMEOUT)
+    if cache.add(_activity_key(group_chat_id, "window"), True, timeout=interval):
+        task_flush_group_chat_activity.delay(group_chat_id)
+    elif cache.add(_activity_key(group_chat_id, "pending"), True, timeout=interval):
+        task_flush_group_chat_activity.apply_async((group_chat_id,), countdown=interval)
@@ -15,11 +15,13 @@ from chat.messages.group import (
 )
 from chat.models import ChatMember, GroupChat
 from chat.serializers import GroupChatSerializer, ManageChatMemberSerializer
-from chat.utils import make_user_groups_layer_name, name_group_chat
+from chat.utils import make_user_groups_layer_name
+from utils.celery import shared_task
 
 channel_layer = get_channel_layer()
 
 
+@shared_task()
 def task_handle_new_group_member(user_id: int, group_chat_id: int) -> None:
     """
     Notify a user when they are added to a group chat.
@@ -48,16 +50,15 @@ def task_handle_new_group_member(user_id: int, group_chat_id: int) -> None:
     )
 
     # 2. Notify the chat detail page (for users already viewing that page)
-    chat_group = name_group_chat(group_chat_id)
-
-    ChatDetailConsumer.send_channel_event(
-        chat_group,
+    ChatDetailConsumer.broadcast_event(
+        group_chat_id,
         NotifyMemberAddedEvent(
             payload=member_serializer.data  # pyright: ignore[reportUnknownArgumentType]
         ),
     )
 
 
+@shared_task()
 def task_handle_remove_group_member(user_id: int, group_chat_id: int) -> None:
     """
     Notify a user when they are removed from a group chat.
@@ -84,9 +85,8 @@ def task_handle_remove_group_member(user_id: int, group_chat_id: int) -> None:
     )
 
     # 2. Also notify the chat detail page (for other users viewing that page)
-    chat_group = name_group_chat(group_chat_id)
-    ChatDetailConsumer.send_channel_event(
-        chat_group,
+    ChatDetailConsumer.broadcast_event(
+        group_chat_id,
         NotifyMemberRemovedEvent(
             payload=MemberRemovedPayload(
                 user_pk=user_id,
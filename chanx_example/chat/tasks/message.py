@@ -4,22 +4,22 @@ from channels.layers import get_channel_layer
 
 from chat.consumers.chat_detail import ChatDetailConsumer
 from chat.messages.chat import NewChatMessageEvent
+from chat.messages.member import EncodedMemberMessage
 from chat.models import ChatMessage
 from chat.serializers import ChatMessageSerializer
-from chat.tasks import task_handle_group_chat_update
-from chat.utils import name_group_chat
+from utils.celery import shared_task
 
 channel_layer = get_channel_layer()
 
 
+@shared_task()
 def task_handle_new_chat_message(message_id: int) -> None:
     """
     Handle broadcasting a new chat message to all group members.
 
-    This function:
-    1. Sends the message to all members of the specific group chat
-    2. Updates the group chat's last activity timestamp
-    3. Notifies users about the updated timestamp for the group chat list
+    Sends the message to all members of the specific group chat. The group
+    chat's last activity is recorded by ChatMessage.save() instead, so messages
+    created outside this task count too.
 
     Args:
         message_id: ID of the new ChatMessage to broadcast
@@ -32,25 +32,18 @@ def task_handle_new_chat_message(message_id: int) -> None:
     )
     group_chat = message.group_chat
 
-    # Update the group chat's last activity timestamp
-    group_chat.update_last_activity()
-
     # Serialize the message
     serializer = ChatMessageSerializer(message)
     serialized_data = cast(dict[str, Any], serializer.data)
 
-    # Get the group chat channel name
-    chat_group = name_group_chat(group_chat.pk)
-
-    # Send the message to the specific group chat members
-    ChatDetailConsumer.send_channel_event(
-        chat_group,
+    # Send the message to the specific group chat members, encoded once
+    # rather than by every member's consumer
+    ChatDetailConsumer.broadcast_event(
+        group_chat.pk,
         NewChatMessageEvent(
             payload=NewChatMessageEvent.Payload(
                 user_pk=message.sender.user.pk if message.sender else None,
-                message_data=serialized_data,
+                message=EncodedMemberMessage.encode(serialized_data),
             )
         ),
     )
-
-    task_handle_group_chat_update(group_chat.pk)
@@ -1,5 +1,6 @@
 import sys
 
+from django.test import override_settings
 from rest_framework import status
 
 from chanx.messages.incoming import PingMessage
@@ -12,8 +13,12 @@ from chat.messages.chat import (
     NewChatMessageEvent,
     NotifyMemberAddedEvent,
     NotifyMemberRemovedEvent,
+    ResumeChatMessage,
+    ResumeChatPayload,
+    ResyncRequiredMessage,
 )
-from chat.models import GroupChat
+from chat.messages.member import EncodedMemberMessage
+from chat.models import ChatMessage, GroupChat
 from test_utils.testing import WebsocketTestCase
 
 if sys.version_info < (3, 11):  # pragma: no cover
@@ -29,7 +34,9 @@ class TestChatDetailConsumer(WebsocketTestCase):
         self.group_chat = GroupChat.objects.create(title="Test Group Chat")
 
         # Add the authenticated user as a member
-        ChatMemberFactory.create(user=self.user, group_chat=self.group_chat)
+        self.member = ChatMemberFactory.create(
+            user=self.user, group_chat=self.group_chat
+        )
 
         self.ws_path = f"/ws/chat/{self.group_chat.pk}/"
 
@@ -152,7 +159,7 @@ class TestChatDetailConsumer(WebsocketTestCase):
 
         # Create proper payload using the Pydantic model
         test_payload = NewChatMessageEvent.Payload(
-            message_data=test_message_data,
+            message=EncodedMemberMessage.encode(test_message_data),
             user_pk=self.user.pk,  # Same as connected user
         )
 
@@ -187,7 +194,8 @@ class TestChatDetailConsumer(WebsocketTestCase):
 
         # Create proper payload using the Pydantic model
         test_payload = NewChatMessageEvent.Payload(
-            message_data=test_message_data, user_pk=888  # Different from self.user.pk
+            message=EncodedMemberMessage.encode(test_message_data),
+            user_pk=888,  # Different from self.user.pk
         )
 
         # Send new message event
@@ -205,3 +213,67 @@ class TestChatDetailConsumer(WebsocketTestCase):
         assert message["payload"] == test_message_data
         assert message["is_mine"] is False
         assert message["is_current"] is False
+
+    async def test_resume_replays_missed_messages(self) -> None:
+        """Test resuming replays the messages after the client's last seq"""
+        for content in ("First", "Second", "Third"):
+            await ChatMessage.objects.acreate(
+                group_chat=self.group_chat, sender=self.member, content=content
+            )
+
+        await self.auth_communicator.connect()
+        await self.auth_communicator.assert_authenticated_status_ok()
+
+        await self.auth_communicator.send_message(
+            ResumeChatMessage(payload=ResumeChatPayload(after_seq=1))
+        )
+
+        all_messages = await self.auth_communicator.receive_all_json()
+        assert [
+            (m["action"], m["payload"]["seq"], m["payload"]["content"], m["is_mine"])
+            for m in all_messages
+        ] == [
+            ("member_message", 2, "Second", True),
+            ("member_message", 3, "Third", True),
+        ]
+
+    @override_settings(CHAT_RESUME_MAX_MESSAGES=1)
+    async def test_resume_too_far_behind(self) -> None:
+        """Test clients missing too many messages are asked to reload"""
+        for content in ("First", "Second"):
+            await ChatMessage.objects.acreate(
+                group_chat=self.group_chat, content=content
+            )
+
+        await self.auth_communicator.connect()
+        await self.auth_communicator.assert_authenticated_status_ok()
+
+        await self.auth_communicator.send_message(
+            ResumeChatMessage(payload=ResumeChatPayload(after_seq=0))
+        )
+
+        all_messages = await self.auth_communicator.receive_all_json()
+        assert all_messages == [ResyncRequiredMessage().model_dump()]
+
+    @override_settings(CHAT_GROUP_SHARDS=4)
+    async def test_sharded_room_broadcast(self) -> None:
+        """Test viewers spread over shards all receive room broadcasts"""
+        other_user, other_headers = await self.acreate_user_and_ws_headers()
+        await ChatMemberFactory.acreate(user=other_user, group_chat=self.group_chat)
+        viewers = [
+            self.auth_communicator,
+            self.create_communicator(headers=other_headers),
+        ]
+        for viewer in viewers:
+            await viewer.connect()
+            await viewer.assert_authenticated_status_ok()
+
+        await ChatDetailConsumer.abroadcast_event(
+            self.group_chat.pk,
+            NotifyMemberAddedEvent(payload={"user": "new@example.com"}),
+        )
+
+        for viewer in viewers:
+            all_messages = await viewer.receive_all_json()
+            assert [m["action"] for m in all_messages] == ["member_added"]
+            await viewer.disconnect()
@@ -1,9 +1,13 @@
+from unittest.mock import Mock, patch
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from accounts.factories.user import UserFactory
 from chat.factories.chat_member import ChatMemberFactory
 from chat.factories.group_chat import GroupChatFactory
-from chat.models import ChatMessage
+from chat.models import ChatMessage, GroupChatSequence
 
 
 class ChatMessageModelTestCase(TestCase):
@@ -16,22 +20,6 @@ class ChatMessageModelTestCase(TestCase):
             user=self.user, group_chat=self.group_chat
         )
 
-    def test_save_new_message_updates_group_chat_activity(self) -> None:
-        """Test that saving a new message updates group chat's last activity"""
-        original_updated_at = self.group_chat.updated_at
-
-        # Create a new message
-        message = ChatMessage.objects.create(
-            group_chat=self.group_chat, sender=self.chat_member, content="Test message"
-        )
-
-        # Refresh group chat from database
-        self.group_chat.refresh_from_db()
-
-        # The group chat's updated_at should be newer
-        assert self.group_chat.updated_at > original_updated_at
-        assert message.content == "Test message"
-
     def test_save_existing_message_does_not_update_group_chat_activity(self) -> None:
         """Test that updating existing message doesn't update group chat activity"""
         # Create a message first
@@ -52,3 +40,73 @@ class ChatMessageModelTestCase(TestCase):
         # Group chat updated_at should remain the same
         self.group_chat.refresh_from_db()
         assert self.group_chat.updated_at == original_updated_at
+
+    @patch("chat.tasks.notify_group_chat_activity")
+    def test_new_message_records_group_chat_activity(self, mock_notify: Mock) -> None:
+        """Test a committed new message records its group chat's activity"""
+        with self.captureOnCommitCallbacks(execute=True):
+            message = ChatMessage.objects.create(
+                group_chat=self.group_chat, content="Hi"
+            )
+
+        mock_notify.assert_called_once_with(self.group_chat.pk, message.created_at)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            message.content = "Edited"
+            message.save()
+
+        mock_notify.assert_called_once()
+
+    def test_new_messages_get_room_sequence(self) -> None:
+        """Test each group chat numbers its messages from 1 without gaps"""
+        other_group_chat = GroupChatFactory.create()
+
+        seqs = [
+            ChatMessage.objects.create(group_chat=group_chat, content="Hi").seq
+            for group_chat in (self.group_chat, other_group_chat, self.group_chat)
+        ]
+
+        assert seqs == [1, 1, 2]
+        sequence = GroupChatSequence.objects.get(group_chat=self.group_chat)
+        assert sequence.last_seq == 2
+
+    def test_new_message_does_not_write_group_chat(self) -> None:
+        """Test the seq is reserved without locking or writing the group chat"""
+        with CaptureQueriesContext(connection) as queries:
+            ChatMessage.objects.create(group_chat_id=self.group_chat.pk, content="Hi")
+
+        sqls = [query["sql"] for query in queries.captured_queries]
+        assert not any("FOR UPDATE" in sql for sql in sqls)
+        assert not any('"chat_groupchat"' in sql for sql in sqls)
+
+    @patch("chat.tasks.notify_group_chat_activity")
+    def test_bulk_create_records_group_chat_activity(self, mock_notify: Mock) -> None:
+        """Test a bulk insert records each group chat's activity once"""
+        with self.captureOnCommitCallbacks(execute=True):
+            messages = ChatMessage.objects.bulk_create(
+                [
+                    ChatMessage(group_chat=self.group_chat, content="a"),
+                    ChatMessage(group_chat=self.group_chat, content="b"),
+                ]
+            )
+
+        mock_notify.assert_called_once_with(
+            self.group_chat.pk, max(message.created_at for message in messages)
+        )
+
+    def test_bulk_create_numbers_messages(self) -> None:
+        """Test bulk inserts reserve seqs per group chat, keeping explicit ones"""
+        other_group_chat = GroupChatFactory.create()
+        ChatMessage.objects.create(group_chat=self.group_chat, content="First")
+
+        messages = ChatMessage.objects.bulk_create(
+            [
+                ChatMessage(group_chat=self.group_chat, content="a"),
+                ChatMessage(group_chat=other_group_chat, content="b"),
+                ChatMessage(group_chat=self.group_chat, content="c"),
+                ChatMessage(group_chat=other_group_chat, content="d", seq=10),
+            ]
+        )
+
+        assert [message.seq for message in messages] == [2, 1, 3, 10]
+        assert GroupChatSequence.objects.get(group_chat=self.group_chat).last_seq == 3
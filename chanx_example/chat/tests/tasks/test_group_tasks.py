@@ -0,0 +1,90 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from chat.factories.group_chat import GroupChatFactory
+from chat.tasks import notify_group_chat_activity, task_flush_group_chat_activity
+
+
+@override_settings(CHAT_ACTIVITY_BROADCAST_INTERVAL=2)
+@patch("chat.tasks.group.task_flush_group_chat_activity")
+class NotifyGroupChatActivityTest(SimpleTestCase):
+    """Test cases for the coalesced group chat activity flushes."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_coalesces_activity_within_interval(self, mock_task: MagicMock) -> None:
+        """Test one immediate and one deferred flush per interval."""
+        for _ in range(5):
+            notify_group_chat_activity(1, timezone.now())
+
+        mock_task.delay.assert_called_once_with(1)
+        mock_task.apply_async.assert_called_once_with((1,), countdown=2)
+
+    def test_rooms_are_debounced_separately(self, mock_task: MagicMock) -> None:
+        """Test activity in one room does not delay another room's flush."""
+        notify_group_chat_activity(1, timezone.now())
+        notify_group_chat_activity(2, timezone.now())
+
+        assert [call.args for call in mock_task.delay.call_args_list] == [
+            (1,),
+            (2,),
+        ]
+        mock_task.apply_async.assert_not_called()
+
+
+@override_settings(CHAT_ACTIVITY_BROADCAST_INTERVAL=2)
+@patch("chat.tasks.group.task_handle_group_chat_update")
+class FlushGroupChatActivityTest(TestCase):
+    """Test cases for writing the coalesced group chat activity."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.group_chat = GroupChatFactory.create()
+
+    def test_writes_latest_activity_once(self, mock_broadcast: MagicMock) -> None:
+        """Test a burst of activity is written by one deferred flush."""
+        first = self.group_chat.updated_at + timedelta(seconds=1)
+        latest = first + timedelta(seconds=1)
+
+        notify_group_chat_activity(self.group_chat.pk, first)
+        self.group_chat.refresh_from_db()
+        assert self.group_chat.updated_at == first
+
+        with patch.object(task_flush_group_chat_activity, "apply_async") as deferred:
+            notify_group_chat_activity(self.group_chat.pk, first)
+            notify_group_chat_activity(self.group_chat.pk, latest)
+        deferred.assert_called_once_with((self.group_chat.pk,), countdown=2)
+        self.group_chat.refresh_from_db()
+        assert self.group_chat.updated_at == first
+
+        task_flush_group_chat_activity(self.group_chat.pk)
+        self.group_chat.refresh_from_db()
+        assert self.group_chat.updated_at == latest
+        assert mock_broadcast.call_count == 2
+
+    def test_flush_keeps_newer_timestamp(self, mock_broadcast: MagicMock) -> None:
+        """Test a stale recorded activity never moves updated_at back."""
+        updated_at = self.group_chat.updated_at
+        notify_group_chat_activity(
+            self.group_chat.pk, updated_at - timedelta(seconds=1)
+        )
+
+        self.group_chat.refresh_from_db()
+        assert self.group_chat.updated_at == updated_at
+        mock_broadcast.assert_called_once_with(self.group_chat.pk)
+
+    @override_settings(CHAT_ACTIVITY_BROADCAST_INTERVAL=0)
+    def test_disabled(self, mock_broadcast: MagicMock) -> None:
+        """Test an interval of 0 writes and broadcasts every activity."""
+        first = self.group_chat.updated_at + timedelta(seconds=1)
+        notify_group_chat_activity(self.group_chat.pk, first)
+        notify_group_chat_activity(self.group_chat.pk, first + timedelta(seconds=1))
+
+        self.group_chat.refresh_from_db()
+        assert self.group_chat.updated_at == first + timedelta(seconds=1)
+        assert mock_broadcast.delay.call_count == 2
@@ -0,0 +1,34 @@
+import json
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from chat.messages.member import EncodedMemberMessage, MemberMessage
+
+
+class EncodedMemberMessageTest(SimpleTestCase):
+    """Test cases for EncodedMemberMessage."""
+
+    message_data = {"id": 1, "content": "Hi", "created_at": "2025-01-01T00:00:00Z"}
+
+    def test_matches_member_message(self) -> None:
+        """Test both variants decode to the MemberMessage each recipient expects."""
+        encoded = EncodedMemberMessage.encode(self.message_data)
+
+        for text, is_mine in ((encoded.mine, True), (encoded.others, False)):
+            assert json.loads(text) == MemberMessage(
+                payload=self.message_data, is_mine=is_mine, is_current=False
+            ).model_dump(mode="json")
+
+    def test_camelizes(self) -> None:
+        """Test keys are camelized when chanx camelizes outgoing messages."""
+        with patch("chat.messages.member.chanx_settings") as settings:
+            settings.CAMELIZE = True
+            encoded = EncodedMemberMessage.encode(self.message_data)
+
+        assert json.loads(encoded.mine) == {
+            "action": "member_message",
+            "payload": {"id": 1, "content": "Hi", "createdAt": "2025-01-01T00:00:00Z"},
+            "isMine": True,
+            "isCurrent": False,
+        }
@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase, override_settings
+
+from chat.utils import name_group_chat_shard, name_group_chat_shards
+
+
+class GroupChatShardNameTest(SimpleTestCase):
+    """Test cases for the group chat shard names."""
+
+    def test_unsharded(self) -> None:
+        """Test a single shard keeps the plain group name."""
+        assert name_group_chat_shard(7, "specific.abc!123") == "group_chat.7"
+        assert name_group_chat_shards(7) == ["group_chat.7"]
+
+    @override_settings(CHAT_GROUP_SHARDS=4)
+    def test_sharded(self) -> None:
+        """Test viewers join one of the shards, always the same per channel."""
+        shards = name_group_chat_shards(7)
+        channels = [f"specific.abc!{i}" for i in range(50)]
+
+        assert shards == [f"group_chat.7.{shard}" for shard in range(4)]
+        assert {name_group_chat_shard(7, channel) for channel in channels} == set(
+            shards
+        )
+        assert name_group_chat_shard(7, channels[0]) == name_group_chat_shard(
+            7, channels[0]
+        )
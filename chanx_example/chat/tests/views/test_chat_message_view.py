@@ -90,7 +90,7 @@ class ChatMessageViewSetTestCase(AuthAPITestCase):
         assert "formatted_time" in response.data
 
     def test_pagination(self) -> None:
-        """Test that messages are paginated correctly."""
+        """Test that messages are paginated newest first with a before cursor."""
         # Create more messages to trigger pagination
         for i in range(25):  # Default page size is 20
             ChatMessage.objects.create(
@@ -104,13 +104,15 @@ class ChatMessageViewSetTestCase(AuthAPITestCase):
 
         # Verify pagination
         assert response.status_code == status.HTTP_200_OK
-        assert "count" in response.data
         assert "next" in response.data
-        assert "previous" in response.data
         assert "results" in response.data
 
         # Default page size is 20
-        assert len(response.data["results"]) == 20
+        results = response.data["results"]
+        assert len(results) == 20
+        assert results[0]["content"] == "Pagination test message 24"
+        assert response.data["before"] == str(results[-1]["id"])
+        assert response.data["after"] is None
 
         # Get next page
         next_page_url = response.data["next"]
@@ -119,6 +121,41 @@ class ChatMessageViewSetTestCase(AuthAPITestCase):
         # Verify second page
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 7  # 27 total messages, 7 on second page
+        assert response.data["results"][-1]["content"] == "Test message 1"
+        assert response.data["before"] is None
+        assert response.data["next"] is None
+
+    def test_messages_after_id(self) -> None:
+        """Test ?after= returns newer messages oldest first for catching up."""
+        for i in range(3):
+            ChatMessage.objects.create(
+                group_chat=self.group_chat,
+                sender=self.chat_member,
+                content=f"Missed message {i}",
+            )
+
+        response = self.auth_client.get(
+            self.list_url, {"after": self.message2.pk, "limit": 2}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [m["content"] for m in response.data["results"]] == [
+            "Missed message 0",
+            "Missed message 1",
+        ]
+        assert response.data["after"] == str(response.data["results"][-1]["id"])
+
+        response = self.auth_client.get(response.data["next"])
+
+        assert [m["content"] for m in response.data["results"]] == ["Missed message 2"]
+        assert response.data["after"] is None
+        assert response.data["next"] is None
+
+    def test_invalid_cursor(self) -> None:
+        """Test a malformed cursor is rejected."""
+        response = self.auth_client.get(self.list_url, {"before": "abc"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_non_member_cannot_access_messages(self) -> None:
         """Test that a non-member cannot access messages in a group chat."""
@@ -1,7 +1,33 @@
+import zlib
+
+from django.conf import settings
+
+
 def name_group_chat(group_chat_id: int) -> str:
     return f"group_chat.{group_chat_id}"
 
 
+def name_group_chat_shard(group_chat_id: int, channel_name: str) -> str:
+    """Name the channel layer group a viewer of a group chat joins.
+
+    With CHAT_GROUP_SHARDS > 1, viewers are spread over that many groups by a
+    stable hash of their channel name; otherwise everyone shares one group.
+    """
+    shards: int = settings.CHAT_GROUP_SHARDS
+    if shards <= 1:
+        return name_group_chat(group_chat_id)
+    shard = zlib.crc32(channel_name.encode()) % shards
+    return f"{name_group_chat(group_chat_id)}.{shard}"
+
+
+def name_group_chat_shards(group_chat_id: int) -> list[str]:
+    """Name every channel layer group the viewers of a group chat are in."""
+    shards: int = settings.CHAT_GROUP_SHARDS
+    if shards <= 1:
+        return [name_group_chat(group_chat_id)]
+    return [f"{name_group_chat(group_chat_id)}.{shard}" for shard in range(shards)]
+
+
 def make_user_groups_layer_name(user_id: int) -> str:
     """Create a channel layer name for a user's group updates."""
     return f"user_{user_id}_groups"
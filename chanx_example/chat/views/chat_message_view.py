@@ -9,19 +9,20 @@ from chat.models import ChatMember, ChatMessage, GroupChat
 from chat.permissions import IsGroupChatMemberNested
 from chat.serializers import ChatMessageSerializer
 from chat.tasks import task_handle_new_chat_message
+from utils.pagination import IdKeysetPagination
 from utils.request import AuthenticatedRequest
 
 
 class ChatMessageViewSet(ModelViewSet[ChatMessage]):
     serializer_class = ChatMessageSerializer
     permission_classes = [IsAuthenticated & IsGroupChatMemberNested]
+    pagination_class = IdKeysetPagination
 
     def get_queryset(self) -> QuerySet[ChatMessage]:
-        return (
-            ChatMessage.objects.filter(group_chat_id=self.kwargs["group_chat_pk"])
-            .select_related("sender__user")
-            .order_by("-id")
-        )
+        # Ordered by the paginator: newest first, or oldest first with ?after=
+        return ChatMessage.objects.filter(
+            group_chat_id=self.kwargs["group_chat_pk"]
+        ).select_related("sender__user")
 
     def perform_create(self, serializer: BaseSerializer[ChatMessage]) -> None:
         request = cast(AuthenticatedRequest, self.request)
@@ -37,4 +38,4 @@ class ChatMessageViewSet(ModelViewSet[ChatMessage]):
         message = serializer.save(group_chat=group_chat, sender=member)
 
         # Trigger the task to broadcast via WebSocket
-        task_handle_new_chat_message(message.pk)
+        task_handle_new_chat_message.delay(message.pk)
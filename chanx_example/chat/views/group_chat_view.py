@@ -44,11 +44,11 @@ class GroupChatViewSet(ModelViewSet[GroupChat]):
         )
 
         # Trigger tasks to handle WebSocket notifications
-        task_handle_new_group_member(request.user.pk, group_chat.pk)
+        task_handle_new_group_member.delay(request.user.pk, group_chat.pk)
 
     def perform_update(self, serializer: BaseSerializer[GroupChat]) -> None:
         """Handle group chat updates and notify members via WebSockets."""
         group_chat = serializer.save()
 
         # Notify all members about the update
-        task_handle_group_chat_update(group_chat.pk)
+        task_handle_group_chat_update.delay(group_chat.pk)
@@ -146,7 +146,7 @@ class GroupMemberManagementView(APIView):
             )
 
             # Trigger task to handle WebSocket notification
-            task_handle_new_group_member(user.pk, group_chat.pk)
+            task_handle_new_group_member.delay(user.pk, group_chat.pk)
 
             self.add_message(
                 request, messages.SUCCESS, f"Added {user.email} to the group chat"
@@ -253,7 +253,7 @@ class RemoveMemberView(APIView):
         member_to_remove.delete()
 
         # Trigger task to handle WebSocket notification
-        task_handle_remove_group_member(user_id, group_chat.pk)
+        task_handle_remove_group_member.delay(user_id, group_chat.pk)
 
         # Add success message and redirect
         self.add_message(
@@ -86,7 +86,7 @@ class HomeView(APIView):
                 nick_name=request_auth.user.email,
             )
 
-            task_handle_new_group_member(request_auth.user.pk, group_chat.pk)
+            task_handle_new_group_member.delay(request_auth.user.pk, group_chat.pk)
 
             # Redirect to the new chat
             return redirect("chat-group-detail", pk=group_chat.pk)
@@ -0,0 +1,13 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+app = Celery("chanx_example")
+
+# Read CELERY_* settings from Django settings
+app.config_from_object("django.conf:settings", namespace="CELERY")
+
+# Register task_* functions from each installed app's tasks module
+app.autodiscover_tasks()
@@ -162,6 +162,18 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REDIS_HOST = env.str("REDIS_HOST", "")
 
+# =========================================================================
+# CACHE CONFIGURATION
+# =========================================================================
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_HOST,
+        "KEY_PREFIX": "chanx_example",
+    }
+}
+
 # =========================================================================
 # AUTHENTICATION CONFIGURATION
 # =========================================================================
@@ -441,6 +453,10 @@ structlog.configure(
     logger_factory=structlog.stdlib.LoggerFactory(),
     cache_logger_on_first_use=True,
 )
+
+# Bearer token required to scrape /api/metrics/; the endpoint is disabled when empty
+METRICS_TOKEN = env.str("METRICS_TOKEN", "")
+
 # =========================================================================
 # DJANGO CHANNELS CONFIGURATION
 # =========================================================================
@@ -468,9 +484,163 @@ CELERY_TASK_DEFAULT_QUEUE = "chanx_example_app_worker"
 DJANGO_STRUCTLOG_CELERY_ENABLED = True
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# Tasks are fire-and-forget broadcasts/LLM calls, nobody reads their results
+CELERY_TASK_IGNORE_RESULT = True
+
+# Per-domain queues so slow LLM streams never delay realtime broadcasts.
+# Each queue gets its own worker with tuned concurrency/prefetch (see
+# scripts/worker.sh).
+CELERY_LLM_QUEUE = "llm"
+CELERY_BROADCAST_QUEUE = "broadcast"
+CELERY_HOUSEKEEPING_QUEUE = "housekeeping"
+CELERY_TASK_ROUTES = {
+    "assistants.tasks.housekeeping_tasks.*": {"queue": CELERY_HOUSEKEEPING_QUEUE},
+    "assistants.tasks.*": {"queue": CELERY_LLM_QUEUE},
+    "chat.tasks.*": {"queue": CELERY_BROADCAST_QUEUE},
+    "discussion.tasks.*": {"queue": CELERY_BROADCAST_QUEUE},
+    "celery.backend_cleanup": {"queue": CELERY_HOUSEKEEPING_QUEUE},
+}
+
+# Periodic jobs, synced into django_celery_beat's database schedule when
+# beat starts (schedules in seconds)
+CELERY_BEAT_SCHEDULE = {
+    "expire-anonymous-assistant-conversations": {
+        "task": (
+            "assistants.tasks.housekeeping_tasks.task_expire_anonymous_conversations"
+        ),
+        "schedule": env.int("ASSISTANT_ANONYMOUS_EXPIRY_INTERVAL", 60 * 60),
+    },
+}
+
+# =========================================================================
+# ASYNC WORKER CONFIGURATION
+# =========================================================================
+# Run coroutines handed to utils.async_worker inline instead of on the
+# background event loop (useful for tests and debugging)
+ASYNC_WORKER_EAGER = env.bool("ASYNC_WORKER_EAGER", False)
+
+# =========================================================================
+# CHAT CONFIGURATION
+# =========================================================================
+# Messages a reconnecting chat client may replay over its websocket; clients
+# further behind are told to reload the room instead
+CHAT_RESUME_MAX_MESSAGES = env.int("CHAT_RESUME_MAX_MESSAGES", 200)
+# Chat list updates caused by a room's new messages are coalesced to about
+# one broadcast per this many seconds per room (0 broadcasts every message)
+CHAT_ACTIVITY_BROADCAST_INTERVAL = env.int("CHAT_ACTIVITY_BROADCAST_INTERVAL", 2)
+# Viewers of a group chat are spread over this many channel layer groups, so
+# each group_send of a large room walks fewer channels. Changing it only
+# takes effect for viewers connecting afterwards; restart the ASGI servers.
+CHAT_GROUP_SHARDS = env.int("CHAT_GROUP_SHARDS", 1)
+
 # =========================================================================
 # AI CONFIGURATION
 # =========================================================================
 
+# "openai", "fake" (local deterministic stand-in for load tests) or a dotted
+# path to an assistants.services.ai_service.LLMBackend subclass
+ASSISTANT_LLM_BACKEND = env.str("ASSISTANT_LLM_BACKEND", "openai")
+ASSISTANT_FAKE_BACKEND_TOKENS = env.int("ASSISTANT_FAKE_BACKEND_TOKENS", 200)
+ASSISTANT_FAKE_BACKEND_TOKENS_PER_SECOND = env.float(
+    "ASSISTANT_FAKE_BACKEND_TOKENS_PER_SECOND", 50.0
+)
+ASSISTANT_FAKE_BACKEND_FIRST_TOKEN_MS = env.int(
+    "ASSISTANT_FAKE_BACKEND_FIRST_TOKEN_MS", 500
+)
+
 OPENAI_API_KEY = env.str("OPENAI_API_KEY", "")
 OPENAI_ORG = env.str("OPENAI_ORG", "")
+
+# Pooled HTTP connections shared by every OpenAI client in a process
+OPENAI_MAX_CONNECTIONS = env.int("OPENAI_MAX_CONNECTIONS", 100)
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = env.int("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20)
+OPENAI_KEEPALIVE_EXPIRY = env.float("OPENAI_KEEPALIVE_EXPIRY", 60.0)
+OPENAI_REQUEST_TIMEOUT = env.float("OPENAI_REQUEST_TIMEOUT", 120.0)
+# Upper bound of in-flight OpenAI requests per process (per event loop for async)
+OPENAI_MAX_CONCURRENT_REQUESTS = env.int("OPENAI_MAX_CONCURRENT_REQUESTS", 64)
+
+# Streamed tokens are coalesced into frames before channel-layer fan-out.
+# Disable batching to fall back to one frame per token.
+ASSISTANT_STREAM_BATCHING = env.bool("ASSISTANT_STREAM_BATCHING", True)
+ASSISTANT_STREAM_FLUSH_INTERVAL_MS = env.int("ASSISTANT_STREAM_FLUSH_INTERVAL_MS", 40)
+ASSISTANT_STREAM_MAX_FRAME_BYTES = env.int("ASSISTANT_STREAM_MAX_FRAME_BYTES", 1024)
+
+# How often an in-flight response checks whether the client asked to stop it
+ASSISTANT_STOP_CHECK_INTERVAL_MS = env.int("ASSISTANT_STOP_CHECK_INTERVAL_MS", 250)
+
+# Recent frames of each stream are kept in the cache so clients that reconnect
+# mid-response can resume from the last sequence number they received
+ASSISTANT_STREAM_REPLAY_MAX_FRAMES = env.int("ASSISTANT_STREAM_REPLAY_MAX_FRAMES", 2000)
+ASSISTANT_STREAM_REPLAY_TIMEOUT = env.int("ASSISTANT_STREAM_REPLAY_TIMEOUT", 5 * 60)
+
+# Concurrent generations allowed per user (or anonymous conversation), across
+# all anonymous conversations, and in total; 0 disables a limit. Requests over
+# a limit wait in a fair queue and clients are told their position.
+ASSISTANT_MAX_GENERATIONS_PER_USER = env.int("ASSISTANT_MAX_GENERATIONS_PER_USER", 2)
+ASSISTANT_MAX_ANONYMOUS_GENERATIONS = env.int("ASSISTANT_MAX_ANONYMOUS_GENERATIONS", 16)
+ASSISTANT_MAX_GENERATIONS = env.int("ASSISTANT_MAX_GENERATIONS", 48)
+# Held slots keep renewing their lease, so slots of crashed workers free
+# themselves after this many seconds however long generations run
+ASSISTANT_GENERATION_LEASE_TIMEOUT = env.int("ASSISTANT_GENERATION_LEASE_TIMEOUT", 60)
+ASSISTANT_GENERATION_POLL_INTERVAL = env.float(
+    "ASSISTANT_GENERATION_POLL_INTERVAL", 0.5
+)
+
+# Responses to repeated prompts are replayed from a per-process LRU cache.
+# The similarity tier also answers near-duplicate first messages of anonymous
+# conversations, matched by prompt embeddings.
+ASSISTANT_RESPONSE_CACHE_ENABLED = env.bool("ASSISTANT_RESPONSE_CACHE_ENABLED", True)
+ASSISTANT_RESPONSE_CACHE_TTL = env.int("ASSISTANT_RESPONSE_CACHE_TTL", 60 * 60)
+ASSISTANT_RESPONSE_CACHE_MAX_ENTRIES = env.int(
+    "ASSISTANT_RESPONSE_CACHE_MAX_ENTRIES", 1000
+)
+ASSISTANT_SEMANTIC_CACHE_ENABLED = env.bool("ASSISTANT_SEMANTIC_CACHE_ENABLED", False)
+ASSISTANT_SEMANTIC_CACHE_THRESHOLD = env.float(
+    "ASSISTANT_SEMANTIC_CACHE_THRESHOLD", 0.95
+)
+ASSISTANT_SEMANTIC_CACHE_MODEL = env.str(
+    "ASSISTANT_SEMANTIC_CACHE_MODEL", "text-embedding-3-small"
+)
+ASSISTANT_SEMANTIC_CACHE_DIMENSIONS = env.int(
+    "ASSISTANT_SEMANTIC_CACHE_DIMENSIONS", 256
+)
+
+# Sent first in every prompt. Prompts are laid out as this system prompt, the
+# conversation summary, then history oldest first, so consecutive turns share
+# a prefix the provider can serve from its prompt cache.
+ASSISTANT_SYSTEM_PROMPT = env.str(
+    "ASSISTANT_SYSTEM_PROMPT",
+    "You are a helpful assistant. Answer clearly and concisely.",
+)
+
+# Prompt history is limited to the newest messages fitting in this many tokens,
+# counted with a local tiktoken encoding (empty to estimate from length)
+ASSISTANT_HISTORY_TOKEN_BUDGET = env.int("ASSISTANT_HISTORY_TOKEN_BUDGET", 4000)
+ASSISTANT_HISTORY_TOKENIZER = env.str("ASSISTANT_HISTORY_TOKENIZER", "o200k_base")
+# Once the history overruns its budget, its oldest messages are dropped at once
+# until it fits in this fraction of the budget, keeping the prompt prefix stable
+ASSISTANT_HISTORY_TRIM_TARGET = env.float("ASSISTANT_HISTORY_TRIM_TARGET", 0.75)
+# Messages loaded when a conversation's history window is not cached yet
+ASSISTANT_HISTORY_MAX_MESSAGES = env.int("ASSISTANT_HISTORY_MAX_MESSAGES", 100)
+ASSISTANT_HISTORY_CACHE_TIMEOUT = env.int("ASSISTANT_HISTORY_CACHE_TIMEOUT", 60 * 60)
+
+# Older messages are folded into a running summary in the background once
+# TRIGGER messages accumulated beyond the RECENT ones kept verbatim
+ASSISTANT_SUMMARY_RECENT_MESSAGES = env.int("ASSISTANT_SUMMARY_RECENT_MESSAGES", 10)
+ASSISTANT_SUMMARY_TRIGGER_MESSAGES = env.int("ASSISTANT_SUMMARY_TRIGGER_MESSAGES", 10)
+
+# Anonymous conversations idle for TTL_HOURS are deleted by the housekeeping
+# job (see CELERY_BEAT_SCHEDULE), at most BATCH_SIZE * MAX_BATCHES per run.
+# DRY_RUN only logs and counts what would be deleted.
+ASSISTANT_ANONYMOUS_CONVERSATION_TTL_HOURS = env.int(
+    "ASSISTANT_ANONYMOUS_CONVERSATION_TTL_HOURS", 7 * 24
+)
+ASSISTANT_ANONYMOUS_EXPIRY_BATCH_SIZE = env.int(
+    "ASSISTANT_ANONYMOUS_EXPIRY_BATCH_SIZE", 500
+)
+ASSISTANT_ANONYMOUS_EXPIRY_MAX_BATCHES = env.int(
+    "ASSISTANT_ANONYMOUS_EXPIRY_MAX_BATCHES", 20
+)
+ASSISTANT_ANONYMOUS_EXPIRY_DRY_RUN = env.bool(
+    "ASSISTANT_ANONYMOUS_EXPIRY_DRY_RUN", False
+)
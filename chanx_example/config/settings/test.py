@@ -15,5 +15,18 @@ CHANX = {
     "SEND_COMPLETION": True,
 }
 CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+ASYNC_WORKER_EAGER = True
+
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
 
 OPENAI_API_KEY = "Mock-key"
+
+# One frame per token keeps streaming assertions deterministic
+ASSISTANT_STREAM_BATCHING = False
+# Mocked LLM responses differ between tests sharing the same prompts
+ASSISTANT_RESPONSE_CACHE_ENABLED = False
+# Avoid downloading tokenizer encodings during tests
+ASSISTANT_HISTORY_TOKENIZER = ""
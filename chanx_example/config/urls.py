@@ -28,7 +28,7 @@ from drf_spectacular.views import (
 )
 
 from core.views.spectacular_no_error import SpectacularNoErrorAPIView
-from status.views import StatusView
+from status.views import MetricsView, StatusView
 
 api_urlpatterns = [
     path("accounts/", include("accounts.urls")),
@@ -37,6 +37,7 @@ api_urlpatterns = [
     path("discussion/", include("discussion.urls")),
     path("playground/", include("chanx.playground.urls")),
     path("status/", StatusView.as_view(), name="status"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "schema/no-error/",
@@ -18,10 +18,12 @@ from discussion.messages.topic_list_messages import (
 from discussion.models import DiscussionReply, DiscussionTopic
 from discussion.serializers import DiscussionReplySerializer
 from discussion.serializers.topic_serializers import DiscussionTopicListSerializer
+from utils.celery import shared_task
 
 channel_layer = get_channel_layer()
 
 
+@shared_task()
 def task_broadcast_new_topic(topic_id: int) -> None:
     """
     Broadcast a new topic creation to all connected users.
@@ -60,6 +62,7 @@ def task_broadcast_new_topic(topic_id: int) -> None:
     )
 
 
+@shared_task()
 def task_broadcast_vote_update(
     target_type: Literal["topic"] | Literal["reply"], target_id: int, vote_count: int
 ) -> None:
@@ -107,6 +110,7 @@ def task_broadcast_vote_update(
         )
 
 
+@shared_task()
 def task_broadcast_answer_accepted(topic_id: int, reply_id: int) -> None:
     """
     Broadcast answer acceptance to all connected users.
@@ -144,6 +148,7 @@ def task_broadcast_answer_accepted(topic_id: int, reply_id: int) -> None:
     )
 
 
+@shared_task()
 def task_broadcast_answer_unaccepted(topic_id: int, reply_id: int) -> None:
     """
     Broadcast answer unacceptance to all connected users.
@@ -181,6 +186,7 @@ def task_broadcast_answer_unaccepted(topic_id: int, reply_id: int) -> None:
     )
 
 
+@shared_task()
 def task_broadcast_new_reply(reply_id: int) -> None:
     """
     Broadcast a new reply creation to connected users.
@@ -55,7 +55,7 @@ class DiscussionReplyViewSet(ModelViewSet[DiscussionReply]):
         reply = serializer.save(author=request.user, topic=topic)
 
         # Broadcast new reply via WebSocket
-        task_broadcast_new_reply(reply.pk)
+        task_broadcast_new_reply.delay(reply.pk)
 
     @action(detail=True, methods=["post"], url_path="vote")
     def vote_on_reply(self, request: Request, **kwargs: Any) -> Response:
@@ -77,7 +77,7 @@ class DiscussionReplyViewSet(ModelViewSet[DiscussionReply]):
         reply.refresh_from_db()
 
         # Broadcast vote update
-        task_broadcast_vote_update("reply", reply.pk, reply.vote_count)
+        task_broadcast_vote_update.delay("reply", reply.pk, reply.vote_count)
 
         return Response(
             {
@@ -68,7 +68,7 @@ class DiscussionTopicViewSet(ModelViewSet[DiscussionTopic]):
         topic = serializer.save(author=request.user)
 
         # Broadcast new topic via WebSocket
-        task_broadcast_new_topic(topic.pk)
+        task_broadcast_new_topic.delay(topic.pk)
 
     @action(detail=True, methods=["post"], url_path="vote")
     def vote_on_topic(self, request: Request, pk: str | None = None) -> Response:
@@ -90,7 +90,7 @@ class DiscussionTopicViewSet(ModelViewSet[DiscussionTopic]):
         topic.refresh_from_db()
 
         # Broadcast vote update
-        task_broadcast_vote_update("topic", topic.pk, topic.vote_count)
+        task_broadcast_vote_update.delay("topic", topic.pk, topic.vote_count)
 
         return Response(
             {
@@ -137,7 +137,7 @@ class DiscussionTopicViewSet(ModelViewSet[DiscussionTopic]):
             topic.save(update_fields=["accepted_answer"])
 
         # Broadcast answer acceptance
-        task_broadcast_answer_accepted(topic.pk, reply.pk)
+        task_broadcast_answer_accepted.delay(topic.pk, reply.pk)
 
         return Response({"detail": "Answer accepted successfully."})
 
@@ -170,6 +170,6 @@ class DiscussionTopicViewSet(ModelViewSet[DiscussionTopic]):
             topic.save(update_fields=["accepted_answer"])
 
         # Broadcast answer unacceptance
-        task_broadcast_answer_unaccepted(topic.pk, reply_id)
+        task_broadcast_answer_unaccepted.delay(topic.pk, reply_id)
 
         return Response({"detail": "Answer unaccepted successfully."})
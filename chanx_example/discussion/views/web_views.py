@@ -71,7 +71,7 @@ class NewDiscussionTopicView(APIView):
             topic = serializer.save(author=request_auth.user)
 
             # Broadcast the new topic
-            task_broadcast_new_topic(topic.pk)
+            task_broadcast_new_topic.delay(topic.pk)
 
             # Redirect to the new topic
             return redirect("discussion-detail", pk=topic.pk)
@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -8,3 +9,28 @@ class StatusViewTestCase(APITestCase):
         url = reverse("status")
         response = self.client.get(url)
         assert response.status_code == status.HTTP_200_OK
+
+
+class MetricsViewTestCase(APITestCase):
+    def test_disabled_without_token(self) -> None:
+        url = reverse("metrics")
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_get(self) -> None:
+        url = reverse("metrics")
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE assistant_time_to_first_token_seconds histogram" in (
+            response.content.decode()
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_get_requires_token(self) -> None:
+        url = reverse("metrics")
+        assert self.client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == status.HTTP_200_OK
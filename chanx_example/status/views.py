@@ -1,7 +1,13 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
 from rest_framework import status, views
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from utils.metrics import render_metrics
+
 
 class StatusView(views.APIView):
     authentication_classes = []
@@ -9,3 +15,22 @@ class StatusView(views.APIView):
 
     def get(self, request: Request) -> Response:
         return Response(status=status.HTTP_200_OK)
+
+
+class MetricsView(views.APIView):
+    """Prometheus scrape endpoint, disabled unless METRICS_TOKEN is set."""
+
+    authentication_classes = []
+    serializer_class = None
+
+    def get(self, request: Request) -> HttpResponse:
+        token: str = settings.METRICS_TOKEN
+        if not token:
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+        authorization = request.headers.get("Authorization", "")
+        # Constant-time comparison, so response timing leaks nothing of the token
+        if not hmac.compare_digest(authorization, f"Bearer {token}"):
+            return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+        return HttpResponse(
+            render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,136 @@
+"""
+Process-wide asyncio worker for long-running coroutines.
+
+Sync code (Celery tasks, management commands) hands coroutines to a single
+background event loop owned by the current process, so many threads waiting on
+slow I/O such as LLM streaming share one loop instead of each spinning up its
+own. With ``ASYNC_WORKER_EAGER`` enabled (tests) coroutines run inline instead.
+
+Resources bound to a loop, such as async HTTP clients, register a cleanup with
+``on_loop_close``; it is awaited on the loop before the loop goes away.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from collections.abc import Callable, Coroutine
+from typing import Any, ParamSpec, TypeVar
+
+from django.conf import settings
+
+from asgiref.sync import async_to_sync
+from celery.signals import worker_process_shutdown
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+LoopCleanup = Callable[[], Coroutine[Any, Any, None]]
+
+SHUTDOWN_TIMEOUT = 10
+
+_loop_cleanups: list[LoopCleanup] = []
+
+
+class _LoopThread:
+    """Background event loop, recreated after a fork so each process owns one."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.pid: int | None = None
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop is None or self.pid != os.getpid() or self.loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="async-worker", daemon=True
+                )
+                thread.start()
+                self.loop = loop
+                self.thread = thread
+                self.pid = os.getpid()
+            return self.loop
+
+    def shutdown(self) -> None:
+        with self.lock:
+            loop, thread = self.loop, self.thread
+            if loop is None or thread is None or self.pid != os.getpid():
+                return
+            self.loop = self.thread = None
+
+        if loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(_run_loop_cleanups(), loop)
+            future.result(SHUTDOWN_TIMEOUT)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(SHUTDOWN_TIMEOUT)
+        if not loop.is_running():
+            loop.close()
+
+
+_loop_thread = _LoopThread()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop, starting it on first use."""
+    return _loop_thread.get()
+
+
+def on_loop_close(cleanup: LoopCleanup) -> None:
+    """Register a coroutine function to await on a worker loop before it closes.
+
+    It runs at the end of every eager run and when the background loop is shut
+    down, on the loop being closed.
+
+    Args:
+        cleanup: Coroutine function releasing the running loop's resources
+    """
+    _loop_cleanups.append(cleanup)
+
+
+def run(
+    func: Callable[P, Coroutine[Any, Any, T]], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """Run a coroutine function on the background loop and wait for its result.
+
+    Args:
+        func: Coroutine function to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The coroutine's return value
+    """
+    if settings.ASYNC_WORKER_EAGER:
+        # async_to_sync runs func on a loop of its own, closed once it returns
+        async def run_eagerly() -> T:
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                await _run_loop_cleanups()
+
+        return async_to_sync(run_eagerly)()
+
+    future = asyncio.run_coroutine_threadsafe(func(*args, **kwargs), get_loop())
+    return future.result()
+
+
+def shutdown() -> None:
+    """Run the loop cleanups on the background loop, then stop and close it."""
+    _loop_thread.shutdown()
+
+
+async def _run_loop_cleanups() -> None:
+    for cleanup in _loop_cleanups:
+        await cleanup()
+
+
+def _shutdown(**kwargs: Any) -> None:
+    shutdown()
+
+
+# Prefork Celery children exit without running atexit handlers
+atexit.register(shutdown)
+worker_process_shutdown.connect(_shutdown, weak=False)
@@ -0,0 +1,45 @@
+from collections.abc import Callable
+from typing import Any, ParamSpec, Protocol, TypeVar, cast
+
+import celery
+from celery.result import AsyncResult
+
+P = ParamSpec("P")
+R = TypeVar("R")
+R_co = TypeVar("R_co", covariant=True)
+
+
+class Task(Protocol[P, R_co]):
+    """Typed view of a Celery task: call it inline or dispatch it with delay()."""
+
+    name: str
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R_co: ...
+
+    def delay(self, *args: P.args, **kwargs: P.kwargs) -> AsyncResult: ...
+
+    def apply_async(
+        self,
+        args: tuple[Any, ...] | None = None,
+        kwargs: dict[str, Any] | None = None,
+        **options: Any,
+    ) -> AsyncResult: ...
+
+
+def shared_task(**options: Any) -> Callable[[Callable[P, R]], Task[P, R]]:
+    """Register a function as a Celery shared task, keeping its signature.
+
+    Celery ships without type hints, so this wraps ``celery.shared_task`` to
+    let mypy check both direct calls and ``delay()`` arguments.
+
+    Args:
+        **options: Options forwarded to ``celery.shared_task``
+
+    Returns:
+        Decorator producing the registered task
+    """
+
+    def decorator(func: Callable[P, R]) -> Task[P, R]:
+        return cast(Task[P, R], celery.shared_task(**options)(func))
+
+    return decorator
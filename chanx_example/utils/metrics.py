@@ -0,0 +1,219 @@
+"""
+Prometheus-style metrics shared by every process through the Django cache.
+
+Counters and histograms are stored as integer cache counters, so values
+recorded by Celery workers can be scraped from any web process through the
+metrics endpoint. Fractional values are stored with ``SCALE`` precision.
+Histograms aggregate observations locally and increment every touched bucket
+in one batch, a single pipelined round trip on the Redis cache, so recording
+many values (e.g. every inter-token gap) stays cheap.
+"""
+
+import abc
+import bisect
+from collections.abc import Iterable
+
+from django.core.cache import cache
+
+from asgiref.sync import sync_to_async
+
+from utils.redis_cache import get_redis_client
+
+SCALE = 1_000_000
+
+Labels = tuple[tuple[str, str], ...]
+
+registry: list["Metric"] = []
+
+
+def incr_many(deltas: dict[str, int]) -> None:
+    """Add deltas to integer cache counters, creating missing ones at 0.
+
+    On the Redis cache every counter is incremented in one pipelined round
+    trip; other backends add() and incr() each counter.
+
+    Args:
+        deltas: Amount to add per cache key
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    client = get_redis_client()
+    if client is None:
+        for key, delta in deltas.items():
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, delta)
+        return
+
+    with client.pipeline(transaction=False) as pipe:
+        for key, delta in deltas.items():
+            pipe.incrby(cache.make_and_validate_key(key), delta)
+        pipe.execute()
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value % 1 else str(int(value))
+
+
+class Metric(abc.ABC):
+    """Base class of cache-backed metrics, optionally labelled."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        """Initialize the metric and add it to the registry.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            label_names: Names of the labels every observation must provide
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        registry.append(self)
+
+    def _labels(self, labels: dict[str, str]) -> Labels:
+        return tuple((name, str(labels[name])) for name in self.label_names)
+
+    def _key(self, labels: Labels, series: str) -> str:
+        return f"metrics:{self.name}:{_format_labels(labels)}:{series}"
+
+    def _announce(self, labels: Labels) -> None:
+        """Remember a label set so the endpoint knows which series exist.
+
+        Each label set is claimed once with add() and numbered with incr(),
+        both atomic, so concurrent writers never drop each other's sets.
+        """
+        if not cache.add(self._key(labels, "announced"), True, timeout=None):
+            return
+        count_key = f"metrics:{self.name}:labels"
+        cache.add(count_key, 0, timeout=None)
+        index = cache.incr(count_key)
+        cache.set(f"{count_key}:{index}", labels, timeout=None)
+
+    def _label_sets(self) -> set[Labels]:
+        count_key = f"metrics:{self.name}:labels"
+        count: int = cache.get(count_key, 0)
+        keys = [f"{count_key}:{index}" for index in range(1, count + 1)]
+        return set(cache.get_many(keys).values())
+
+    def render(self) -> list[str]:
+        """Render the metric in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for labels in sorted(self._label_sets()):
+            lines.extend(self._render_series(labels))
+        return lines
+
+    @abc.abstractmethod
+    def _render_series(self, labels: Labels) -> list[str]:
+        """Render the samples of one label set."""
+
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add amount to the counter of the given label values."""
+        label_set = self._labels(labels)
+        self._announce(label_set)
+        incr_many({self._key(label_set, "total"): round(amount * SCALE)})
+
+    async def ainc(self, amount: float = 1, **labels: str) -> None:
+        """Async version of inc."""
+        await sync_to_async(self.inc)(amount, **labels)
+
+    def _render_series(self, labels: Labels) -> list[str]:
+        total = cache.get(self._key(labels, "total"), 0) / SCALE
+        return [f"{self.name}{_format_labels(labels)} {_format_value(total)}"]
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float],
+        label_names: Iterable[str] = (),
+    ):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            buckets: Upper bounds of the buckets, in increasing order
+            label_names: Names of the labels every observation must provide
+        """
+        super().__init__(name, documentation, label_names)
+        self.buckets = sorted(buckets)
+
+    async def aobserve(self, value: float, **labels: str) -> None:
+        """Record a single value."""
+        await self.aobserve_many([value], **labels)
+
+    async def aobserve_many(self, values: Iterable[float], **labels: str) -> None:
+        """Async version of observe_many."""
+        await sync_to_async(self.observe_many)(list(values), **labels)
+
+    def observe_many(self, values: Iterable[float], **labels: str) -> None:
+        """Record several values with one batched write of the touched buckets."""
+        label_set = self._labels(labels)
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for value in values:
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total += value
+        if not any(counts):
+            return
+
+        self._announce(label_set)
+        deltas = {
+            self._key(label_set, f"bucket:{index}"): count
+            for index, count in enumerate(counts)
+        }
+        deltas[self._key(label_set, "count")] = sum(counts)
+        deltas[self._key(label_set, "sum")] = round(total * SCALE)
+        incr_many(deltas)
+
+    def _render_series(self, labels: Labels) -> list[str]:
+        keys = [
+            self._key(labels, f"bucket:{index}")
+            for index in range(len(self.buckets) + 1)
+        ]
+        stored = cache.get_many(keys)
+        lines: list[str] = []
+        cumulative = 0
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for key, bound in zip(keys, bounds, strict=True):
+            cumulative += stored.get(key, 0)
+            lines.append(
+                f"{self.name}_bucket{_format_labels(labels, (('le', bound),))} "
+                f"{cumulative}"
+            )
+        total = cache.get(self._key(labels, "sum"), 0) / SCALE
+        count = cache.get(self._key(labels, "count"), 0)
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    lines: list[str] = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,225 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, TypeVar
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+_MT = TypeVar("_MT", bound=Model)
+
+
+class KeysetPagination(BasePagination):
+    """Newest-first pagination on a (timestamp, id) key.
+
+    Each page ends with a ``before`` cursor encoding the key of its oldest
+    row; the next page is every row strictly older than that key. Unlike
+    LIMIT/OFFSET, fetching a deep page costs the same as the first one when
+    an index covers the filtered columns plus the key.
+    """
+
+    page_size: int = api_settings.PAGE_SIZE or 20
+    page_size_query_param = "limit"
+    cursor_query_param = "before"
+    max_page_size = 100
+    timestamp_field = "created_at"
+    id_field = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    before: str | None = None
+    request: Request | None = None
+
+    def get_page_size(self, request: Request) -> int:
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, row: Model) -> str:
+        timestamp: datetime = getattr(row, self.timestamp_field)
+        payload = json.dumps([timestamp.isoformat(), getattr(row, self.id_field)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> tuple[datetime, Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(timestamp), row_id
+        except (ValueError, TypeError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+    def filter_before(self, queryset: QuerySet[_MT], cursor: str) -> QuerySet[_MT]:
+        """Keep the rows strictly older than the cursor's key."""
+        timestamp, row_id = self.decode_cursor(cursor)
+        try:
+            # The redundant bound keeps the index scan a single range
+            return queryset.filter(
+                Q(**{f"{self.timestamp_field}__lt": timestamp})
+                | Q(
+                    **{self.timestamp_field: timestamp, f"{self.id_field}__lt": row_id}
+                ),
+                **{f"{self.timestamp_field}__lte": timestamp},
+            )
+        except (ValueError, TypeError, DjangoValidationError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+    def paginate_queryset(
+        self, queryset: QuerySet[_MT], request: Request, view: APIView | None = None
+    ) -> list[_MT]:
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(f"-{self.timestamp_field}", f"-{self.id_field}")
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = self.filter_before(queryset, cursor)
+
+        rows = list(queryset[: page_size + 1])
+        page = rows[:page_size]
+        self.before = (
+            self.encode_cursor(page[-1]) if len(rows) > page_size and page else None
+        )
+        return page
+
+    def get_next_link(self) -> str | None:
+        if self.before is None or self.request is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, self.before
+        )
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "before": self.before,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "before": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The before cursor of the previous page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class IdKeysetPagination(KeysetPagination):
+    """Keyset pagination on an increasing integer id.
+
+    Without parameters, or with ``before``, pages run newest first like
+    KeysetPagination, but the cursor is the plain id of the oldest row.
+    With ``after``, the rows newer than that id are returned oldest first,
+    so a reconnecting client can catch up on what it missed; the page's
+    ``after`` cursor then points at the next batch.
+    """
+
+    after_query_param = "after"
+
+    after: str | None = None
+
+    def decode_id(self, value: str) -> int:
+        try:
+            return int(value)
+        except ValueError as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+    def paginate_queryset(
+        self, queryset: QuerySet[_MT], request: Request, view: APIView | None = None
+    ) -> list[_MT]:
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.before = self.after = None
+
+        after = request.query_params.get(self.after_query_param)
+        if after is not None:
+            queryset = queryset.filter(
+                **{f"{self.id_field}__gt": self.decode_id(after)}
+            ).order_by(self.id_field)
+        else:
+            queryset = queryset.order_by(f"-{self.id_field}")
+            before = request.query_params.get(self.cursor_query_param)
+            if before:
+                queryset = queryset.filter(
+                    **{f"{self.id_field}__lt": self.decode_id(before)}
+                )
+
+        rows = list(queryset[: page_size + 1])
+        page = rows[:page_size]
+        if len(rows) > page_size and page:
+            cursor = str(getattr(page[-1], self.id_field))
+            if after is not None:
+                self.after = cursor
+            else:
+                self.before = cursor
+        return page
+
+    def get_next_link(self) -> str | None:
+        if self.request is None:
+            return None
+        if self.after is not None:
+            return replace_query_param(
+                self.request.build_absolute_uri(), self.after_query_param, self.after
+            )
+        return super().get_next_link()
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "before": self.before,
+                "after": self.after,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["after"] = {"type": "string", "nullable": True}
+        return response_schema
+
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.after_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Return the rows newer than this id, oldest first.",
+                "schema": {"type": "integer"},
+            },
+        ]
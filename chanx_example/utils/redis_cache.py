@@ -0,0 +1,28 @@
+"""
+Direct access to the Redis server behind the default Django cache.
+
+Some hot paths need commands the cache API lacks (pipelines, lists), so they
+talk to the same Redis server with raw commands and fall back to the cache API
+on other backends.
+"""
+
+import functools
+
+from django.conf import settings
+
+from redis import Redis
+
+REDIS_CACHE_BACKEND = "django.core.cache.backends.redis.RedisCache"
+
+
+@functools.cache
+def get_redis_client() -> Redis | None:
+    """Return a client of the default cache's Redis server, if it uses Redis."""
+    config = settings.CACHES["default"]
+    if config["BACKEND"] != REDIS_CACHE_BACKEND:
+        return None
+    location = config["LOCATION"]
+    # Like the cache backend, write to the first server of a list
+    if not isinstance(location, str):
+        location = location[0]
+    return Redis.from_url(location)
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+import pytest
+
+from utils import async_worker
+
+
+class AsyncWorkerTest(SimpleTestCase):
+    """Test cases for the process-wide async worker."""
+
+    @override_settings(ASYNC_WORKER_EAGER=True)
+    def test_run_eager_runs_inline(self) -> None:
+        """Test eager mode runs the coroutine without the background loop."""
+
+        async def work(value: int) -> int:
+            return value * 2
+
+        assert async_worker.run(work, 2) == 4
+
+    @override_settings(ASYNC_WORKER_EAGER=False)
+    def test_run_uses_background_loop(self) -> None:
+        """Test coroutines run on the shared background loop."""
+
+        async def work() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        assert async_worker.run(work) is async_worker.get_loop()
+
+    @override_settings(ASYNC_WORKER_EAGER=False)
+    def test_run_from_many_threads_shares_loop(self) -> None:
+        """Test concurrent callers overlap on the single loop."""
+        started = 0
+        all_started = asyncio.Event()
+
+        async def work() -> None:
+            nonlocal started
+            started += 1
+            if started == 3:
+                all_started.set()
+            await asyncio.wait_for(all_started.wait(), 5)
+
+        threads = [
+            threading.Thread(target=async_worker.run, args=(work,)) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert started == 3
+        assert all_started.is_set()
+
+    @override_settings(ASYNC_WORKER_EAGER=False)
+    def test_run_propagates_exceptions(self) -> None:
+        """Test errors raised by the coroutine reach the caller."""
+
+        async def work() -> None:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            async_worker.run(work)
+
+    @override_settings(ASYNC_WORKER_EAGER=True)
+    def test_run_eager_awaits_loop_cleanups(self) -> None:
+        """Test loop cleanups run on the eager loop before it is closed."""
+        loops: list[asyncio.AbstractEventLoop] = []
+
+        async def work() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        async def cleanup() -> None:
+            loops.append(asyncio.get_running_loop())
+
+        with patch.object(async_worker, "_loop_cleanups", []):
+            async_worker.on_loop_close(cleanup)
+            loop = async_worker.run(work)
+
+        assert loops == [loop]
+
+    def test_shutdown_awaits_loop_cleanups(self) -> None:
+        """Test shutdown cleans up on the background loop, then closes it."""
+        loops: list[asyncio.AbstractEventLoop] = []
+
+        async def cleanup() -> None:
+            loops.append(asyncio.get_running_loop())
+
+        loop = async_worker.get_loop()
+        with patch.object(async_worker, "_loop_cleanups", []):
+            async_worker.on_loop_close(cleanup)
+            async_worker.shutdown()
+
+        assert loops == [loop]
+        assert loop.is_closed()
+        assert async_worker.get_loop().is_running()
+
+    def test_get_loop_is_reused(self) -> None:
+        """Test the same running loop is returned for the process."""
+        loop = async_worker.get_loop()
+
+        assert async_worker.get_loop() is loop
+        assert loop.is_running()
@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from asgiref.sync import async_to_sync
+
+from utils.metrics import Counter, Histogram, incr_many, registry, render_metrics
+
+
+class MetricsTest(SimpleTestCase):
+    """Test cases for the cache-backed metrics."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def _histogram(self) -> Histogram:
+        histogram = Histogram(
+            "test_latency_seconds", "Test latency.", (0.1, 1), label_names=["model"]
+        )
+        self.addCleanup(registry.remove, histogram)
+        return histogram
+
+    def test_histogram_renders_cumulative_buckets(self) -> None:
+        """Test observations land in cumulative buckets with sum and count."""
+        histogram = self._histogram()
+
+        async_to_sync(histogram.aobserve_many)([0.05, 0.5, 0.5, 3], model="a")
+
+        lines = histogram.render()
+        assert lines[:2] == [
+            "# HELP test_latency_seconds Test latency.",
+            "# TYPE test_latency_seconds histogram",
+        ]
+        assert lines[2:] == [
+            'test_latency_seconds_bucket{model="a",le="0.1"} 1',
+            'test_latency_seconds_bucket{model="a",le="1"} 3',
+            'test_latency_seconds_bucket{model="a",le="+Inf"} 4',
+            'test_latency_seconds_sum{model="a"} 4.05',
+            'test_latency_seconds_count{model="a"} 4',
+        ]
+
+    def test_histogram_separates_label_sets(self) -> None:
+        """Test each label set is rendered as its own series."""
+        histogram = self._histogram()
+
+        async_to_sync(histogram.aobserve)(0.05, model="a")
+        async_to_sync(histogram.aobserve)(2, model="b")
+
+        lines = histogram.render()
+        assert 'test_latency_seconds_count{model="a"} 1' in lines
+        assert 'test_latency_seconds_bucket{model="b",le="1"} 0' in lines
+        assert 'test_latency_seconds_count{model="b"} 1' in lines
+
+    def test_histogram_ignores_empty_observations(self) -> None:
+        """Test recording no values writes no series."""
+        histogram = self._histogram()
+
+        async_to_sync(histogram.aobserve_many)([], model="a")
+
+        assert len(histogram.render()) == 2
+
+    def test_counter_accumulates(self) -> None:
+        """Test counter increments add up, including fractional amounts."""
+        counter = Counter("test_events_total", "Test events.")
+        self.addCleanup(registry.remove, counter)
+
+        async_to_sync(counter.ainc)()
+        async_to_sync(counter.ainc)(1.5)
+
+        assert counter.render()[2:] == ["test_events_total 2.5"]
+        assert "test_events_total 2.5" in render_metrics().splitlines()
+
+    def test_counter_sync_increment(self) -> None:
+        """Test sync and async increments update the same series."""
+        counter = Counter("test_calls_total", "Test calls.", label_names=["model"])
+        self.addCleanup(registry.remove, counter)
+
+        counter.inc(2, model="a")
+        async_to_sync(counter.ainc)(model="a")
+
+        assert counter.render()[2:] == ['test_calls_total{model="a"} 3']
+
+    def test_incr_many_pipelines_redis_increments(self) -> None:
+        """Test counters are incremented in one pipeline on the Redis cache."""
+        client = MagicMock()
+        pipe = client.pipeline.return_value.__enter__.return_value
+
+        with patch("utils.metrics.get_redis_client", return_value=client):
+            incr_many({"a": 2, "b": 0, "c": 3})
+
+        client.pipeline.assert_called_once_with(transaction=False)
+        assert [call.args for call in pipe.incrby.call_args_list] == [
+            (cache.make_and_validate_key("a"), 2),
+            (cache.make_and_validate_key("c"), 3),
+        ]
+        pipe.execute.assert_called_once_with()
+
+    def test_label_sets_are_announced_once(self) -> None:
+        """Test repeated label sets render a single series each."""
+        counter = Counter("test_hits_total", "Test hits.", label_names=["model"])
+        self.addCleanup(registry.remove, counter)
+
+        for model in ("b", "a", "b"):
+            counter.inc(model=model)
+
+        assert counter.render()[2:] == [
+            'test_hits_total{model="a"} 1',
+            'test_hits_total{model="b"} 2',
+        ]
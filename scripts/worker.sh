@@ -0,0 +1,47 @@
+#!/usr/bin/env bash
+# Start a Celery worker for one task queue.
+#
+# Usage: scripts/worker.sh <llm|broadcast|housekeeping> [extra celery args]
+#
+# llm          - long-lived I/O bound LLM streams; threads share the async
+#                worker loop, prefetch 1 so a busy worker never hoards jobs
+# broadcast    - short channel-layer fan-out tasks; prefork, larger prefetch
+# housekeeping - periodic cleanup jobs; a single process is enough
+
+set -e
+
+QUEUE="$1"
+shift || true
+
+case "$QUEUE" in
+  llm)
+    POOL="${CELERY_LLM_POOL:-threads}"
+    CONCURRENCY="${CELERY_LLM_CONCURRENCY:-64}"
+    PREFETCH="${CELERY_LLM_PREFETCH:-1}"
+    ;;
+  broadcast)
+    POOL="${CELERY_BROADCAST_POOL:-prefork}"
+    CONCURRENCY="${CELERY_BROADCAST_CONCURRENCY:-4}"
+    PREFETCH="${CELERY_BROADCAST_PREFETCH:-8}"
+    ;;
+  housekeeping)
+    POOL="${CELERY_HOUSEKEEPING_POOL:-prefork}"
+    CONCURRENCY="${CELERY_HOUSEKEEPING_CONCURRENCY:-1}"
+    PREFETCH="${CELERY_HOUSEKEEPING_PREFETCH:-1}"
+    ;;
+  *)
+    echo "Usage: $0 <llm|broadcast|housekeeping> [extra celery args]" >&2
+    exit 1
+    ;;
+esac
+
+cd "$(dirname "$0")/../chanx_example"
+
+exec celery -A config worker \
+  --queues "$QUEUE" \
+  --hostname "$QUEUE@%h" \
+  --pool "$POOL" \
+  --concurrency "$CONCURRENCY" \
+  --prefetch-multiplier "$PREFETCH" \
+  --loglevel INFO \
+  "$@"